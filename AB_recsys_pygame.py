@@ -1,6 +1,7 @@
 import pygame
 import random
-import math
+from ab_simulator import Catalog, ABSimulator, ARMS
+from sequential_testing import SequentialExperiment
 
 # Initialize Pygame
 pygame.init()
@@ -32,14 +33,12 @@ class Product:
         self.category = category
         self.price = price
 
-# User class
+# User class (drawing only; purchases and satisfaction live in the simulator)
 class User:
     def __init__(self, x, y, group):
         self.x = x
         self.y = y
         self.group = group  # 'A' or 'B'
-        self.purchases = []
-        self.satisfaction = random.uniform(0.5, 1.0)
 
     def draw(self):
         color = RED if self.group == 'A' else BLUE
@@ -59,45 +58,24 @@ products = [
     Product("Game", "Media", 60)
 ]
 
+# Vectorized simulator: category and price indexes over the products,
+# Algorithm A (popular category) and Algorithm B (price range) per group
+category_names = sorted({p.category for p in products})
+catalog = Catalog([category_names.index(p.category) for p in products], [p.price for p in products], category_names)
+simulator = ABSimulator(catalog, num_users=200, seed=random.randrange(2 ** 32))
+
 # Create users
 users = []
-for _ in range(200):
+for group in simulator.group:
     x = random.randint(50, WIDTH - 50)
     y = random.randint(250, HEIGHT - 250)
-    group = 'A' if random.random() < 0.5 else 'B'
-    users.append(User(x, y, group))
-
-# Recommendation algorithms
-def recommend_a(user):
-    # Algorithm A: Recommend based on most popular category
-    category_counts = {}
-    for purchase in user.purchases:
-        category_counts[purchase.category] = category_counts.get(purchase.category, 0) + 1
-    if category_counts:
-        popular_category = max(category_counts, key=category_counts.get)
-        recommendations = [p for p in products if p.category == popular_category and p not in user.purchases]
-    else:
-        recommendations = [p for p in products if p not in user.purchases]
-    return random.choice(recommendations) if recommendations else random.choice(products)
-
-def recommend_b(user):
-    # Algorithm B: Recommend based on price range of previous purchases
-    if user.purchases:
-        avg_price = sum(p.price for p in user.purchases) / len(user.purchases)
-        recommendations = [p for p in products if 0.8 * avg_price <= p.price <= 1.2 * avg_price and p not in user.purchases]
-    else:
-        recommendations = [p for p in products if p not in user.purchases]
-    return random.choice(recommendations) if recommendations else random.choice(products)
+    users.append(User(x, y, ARMS[group]))
+
+# Streaming mSPRT on every exposure, so results can be checked any day
+experiment = SequentialExperiment(["purchase", "revenue", "satisfaction"], tau=[0.1, 50.0, 0.05])
 
 # Simulation variables
-day = 0
 max_days = 30
-purchases_a = 0
-purchases_b = 0
-revenue_a = 0
-revenue_b = 0
-satisfaction_a = 0
-satisfaction_b = 0
 
 # Helper function to draw rounded rectangle
 def draw_rounded_rect(surface, rect, color, corner_radius):
@@ -127,32 +105,11 @@ while running:
     screen.blit(dev_text, (WIDTH // 2 - dev_text.get_width() // 2, 70))
 
     # Simulate a day
-    if day < max_days:
-        day += 1
-        for user in users:
-            if random.random() < user.satisfaction:
-                if user.group == 'A':
-                    recommendation = recommend_a(user)
-                else:
-                    recommendation = recommend_b(user)
-                
-                if random.random() < 0.7:  # 70% chance of purchasing
-                    user.purchases.append(recommendation)
-                    if user.group == 'A':
-                        purchases_a += 1
-                        revenue_a += recommendation.price
-                    else:
-                        purchases_b += 1
-                        revenue_b += recommendation.price
-                    
-                    user.satisfaction = min(1.0, user.satisfaction + 0.05)
-                else:
-                    user.satisfaction = max(0.1, user.satisfaction - 0.05)
-                
-                if user.group == 'A':
-                    satisfaction_a += user.satisfaction
-                else:
-                    satisfaction_b += user.satisfaction
+    if simulator.day < max_days:
+        groups, values = simulator.step()
+        experiment.process(groups, values)
+    day = simulator.day
+    summary = simulator.summary()
 
     # Draw users
     for user in users:
@@ -165,17 +122,17 @@ while running:
     results_a = [
         f"Group A (Red)",
         f"Algorithm: Popular Category",
-        f"Total Purchases: {purchases_a}",
-        f"Total Revenue: ${revenue_a:.2f}",
-        f"Avg Satisfaction: {satisfaction_a / (len(users) // 2) / day:.2f}"
+        f"Total Purchases: {summary['A']['purchases']}",
+        f"Total Revenue: ${summary['A']['revenue']:.2f}",
+        f"Avg Satisfaction: {summary['A']['avg_satisfaction']:.2f}"
     ]
 
     results_b = [
         f"Group B (Blue)",
         f"Algorithm: Price Range",
-        f"Total Purchases: {purchases_b}",
-        f"Total Revenue: ${revenue_b:.2f}",
-        f"Avg Satisfaction: {satisfaction_b / (len(users) // 2) / day:.2f}"
+        f"Total Purchases: {summary['B']['purchases']}",
+        f"Total Revenue: ${summary['B']['revenue']:.2f}",
+        f"Avg Satisfaction: {summary['B']['avg_satisfaction']:.2f}"
     ]
 
     for i, text in enumerate(results_a):
@@ -186,6 +143,11 @@ while running:
         text_surface = font_text.render(text, True, BLACK)
         screen.blit(text_surface, (870, 170 + i * 40))
 
+    # Draw sequential test results
+    p_values = " | ".join(f"{metric}: p={result['p_value']:.3f}" for metric, result in experiment.summary().items())
+    test_text = font_text.render(f"Always-valid p-values (mSPRT) - {p_values}", True, BLACK)
+    screen.blit(test_text, (WIDTH // 2 - test_text.get_width() // 2, 470))
+
     # Draw day counter
     day_text = font_subtitle.render(f"Day: {day}/{max_days}", True, BLACK)
     screen.blit(day_text, (WIDTH // 2 - day_text.get_width() // 2, 110))
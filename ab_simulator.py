@@ -0,0 +1,182 @@
+import time
+import numpy as np
+
+# Headless A/B simulator for two recommendation algorithms.
+# Users and products live in numpy arrays; products are indexed by category
+# and by sorted price, purchases are per-user bitsets, and each simulated
+# day is a handful of vectorised draws over the whole population.
+
+ARMS = ("A", "B")
+PURCHASE_PROBABILITY = 0.7
+SATISFACTION_STEP = 0.05
+PRICE_BAND = 0.2
+MAX_REJECTION_TRIES = 8
+
+
+class Catalog:
+    def __init__(self, categories, prices, category_names=None):
+        self.categories = np.asarray(categories, dtype=np.int64)
+        self.prices = np.asarray(prices, dtype=np.float64)
+        self.category_names = category_names
+        self.num_products = len(self.prices)
+        self.num_categories = int(self.categories.max()) + 1
+
+        # Category index: products grouped by category, one contiguous slice each
+        self.by_category = np.argsort(self.categories, kind="stable")
+        bounds = np.searchsorted(self.categories[self.by_category], np.arange(self.num_categories + 1))
+        self.category_start, self.category_end = bounds[:-1], bounds[1:]
+
+        # Price index: a +/-20% band is a contiguous slice found by bisection
+        self.by_price = np.argsort(self.prices, kind="stable")
+        self.sorted_prices = self.prices[self.by_price]
+
+    def price_range(self, low, high):
+        return (np.searchsorted(self.sorted_prices, low, side="left"),
+                np.searchsorted(self.sorted_prices, high, side="right"))
+
+
+def generate_catalog(num_products, num_categories=20, seed=0):
+    rng = np.random.default_rng(seed)
+    categories = rng.integers(num_categories, size=num_products)
+    # Each category has its own typical price level
+    category_price = rng.lognormal(3.5, 1.0, size=num_categories)
+    prices = np.round(category_price[categories] * rng.lognormal(0, 0.5, size=num_products), 2)
+    return Catalog(categories, prices)
+
+
+class ABSimulator:
+    def __init__(self, catalog, num_users, seed=42):
+        self.catalog = catalog
+        self.num_users = num_users
+        self.rng = np.random.default_rng(seed)
+        self.group = (self.rng.random(num_users) >= 0.5).astype(np.int64)
+        self.satisfaction = self.rng.uniform(0.5, 1.0, size=num_users)
+        words = (catalog.num_products + 63) // 64
+        self.purchased = np.zeros((num_users, words), dtype=np.uint64)
+        self.category_counts = np.zeros((num_users, catalog.num_categories), dtype=np.int32)
+        self.price_sum = np.zeros(num_users)
+        self.num_purchases = np.zeros(num_users, dtype=np.int64)
+
+        self.day = 0
+        self.purchases = np.zeros(2, dtype=np.int64)
+        self.revenue = np.zeros(2)
+        self.satisfaction_total = np.zeros(2)
+        self.group_sizes = np.bincount(self.group, minlength=2)
+
+    def _has_purchased(self, users, products):
+        words = self.purchased[users, products >> 6]
+        return ((words >> (products & 63).astype(np.uint64)) & np.uint64(1)).astype(bool)
+
+    def _sample_unpurchased(self, users, order, start, end):
+        # Uniform draw from order[start:end] skipping purchased products, by
+        # rejection; users whose slice is (almost) exhausted fall back to a scan
+        catalog = self.catalog
+        chosen = np.full(len(users), -1, dtype=np.int64)
+        pending = np.flatnonzero(end > start)
+        for _ in range(MAX_REJECTION_TRIES):
+            if len(pending) == 0:
+                break
+            offsets = self.rng.integers(start[pending], end[pending])
+            products = order[offsets]
+            ok = ~self._has_purchased(users[pending], products)
+            chosen[pending[ok]] = products[ok]
+            pending = pending[~ok]
+        for i in pending:
+            candidates = order[start[i]:end[i]]
+            candidates = candidates[~self._has_purchased(np.full(len(candidates), users[i]), candidates)]
+            if len(candidates):
+                chosen[i] = self.rng.choice(candidates)
+        # No candidate left at all: any product, like the original demo
+        missing = chosen < 0
+        chosen[missing] = self.rng.integers(catalog.num_products, size=int(missing.sum()))
+        return chosen
+
+    def _all_products(self, users):
+        zeros = np.zeros(len(users), dtype=np.int64)
+        return self._sample_unpurchased(users, self.catalog.by_price, zeros,
+                                        np.full(len(users), self.catalog.num_products))
+
+    def recommend_a(self, users):
+        # Algorithm A: the user's most purchased category
+        recommendations = np.empty(len(users), dtype=np.int64)
+        has_history = self.num_purchases[users] > 0
+        history_users = users[has_history]
+        favourite = self.category_counts[history_users].argmax(axis=1)
+        recommendations[has_history] = self._sample_unpurchased(
+            history_users, self.catalog.by_category,
+            self.catalog.category_start[favourite], self.catalog.category_end[favourite])
+        recommendations[~has_history] = self._all_products(users[~has_history])
+        return recommendations
+
+    def recommend_b(self, users):
+        # Algorithm B: within +/-20% of the user's average purchase price
+        recommendations = np.empty(len(users), dtype=np.int64)
+        has_history = self.num_purchases[users] > 0
+        history_users = users[has_history]
+        average = self.price_sum[history_users] / self.num_purchases[history_users]
+        start, end = self.catalog.price_range((1 - PRICE_BAND) * average, (1 + PRICE_BAND) * average)
+        recommendations[has_history] = self._sample_unpurchased(history_users, self.catalog.by_price, start, end)
+        recommendations[~has_history] = self._all_products(users[~has_history])
+        return recommendations
+
+    def step(self):
+        self.day += 1
+        active = np.flatnonzero(self.rng.random(self.num_users) < self.satisfaction)
+        recommendations = np.empty(len(active), dtype=np.int64)
+        in_b = self.group[active] == 1
+        recommendations[~in_b] = self.recommend_a(active[~in_b])
+        recommendations[in_b] = self.recommend_b(active[in_b])
+
+        bought = self.rng.random(len(active)) < PURCHASE_PROBABILITY
+        buyers, products = active[bought], recommendations[bought]
+        # Each user acts at most once a day, so fancy-index updates never collide
+        self.purchased[buyers, products >> 6] |= np.left_shift(np.uint64(1), (products & 63).astype(np.uint64))
+        self.category_counts[buyers, self.catalog.categories[products]] += 1
+        self.price_sum[buyers] += self.catalog.prices[products]
+        self.num_purchases[buyers] += 1
+
+        self.satisfaction[active] = np.where(
+            bought,
+            np.minimum(1.0, self.satisfaction[active] + SATISFACTION_STEP),
+            np.maximum(0.1, self.satisfaction[active] - SATISFACTION_STEP))
+
+        buyer_groups = self.group[buyers]
+        self.purchases += np.bincount(buyer_groups, minlength=2)
+        self.revenue += np.bincount(buyer_groups, weights=self.catalog.prices[products], minlength=2)
+        self.satisfaction_total += np.bincount(self.group[active], weights=self.satisfaction[active], minlength=2)
+
+        # The day's exposures as (arm, [purchased, revenue, satisfaction]) events
+        revenue = np.where(bought, self.catalog.prices[recommendations], 0.0)
+        return self.group[active], np.column_stack([bought, revenue, self.satisfaction[active]])
+
+    def run(self, days):
+        for _ in range(days):
+            self.step()
+        return self.summary()
+
+    def summary(self):
+        user_days = self.group_sizes * max(self.day, 1)
+        return {
+            arm: {
+                "purchases": int(self.purchases[i]),
+                "revenue": float(self.revenue[i]),
+                "purchases_per_user_day": float(self.purchases[i] / user_days[i]),
+                "revenue_per_user_day": float(self.revenue[i] / user_days[i]),
+                "avg_satisfaction": float(self.satisfaction_total[i] / user_days[i]),
+            }
+            for i, arm in enumerate(ARMS)
+        }
+
+
+if __name__ == "__main__":
+    catalog = generate_catalog(1000)
+    simulator = ABSimulator(catalog, num_users=500000)
+    days = 30
+    start = time.perf_counter()
+    summary = simulator.run(days)
+    elapsed = time.perf_counter() - start
+    print(f"{simulator.num_users * days / elapsed / 1e6:.1f}M user-days/s "
+          f"({simulator.num_users} users x {days} days in {elapsed:.1f}s)")
+    for arm, metrics in summary.items():
+        print(f"Arm {arm}: " + ", ".join(f"{k}={v:,.3f}" if isinstance(v, float) else f"{k}={v:,}"
+                                          for k, v in metrics.items()))
@@ -1,6 +1,7 @@
 import pygame
 import sys
 import random
+from learning_path import CurriculumGraph, LearnerPath
 
 # Initialize Pygame
 pygame.init()
@@ -43,17 +44,18 @@ courses = [
     {"name": "Machine Learning Basics", "difficulty": 4, "category": "Data Science"}
 ]
 
+# Curriculum graph and the learner's unlocked courses; these courses have no prerequisites
+curriculum = CurriculumGraph([course["difficulty"] for course in courses],
+                             [course["category"] for course in courses])
+learner = LearnerPath(curriculum, user["goal"], user["performance"])
+
 recommended_courses = []
 
 def update_recommendations():
     global recommended_courses
-    recommended_courses = []
-    for course in courses:
-        if (course["category"] == user["goal"] and
-            course["difficulty"] <= user["performance"] // 10 + 1):
-            recommended_courses.append(course)
-    
-    recommended_courses = sorted(recommended_courses, key=lambda x: x["difficulty"])[:3]
+    learner.set_goal(user["goal"])
+    learner.set_performance(user["performance"])
+    recommended_courses = [courses[i] for i in learner.recommend(k=3)]
 
 def draw_text(text, font, color, x, y, align="left"):
     text_surface = font.render(text, True, color)
@@ -2,6 +2,7 @@ import pygame
 import sys
 import random
 import math
+from citation_ppr import CitationGraph
 
 # Initialize Pygame
 pygame.init()
@@ -35,6 +36,12 @@ papers = [
     {"id": 4, "title": "Transformer Architecture", "x": 1000, "y": 300, "color": YELLOW, "citations": [], "interests": ["DL", "NLP"]},
 ]
 
+# Citation graph over paper positions; relevance flows along citations
+paper_ids = [paper["id"] for paper in papers]
+citation_graph = CitationGraph(len(papers),
+                               [i for i, paper in enumerate(papers) for _ in paper["citations"]],
+                               [paper_ids.index(cited) for paper in papers for cited in paper["citations"]])
+
 # User profile
 user_profile = {
     "interests": ["ML"],
@@ -75,24 +82,13 @@ def draw_button(button):
               button["x"] + button["width"] // 2, button["y"] + button["height"] // 2)
 
 def get_recommendations():
-    scores = {paper["id"]: 0 for paper in papers}
-    
-    for paper in papers:
-        # Citation network score
-        if paper["id"] in user_profile["reading_history"]:
-            for cited_id in paper["citations"]:
-                scores[cited_id] += 2
-        
-        # Interest match score
-        for interest in paper["interests"]:
-            if interest in user_profile["interests"]:
-                scores[paper["id"]] += 1
-    
-    # Remove papers already in reading history
-    for read_id in user_profile["reading_history"]:
-        scores[read_id] = -1
-    
-    return sorted(scores.items(), key=lambda x: x[1], reverse=True)[:2]
+    # Personalized PageRank seeded by the reading history, with papers
+    # matching the user's interests as a weaker prior (one entry per match)
+    history = [paper_ids.index(read_id) for read_id in user_profile["reading_history"]]
+    prior = [i for i, paper in enumerate(papers)
+             for interest in paper["interests"] if interest in user_profile["interests"]]
+    top, scores = citation_graph.recommend(history, n=2, prior=prior)
+    return [(paper_ids[i], round(float(score), 3)) for i, score in zip(top, scores)]
 
 def reset_demo():
     global user_profile
@@ -1,6 +1,8 @@
 import pygame
 import random
 import math
+from array_utils import interest_matrix
+from minhash_lsh import InterestIndex
 
 # Initialize Pygame
 pygame.init()
@@ -58,10 +60,11 @@ users = [
 
 main_user = User(WIDTH // 2, HEIGHT // 2, "You", 29, ["music", "travel", "technology"])
 
-# Function to calculate compatibility
-def calculate_compatibility(user1, user2):
-    common_interests = set(user1.interests) & set(user2.interests)
-    return len(common_interests) / len(set(user1.interests + user2.interests))
+# Compatibility is the Jaccard similarity of interest sets, scored for all
+# users at once against the interest index
+def calculate_compatibilities(user):
+    interest_ids = [interest_options.index(interest) for interest in user.interests]
+    return dict(zip(users, match_index.set_jaccard(interest_ids)))
 
 # Function to draw a button
 def draw_button(x, y, width, height, text, color, hover_color, action=None):
@@ -86,6 +89,7 @@ selected_user = None
 showing_info = False
 
 interest_options = ["music", "sports", "travel", "movies", "cooking", "art", "technology", "photography", "food", "literature", "fitness"]
+match_index = InterestIndex(interest_matrix([user.interests for user in users], interest_options))
 
 while running:
     for event in pygame.event.get():
@@ -128,9 +132,10 @@ while running:
     pygame.draw.circle(screen, ACCENT, (int(main_user.x), int(main_user.y)), main_user.radius + 5, 3)
 
     # Draw other users and calculate compatibility
+    compatibilities = calculate_compatibilities(main_user)
     for user in users:
         user.draw()
-        compatibility = calculate_compatibility(main_user, user)
+        compatibility = compatibilities[user]
         
         # Draw connection line
         line_color = (int(255 * (1 - compatibility)), int(255 * compatibility), 0)
@@ -163,7 +168,7 @@ while running:
         name_text = text_font.render(f"Name: {selected_user.name}", True, TEXT_COLOR)
         age_text = text_font.render(f"Age: {selected_user.age}", True, TEXT_COLOR)
         interests_text = text_font.render(f"Interests:", True, TEXT_COLOR)
-        compatibility = calculate_compatibility(main_user, selected_user)
+        compatibility = compatibilities[selected_user]
         compatibility_text = text_font.render(f"Compatibility: {int(compatibility * 100)}%", True, TEXT_COLOR)
         
         screen.blit(name_text, (1270, 120))
@@ -1,6 +1,7 @@
 import pygame
 import random
 import math
+from song_similarity import SongSimilarity
 
 # Initialize Pygame
 pygame.init()
@@ -52,6 +53,10 @@ songs = [
     Song("Song 10", "Classical", "Slow", "Artist D"),
 ]
 
+similarity = SongSimilarity({"genre": [song.genre for song in songs],
+                             "tempo": [song.tempo for song in songs],
+                             "artist": [song.artist for song in songs]})
+
 current_song = random.choice(songs)
 
 def draw_text(text, font, color, x, y):
@@ -70,24 +75,9 @@ def draw_button(text, x, y, width, height, color, hover_color):
     text_rect = text_surf.get_rect(center=((x + width/2), (y + height/2)))
     screen.blit(text_surf, text_rect)
 
-def get_similarity_score(song1, song2):
-    score = 0
-    if song1.genre == song2.genre:
-        score += 3
-    if song1.tempo == song2.tempo:
-        score += 2
-    if song1.artist == song2.artist:
-        score += 1
-    return score
-
 def get_recommendations(current_song, all_songs):
-    recommendations = []
-    for song in all_songs:
-        if song != current_song:
-            score = get_similarity_score(current_song, song)
-            recommendations.append((song, score))
-    recommendations.sort(key=lambda x: x[1], reverse=True)
-    return recommendations[:5]
+    ids, scores = similarity.similar(all_songs.index(current_song), k=5)
+    return [(all_songs[i], int(score)) for i, score in zip(ids[0], scores[0]) if i >= 0]
 
 def draw_song_node(song, x, y, radius, color):
     pygame.draw.circle(screen, color, (x, y), radius)
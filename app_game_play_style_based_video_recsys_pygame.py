@@ -2,6 +2,7 @@ import pygame
 import sys
 import random
 import math
+from play_style import ProfileMatrix, PlayerStyles
 
 # Initialize Pygame
 pygame.init()
@@ -33,6 +34,11 @@ genres = {
     "Adventure": {"intensity": 0.6, "strategy": 0.5, "story": 0.8},
 }
 
+# Genre profiles as a matrix, and the player's style as a sliding mean of
+# the last 3 genres played
+genre_profiles = ProfileMatrix.from_dicts(genres)
+player_styles = PlayerStyles(1, len(genre_profiles.attributes), window=3)
+
 # Player profile
 player_profile = {
     "intensity": 0.5,
@@ -74,19 +80,14 @@ def draw_button(text, x, y, width, height, color, text_color, hover_color):
     draw_text(text, text_font, text_color, x + width // 2, y + height // 2, align="center")
     return button_rect
 
-def update_player_profile():
-    global player_profile
-    for attribute in player_profile:
-        total = sum(genres[game][attribute] for game in game_history)
-        player_profile[attribute] = total / len(game_history) if game_history else 0.5
+def update_player_profile(genre):
+    player_styles.observe(0, genre_profiles.vector(genres[genre]))
+    player_profile.update(zip(genre_profiles.attributes, map(float, player_styles.styles[0])))
 
 def get_recommendation():
     global recommendation
-    scores = {}
-    for genre, attributes in genres.items():
-        score = sum(abs(attributes[attr] - player_profile[attr]) for attr in attributes)
-        scores[genre] = score
-    recommendation = min(scores, key=scores.get)
+    ids, _ = genre_profiles.nearest(player_styles.styles[0], k=1, metric="l1")
+    recommendation = genre_profiles.names[ids[0, 0]]
 
 def draw_radar_chart(center_x, center_y, radius):
     attributes = list(player_profile.keys())
@@ -136,7 +137,7 @@ def main():
                             if len(game_history) >= 3:
                                 game_history.pop(0)
                             game_history.append(genre)
-                            update_player_profile()
+                            update_player_profile(genre)
                             get_recommendation()
                     if mode_toggle_rect.collidepoint(event.pos):
                         dark_mode = not dark_mode
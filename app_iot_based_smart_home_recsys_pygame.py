@@ -2,6 +2,9 @@ import pygame
 import sys
 import random
 import math
+import time
+from rule_engine import RuleSet
+from sensor_stream import SensorWindows, SensorStreamProcessor
 
 # Initialize Pygame
 pygame.init()
@@ -48,6 +51,55 @@ env_data = {
     "light_level": 50,
 }
 
+# Recommendation rules per device, in priority order; the first matching rule wins.
+# Sensor readings, including the clock's time of day, are taken relative to the user's patterns
+# (see sensor_features).
+device_rules = [
+    ("Thermostat", {"temperature_offset": ("<", 0)}, "Increase temperature"),
+    ("Thermostat", {"temperature_offset": (">", 0)}, "Decrease temperature"),
+    ("Thermostat", {}, "Temperature is optimal"),
+    ("Lights", {"sleep_offset": (">=", 0)}, "Turn off lights"),
+    ("Lights", {"wake_offset": ("<", 0)}, "Turn off lights"),
+    ("Lights", {"light_level": ("<", 30)}, "Turn on lights"),
+    ("Lights", {}, "Light level is good"),
+    ("TV", {"tv_offset": ("==", 0)}, "Turn on TV for usual viewing"),
+    ("TV", {"sleep_offset": (">=", 0)}, "Turn off TV for bedtime"),
+    ("TV", {}, "No TV recommendation"),
+    ("Security", {"sleep_offset": (">=", 0)}, "Activate night mode"),
+    ("Security", {"wake_offset": ("<", 0)}, "Activate night mode"),
+    ("Security", {}, "Standard monitoring"),
+]
+device_rule_set = RuleSet([conditions for _, conditions, _ in device_rules],
+                          [device for device, _, _ in device_rules])
+
+def sensor_features(windows, homes):
+    time_of_day = windows.value("time", homes)
+    return {
+        "temperature_offset": windows.value("temperature", homes) - user_patterns["preferred_temp"],
+        "light_level": windows.value("light_level", homes),
+        "tv_offset": time_of_day - user_patterns["tv_time"],
+        "sleep_offset": time_of_day - user_patterns["sleep_time"],
+        "wake_offset": time_of_day - user_patterns["wake_time"],
+    }
+
+def sensor_readings():
+    # This home's (home, sensor, value, timestamp) readings; the time of day wraps
+    # at midnight, so it is reported by a clock sensor and stamped like the others
+    now = time.monotonic()
+    return [0, 0, 0], [0, 1, 2], [env_data["temperature"], env_data["light_level"], env_data["time"]], [now] * 3
+
+def apply_changes(homes, groups, rules):
+    # Rule groups follow the order of the devices list
+    for group, rule in zip(groups, rules):
+        devices[group]["recommendation"] = device_rules[rule][2]
+
+# The sensors report into a stream processor, which only emits a change when
+# a reading crosses one of the device rules' thresholds
+home_sensors = SensorWindows(1, ["temperature", "light_level", "time"], env_data)
+home_sensors.add(*sensor_readings())
+sensor_processor = SensorStreamProcessor(home_sensors, device_rule_set, sensor_features, on_change=apply_changes)
+apply_changes([0] * len(devices), range(len(devices)), sensor_processor.session.outcomes[0])
+
 # Dark mode toggle
 dark_mode = False
 
@@ -82,35 +134,8 @@ def draw_device(device, x, y, width, height):
     draw_text(device['recommendation'], text_font, DARK_TEXT, x + width // 2, y + height - 30)
 
 def update_recommendations():
-    # Thermostat
-    if env_data["temperature"] < user_patterns["preferred_temp"]:
-        devices[0]["recommendation"] = "Increase temperature"
-    elif env_data["temperature"] > user_patterns["preferred_temp"]:
-        devices[0]["recommendation"] = "Decrease temperature"
-    else:
-        devices[0]["recommendation"] = "Temperature is optimal"
-
-    # Lights
-    if env_data["time"] >= user_patterns["sleep_time"] or env_data["time"] < user_patterns["wake_time"]:
-        devices[1]["recommendation"] = "Turn off lights"
-    elif env_data["light_level"] < 30:
-        devices[1]["recommendation"] = "Turn on lights"
-    else:
-        devices[1]["recommendation"] = "Light level is good"
-
-    # TV
-    if env_data["time"] == user_patterns["tv_time"]:
-        devices[2]["recommendation"] = "Turn on TV for usual viewing"
-    elif env_data["time"] >= user_patterns["sleep_time"]:
-        devices[2]["recommendation"] = "Turn off TV for bedtime"
-    else:
-        devices[2]["recommendation"] = "No TV recommendation"
-
-    # Security Camera
-    if env_data["time"] >= user_patterns["sleep_time"] or env_data["time"] < user_patterns["wake_time"]:
-        devices[3]["recommendation"] = "Activate night mode"
-    else:
-        devices[3]["recommendation"] = "Standard monitoring"
+    # Devices are updated through apply_changes when their recommendation changes
+    sensor_processor.ingest(*sensor_readings())
 
 def main():
     global dark_mode
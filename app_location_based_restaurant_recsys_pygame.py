@@ -1,7 +1,7 @@
 import pygame
 import sys
 import random
-import math
+from geo_index import RestaurantRecommender
 
 # Initialize Pygame
 pygame.init()
@@ -38,6 +38,12 @@ restaurants = [
     {"name": "Falafel Hut", "cuisine": "Middle Eastern", "x": 900, "y": 700},
 ]
 
+# Grid index over map coordinates. Candidates are capped at twice the three
+# recommendations shown, taken both nearest overall and nearest of the cuisine.
+recommender = RestaurantRecommender([r["name"] for r in restaurants], [r["cuisine"] for r in restaurants],
+                                    [r["x"] for r in restaurants], [r["y"] for r in restaurants],
+                                    cell_size=100, max_candidates=6)
+
 # User preferences
 user_x, user_y = 1000, 400
 user_cuisine = "Italian"
@@ -77,24 +83,10 @@ def draw_panel(rect, color=LIGHT_TEXT, border_color=TEXT_COLOR):
     pygame.draw.rect(screen, color, rect, border_radius=10)
     pygame.draw.rect(screen, border_color, rect, 2, border_radius=10)
 
-def distance(x1, y1, x2, y2):
-    return math.sqrt((x2 - x1)**2 + (y2 - y1)**2)
-
 def get_recommendations():
-    global dining_history
-    recommendations = []
-    for restaurant in restaurants:
-        score = 0
-        dist = distance(user_x, user_y, restaurant["x"], restaurant["y"])
-        score += 1000 / (dist + 1)  # Distance score
-        if restaurant["cuisine"] == user_cuisine:
-            score += 500  # Cuisine preference score
-        if restaurant["name"] not in dining_history:
-            score += 250  # New restaurant bonus
-        recommendations.append((restaurant, score))
-    
-    recommendations.sort(key=lambda x: x[1], reverse=True)
-    return [r[0] for r in recommendations[:3]]
+    # Distance score, cuisine preference score and new restaurant bonus
+    top, _ = recommender.recommend(user_x, user_y, user_cuisine, dining_history, n=3)
+    return [restaurants[i] for i in top]
 
 # Main game loop
 running = True
@@ -1,6 +1,7 @@
 import pygame
 import random
 from datetime import datetime, timedelta
+from news_index import NewsIndex, ReaderProfile
 
 # Initialize Pygame
 pygame.init()
@@ -64,6 +65,12 @@ articles = [
     Article("Climate Change Study", "Science", datetime.now() - timedelta(days=2))
 ]
 
+# Articles partitioned by category in publication order, and a category
+# affinity per user that is updated as they read
+news_index = NewsIndex([article.category for article in articles],
+                       [article.date.timestamp() for article in articles], categories)
+profiles = {user.name: ReaderProfile(news_index, user.interests) for user in users}
+
 def draw_text(text, font, color, x, y):
     text_surface = font.render(text, True, color)
     text_rect = text_surface.get_rect()
@@ -74,20 +81,9 @@ def draw_button(text, x, y, width, height, color):
     pygame.draw.rect(screen, color, (x, y, width, height))
     draw_text(text, text_font, BLACK, x + 10, y + 10)
 
-def get_article_score(article, user):
-    score = 0
-    if article.category in user.interests:
-        score += 3
-    if article.category in [a.category for a in user.reading_history]:
-        score += 2
-    days_old = (datetime.now() - article.date).days
-    score += max(0, 3 - days_old)  # More recent articles get higher scores
-    return score
-
 def get_recommendations(user, all_articles):
-    scored_articles = [(article, get_article_score(article, user)) for article in all_articles]
-    scored_articles.sort(key=lambda x: x[1], reverse=True)
-    return scored_articles[:5]
+    ids, scores = profiles[user.name].recommend(datetime.now().timestamp(), n=5)
+    return [(all_articles[i], int(score)) for i, score in zip(ids, scores)]
 
 def draw_news_feed(recommendations, x, y):
     for i, (article, score) in enumerate(recommendations):
@@ -143,6 +139,7 @@ def main():
                     if 400 <= y <= 440:  # Read Random Article
                         article = random.choice(articles)
                         current_user.reading_history.append(article)
+                        profiles[current_user.name].read(articles.index(article))
                         if len(current_user.reading_history) > 10:
                             current_user.reading_history.pop(0)
                     elif 450 <= y <= 490:  # Switch User
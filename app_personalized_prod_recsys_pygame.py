@@ -1,6 +1,7 @@
 import pygame
 import sys
 import random
+from rule_engine import RuleSet
 
 # Initialize Pygame
 pygame.init()
@@ -38,6 +39,11 @@ products = [
     {"name": "Cryptocurrency", "risk": "High", "income": "High", "goal": "Growth"},
 ]
 
+# Each product is a rule on the user's income, risk and goal; "Any" income accepts every level
+income_levels = ["Low", "Medium", "High"]
+product_rules = RuleSet([{"income": income_levels if product["income"] == "Any" else product["income"],
+                          "risk": product["risk"], "goal": product["goal"]} for product in products])
+
 # User preferences
 user_income = "Medium"
 user_risk = "Medium"
@@ -83,20 +89,9 @@ def draw_button(button, text):
     draw_text(text, text_font, BLACK, button["rect"].centerx, button["rect"].centery, align="center")
 
 def get_recommendations():
-    recommendations = []
-    for product in products:
-        score = 0
-        if product["income"] == user_income or product["income"] == "Any":
-            score += 1
-        if product["risk"] == user_risk:
-            score += 1
-        if product["goal"] == user_goal:
-            score += 1
-        if score > 0:
-            recommendations.append((product["name"], score))
-    
-    recommendations.sort(key=lambda x: x[1], reverse=True)
-    return [r[0] for r in recommendations[:3]]
+    # Products by number of matching preferences, at least one
+    best = product_rules.best_rules({"income": [user_income], "risk": [user_risk], "goal": [user_goal]}, n=3)[0]
+    return [products[i]["name"] for i in best]
 
 # Main game loop
 running = True
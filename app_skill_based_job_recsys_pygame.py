@@ -1,5 +1,6 @@
 import pygame
 import random
+from skill_matching import JobIndex
 
 # Initialize Pygame
 pygame.init()
@@ -67,6 +68,9 @@ jobs = [
     Job("Scrum Master", "AgileTeam", ["Project Management", "Agile", "JIRA"], "Product Management", 3)
 ]
 
+job_index = JobIndex([job.required_skills for job in jobs], [job.category for job in jobs],
+                     [job.experience_level for job in jobs])
+
 def draw_text(text, font, color, x, y):
     text_surface = font.render(text, True, color)
     text_rect = text_surface.get_rect()
@@ -77,20 +81,10 @@ def draw_button(text, x, y, width, height, color):
     pygame.draw.rect(screen, color, (x, y, width, height))
     draw_text(text, text_font, BLACK, x + 10, y + 10)
 
-def get_job_score(job, user):
-    score = 0
-    skill_match = len(set(job.required_skills) & set(user.skills))
-    score += skill_match * 2  # 2 points for each matching skill
-    if job.category in user.preferred_categories:
-        score += 3  # 3 points for matching job category
-    experience_diff = abs(job.experience_level - user.experience)
-    score += max(0, 3 - experience_diff)  # 0-3 points based on experience match
-    return score
-
 def get_recommendations(user, all_jobs):
-    scored_jobs = [(job, get_job_score(job, user)) for job in all_jobs]
-    scored_jobs.sort(key=lambda x: x[1], reverse=True)
-    return scored_jobs[:5]
+    # 2 points per matching skill, 3 for a preferred category, 0-3 for experience match
+    ids, scores = job_index.recommend(user.skills, user.preferred_categories, user.experience, n=5)
+    return [(all_jobs[i], int(score)) for i, score in zip(ids, scores)]
 
 def draw_job_listings(recommendations, x, y):
     for i, (job, score) in enumerate(recommendations):
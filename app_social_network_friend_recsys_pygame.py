@@ -1,6 +1,9 @@
 import pygame
 import random
 import math
+import scipy.sparse as sp
+from array_utils import interest_matrix
+from friend_graph import FriendGraph, adjacency_from_edges
 
 # Initialize Pygame
 pygame.init()
@@ -55,6 +58,17 @@ for user in users:
                 other_user.friends.add(user)
             user.interactions[other_user] = random.randint(0, 10)  # Random interaction count
 
+# Sparse graph view: friendships, interests and interaction counts as matrices
+user_ids = {user: i for i, user in enumerate(users)}
+friend_edges = [(user_ids[user], user_ids[friend]) for user in users for friend in user.friends]
+interactions = [(user_ids[user], user_ids[other], count) for user in users for other, count in user.interactions.items()]
+friend_graph = FriendGraph(
+    adjacency_from_edges(len(users), [s for s, _ in friend_edges], [t for _, t in friend_edges]),
+    interest_matrix([user.interests for user in users], interests),
+    sp.csr_matrix(([c for _, _, c in interactions], ([s for s, _, _ in interactions], [t for _, t, _ in interactions])),
+                  shape=(len(users), len(users))),
+    interest_candidates=True)
+
 current_user = random.choice(users)
 
 def draw_text(text, font, color, x, y):
@@ -67,20 +81,17 @@ def draw_button(text, x, y, width, height, color):
     pygame.draw.rect(screen, color, (x, y, width, height))
     draw_text(text, text_font, BLACK, x + 10, y + 10)
 
-def get_friend_score(user, other_user):
-    score = 0
-    mutual_friends = len(user.friends.intersection(other_user.friends))
-    score += mutual_friends * 2  # 2 points for each mutual friend
-    common_interests = len(set(user.interests).intersection(set(other_user.interests)))
-    score += common_interests * 3  # 3 points for each common interest
-    score += user.interactions.get(other_user, 0)  # 1 point for each interaction
-    return score
-
 def get_recommendations(user, all_users):
-    scored_users = [(other_user, get_friend_score(user, other_user)) 
-                    for other_user in all_users if other_user not in user.friends and other_user != user]
-    scored_users.sort(key=lambda x: x[1], reverse=True)
-    return scored_users[:5]
+    ids, scores = friend_graph.recommend(user_ids[user], n=5)
+    recommendations = [(all_users[i], int(score)) for i, score in zip(ids, scores)]
+    # The graph only scores connected users; fill up with zero-score non-friends in user order
+    suggested = {all_users[i] for i in ids}
+    for other_user in all_users:
+        if len(recommendations) >= 5:
+            break
+        if other_user != user and other_user not in user.friends and other_user not in suggested:
+            recommendations.append((other_user, 0))
+    return recommendations
 
 def draw_network(user, recommendations, x, y, radius):
     # Draw current user
@@ -0,0 +1,61 @@
+import numpy as np
+import scipy.sparse as sp
+
+# Array helpers shared by the recommendation engines: 0/1 sparse matrices
+# built from per-user value lists, top-k per dense or sparse row, and
+# popcounts of packed uint64 bitsets.
+
+
+def interest_matrix(user_interests, vocabulary):
+    index = {interest: i for i, interest in enumerate(vocabulary)}
+    rows = [u for u, values in enumerate(user_interests) for _ in values]
+    cols = [index[value] for values in user_interests for value in values]
+    matrix = sp.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, cols)),
+                           shape=(len(user_interests), len(vocabulary)))
+    matrix.data[:] = 1
+    return matrix
+
+
+def top_k_rows(values, k):
+    # Column ids and values of the k smallest entries per row of a 2D array,
+    # ties to the lower id; negate the values for the k largest
+    k = min(k, values.shape[1])
+    top = np.sort(np.argpartition(values, k - 1, axis=1)[:, :k], axis=1)
+    top_values = np.take_along_axis(values, top, axis=1)
+    kth = top_values.max(axis=1, keepdims=True)
+    # argpartition picks arbitrarily among entries equal to the k-th value;
+    # rows with such entries left out take everything below the k-th value,
+    # then the entries equal to it in id order
+    cut = np.flatnonzero((values == kth).sum(axis=1) > (top_values == kth).sum(axis=1))
+    if len(cut):
+        below = values[cut] < kth[cut]
+        tied = values[cut] == kth[cut]
+        room = k - below.sum(axis=1, keepdims=True)
+        keep = below | (tied & (np.cumsum(tied, axis=1) <= room))
+        top[cut] = np.nonzero(keep)[1].reshape(len(cut), k)
+        top_values[cut] = np.take_along_axis(values[cut], top[cut], axis=1)
+    order = np.argsort(top_values, axis=1, kind="stable")
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_values, order, axis=1)
+
+
+def top_n_per_row(matrix, n):
+    # (rows x n) column ids and scores of the largest entries per CSR row, -1 padded
+    matrix = matrix.tocsr()
+    num_rows = matrix.shape[0]
+    row_of = np.repeat(np.arange(num_rows), np.diff(matrix.indptr))
+    order = np.lexsort((matrix.indices, -matrix.data, row_of))
+    rank = np.arange(len(order)) - matrix.indptr[row_of[order]]
+    keep = order[rank < n]
+    ids = np.full((num_rows, n), -1, dtype=np.int64)
+    scores = np.zeros((num_rows, n), dtype=matrix.dtype)
+    ids[row_of[keep], rank[rank < n]] = matrix.indices[keep]
+    scores[row_of[keep], rank[rank < n]] = matrix.data[keep]
+    return ids, scores
+
+
+def popcount64(words):
+    # SWAR popcount of every uint64 in an array
+    words = words - ((words >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    words = (words & np.uint64(0x3333333333333333)) + ((words >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    words = (words + (words >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return ((words * np.uint64(0x0101010101010101)) >> np.uint64(56)).astype(np.int64)
@@ -1,5 +1,7 @@
 import pygame
 import random
+from association_rules import fpgrowth, generate_rules, RuleIndex
+from cooccurrence import CooccurrenceCounter
 
 # Initialize Pygame
 pygame.init()
@@ -32,7 +34,12 @@ baskets = []
 selected_items = []
 
 # Association rules
-rules = {}
+rules = RuleIndex([])
+cooccurrence = CooccurrenceCounter(top_n=3)
+MIN_SUPPORT = 0.1
+MIN_CONFIDENCE = 0.3
+# Number of baskets the mined rules were built from
+mined_baskets = 0
 
 class Item:
     def __init__(self, name, color, x, y):
@@ -64,31 +71,51 @@ def generate_items():
 def generate_basket():
     return random.sample(item_objects, random.randint(2, 5))
 
+def add_basket(basket):
+    # Incremental pair counts: cost depends on the basket, not the history
+    baskets.append(basket)
+    cooccurrence.add_basket([item.name for item in basket])
+
 def update_rules():
-    global rules
-    rules = {}
-    for basket in baskets:
-        for item1 in basket:
-            for item2 in basket:
-                if item1 != item2:
-                    if item1.name not in rules:
-                        rules[item1.name] = {}
-                    if item2.name not in rules[item1.name]:
-                        rules[item1.name][item2.name] = 0
-                    rules[item1.name][item2.name] += 1
+    global rules, mined_baskets
+    transactions = [[item.name for item in basket] for basket in baskets]
+    itemsets = fpgrowth(transactions, min_support=MIN_SUPPORT)
+    rules = RuleIndex(generate_rules(itemsets, len(transactions), min_confidence=MIN_CONFIDENCE))
+    mined_baskets = len(transactions)
 
 def draw_rules():
     y = 550
-    for item1, associated_items in rules.items():
-        text = subtitle_font.render(f"{item1} is often bought with:", True, BLACK)
+    for item in items:
+        partners = cooccurrence.top_copurchased(item, 3)
+        if not partners:
+            continue
+        text = subtitle_font.render(f"{item} is often bought with:", True, BLACK)
         screen.blit(text, (1000, y))
         y += 30
-        for item2, count in sorted(associated_items.items(), key=lambda x: x[1], reverse=True)[:3]:
-            text = item_font.render(f"  - {item2} ({count} times)", True, BLACK)
+        for partner, count in partners:
+            confidence = count / cooccurrence.item_count(item)
+            text = item_font.render(f"  - {partner} ({count} times, conf {confidence:.2f})", True, BLACK)
             screen.blit(text, (1020, y))
             y += 25
         y += 20
 
+def draw_mined_rules():
+    # Multi-item rules from the last FP-Growth run (press M). Unlike the pair
+    # counts above they are a snapshot, so the header says how old they are.
+    all_rules = sorted((rule for item_rules in rules.by_antecedent.values() for rule in item_rules),
+                       key=lambda r: (-r.lift, -r.confidence))
+    new_baskets = len(baskets) - mined_baskets
+    header = f"Mined rules: snapshot of {mined_baskets} baskets, {new_baskets} added since (press M to refresh)"
+    screen.blit(explanation_font.render(header, True, RED if new_baskets else BLACK), (50, 690))
+    # Below the header, with only as many lines as fit in the window
+    y = 712
+    for rule in all_rules[:(HEIGHT - y) // 22]:
+        antecedent = ", ".join(sorted(rule.antecedent))
+        consequent = ", ".join(sorted(rule.consequent))
+        text = explanation_font.render(f"{{{antecedent}}} -> {{{consequent}}} (conf {rule.confidence:.2f}, lift {rule.lift:.2f})", True, BLACK)
+        screen.blit(text, (50, y))
+        y += 22
+
 def draw_explanation():
     explanations = [
         "Association Rule Learning is a method used in recommendation systems.",
@@ -110,10 +137,12 @@ def draw_explanation():
         y += 25
 
 def reset_demo():
-    global baskets, selected_items, rules
+    global baskets, selected_items, rules, cooccurrence, mined_baskets
     baskets = []
     selected_items = []
-    rules = {}
+    rules = RuleIndex([])
+    cooccurrence = CooccurrenceCounter(top_n=3)
+    mined_baskets = 0
 
 # Main game loop
 running = True
@@ -136,12 +165,11 @@ while running:
         elif event.type == pygame.KEYDOWN:
             if event.key == pygame.K_RETURN:
                 if selected_items:
-                    baskets.append(selected_items.copy())
+                    add_basket(selected_items.copy())
                     selected_items.clear()
-                    update_rules()
             elif event.key == pygame.K_SPACE:
-                new_basket = generate_basket()
-                baskets.append(new_basket)
+                add_basket(generate_basket())
+            elif event.key == pygame.K_m:
                 update_rules()
 
     # Clear the screen
@@ -168,14 +196,16 @@ while running:
         "Click on items to add/remove from basket",
         "Press ENTER to confirm basket",
         "Press SPACE to generate random basket",
+        "Press M to mine multi-item rules (FP-Growth)",
         "Watch the association rules update!"
     ]
     for i, instruction in enumerate(instructions):
         text = item_font.render(instruction, True, BLACK)
-        screen.blit(text, (50, 520 + i * 30))
+        screen.blit(text, (50, 520 + i * 26))
 
     # Draw rules
     draw_rules()
+    draw_mined_rules()
 
     # Draw explanation
     draw_explanation()
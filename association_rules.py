@@ -0,0 +1,181 @@
+import time
+from collections import defaultdict
+import pandas as pd
+
+# Frequent itemset mining with FP-Growth and association rules on top.
+# Transactions are compressed into a prefix tree once, then itemsets of any
+# size are mined from conditional trees without rescanning the baskets.
+
+
+class FPNode:
+    __slots__ = ("item", "count", "parent", "children")
+
+    def __init__(self, item, parent):
+        self.item = item
+        self.count = 0
+        self.parent = parent
+        self.children = {}
+
+
+class FPTree:
+    def __init__(self):
+        self.root = FPNode(None, None)
+        self.header = defaultdict(list)
+        self.counts = defaultdict(int)
+
+    def insert(self, items, count=1):
+        node = self.root
+        for item in items:
+            child = node.children.get(item)
+            if child is None:
+                child = FPNode(item, node)
+                node.children[item] = child
+                self.header[item].append(child)
+            child.count += count
+            self.counts[item] += count
+            node = child
+
+    def prefix_paths(self, item):
+        # Conditional pattern base: every path leading to `item`, with its count
+        paths = []
+        for node in self.header[item]:
+            path = []
+            parent = node.parent
+            while parent.item is not None:
+                path.append(parent.item)
+                parent = parent.parent
+            if path:
+                paths.append((path[::-1], node.count))
+        return paths
+
+
+def _build_tree(weighted_transactions, min_count):
+    counts = defaultdict(int)
+    for items, count in weighted_transactions:
+        for item in items:
+            counts[item] += count
+    tree = FPTree()
+    for items, count in weighted_transactions:
+        # Items arrive in global rank order, so filtering keeps the order
+        frequent = [item for item in items if counts[item] >= min_count]
+        if frequent:
+            tree.insert(frequent, count)
+    return tree
+
+
+def _mine(tree, suffix, min_count, max_len, results):
+    # Least frequent items first keeps conditional trees small
+    for item in sorted(tree.counts, key=tree.counts.get):
+        itemset = suffix | {item}
+        results[itemset] = tree.counts[item]
+        if max_len and len(itemset) >= max_len:
+            continue
+        conditional = _build_tree(tree.prefix_paths(item), min_count)
+        if conditional.counts:
+            _mine(conditional, itemset, min_count, max_len, results)
+
+
+def fpgrowth(transactions, min_support=0.01, max_len=None):
+    transactions = [set(t) for t in transactions]
+    min_count = max(1, int(min_support * len(transactions) + 0.999999))
+
+    item_counts = defaultdict(int)
+    for transaction in transactions:
+        for item in transaction:
+            item_counts[item] += 1
+
+    # Rank frequent items by descending support so shared prefixes merge
+    ranked = sorted((i for i, c in item_counts.items() if c >= min_count), key=lambda i: -item_counts[i])
+    rank = {item: r for r, item in enumerate(ranked)}
+
+    tree = FPTree()
+    for transaction in transactions:
+        items = sorted((i for i in transaction if i in rank), key=rank.get)
+        if items:
+            tree.insert(items)
+
+    results = {}
+    _mine(tree, frozenset(), min_count, max_len, results)
+    return results
+
+
+class Rule:
+    __slots__ = ("antecedent", "consequent", "count", "support", "confidence", "lift")
+
+    def __init__(self, antecedent, consequent, count, support, confidence, lift):
+        self.antecedent = antecedent
+        self.consequent = consequent
+        self.count = count
+        self.support = support
+        self.confidence = confidence
+        self.lift = lift
+
+    def __repr__(self):
+        return (f"{set(self.antecedent)} -> {set(self.consequent)} "
+                f"(support={self.support:.3f}, confidence={self.confidence:.3f}, lift={self.lift:.2f})")
+
+
+def _subsets(itemset):
+    items = sorted(itemset, key=str)
+    for mask in range(1, (1 << len(items)) - 1):
+        yield frozenset(items[i] for i in range(len(items)) if mask >> i & 1)
+
+
+def generate_rules(itemsets, num_transactions, min_confidence=0.5, min_lift=1.0):
+    rules = []
+    for itemset, count in itemsets.items():
+        if len(itemset) < 2:
+            continue
+        # Every subset of a frequent itemset is frequent, so supports are known
+        for antecedent in _subsets(itemset):
+            consequent = itemset - antecedent
+            confidence = count / itemsets[antecedent]
+            if confidence < min_confidence:
+                continue
+            lift = confidence * num_transactions / itemsets[consequent]
+            if lift < min_lift:
+                continue
+            rules.append(Rule(antecedent, consequent, count, count / num_transactions, confidence, lift))
+    return rules
+
+
+class RuleIndex:
+    def __init__(self, rules):
+        self.by_antecedent = defaultdict(list)
+        for rule in rules:
+            self.by_antecedent[rule.antecedent].append(rule)
+        for antecedent_rules in self.by_antecedent.values():
+            antecedent_rules.sort(key=lambda r: (-r.confidence, -r.lift))
+
+    def __len__(self):
+        return sum(len(r) for r in self.by_antecedent.values())
+
+    def bought_together(self, items, n=5):
+        # Dictionary lookup on the exact antecedent set
+        return self.by_antecedent.get(frozenset(items), [])[:n]
+
+
+def load_movielens_baskets(path="movielens/ratings.csv", min_rating=4.0):
+    # Each user's well-rated movies form one basket
+    ratings = pd.read_csv(path)
+    liked = ratings[ratings["rating"] >= min_rating]
+    return liked.groupby("userId")["movieId"].apply(list).tolist()
+
+
+if __name__ == "__main__":
+    baskets = load_movielens_baskets()
+    movies = pd.read_csv("movielens/movies.csv").set_index("movieId")["title"]
+    print(f"{len(baskets)} baskets, {sum(len(b) for b in baskets)} items")
+
+    start = time.perf_counter()
+    itemsets = fpgrowth(baskets, min_support=0.1, max_len=4)
+    mined = time.perf_counter() - start
+    rules = generate_rules(itemsets, len(baskets), min_confidence=0.6, min_lift=1.5)
+    index = RuleIndex(rules)
+    print(f"{len(itemsets)} frequent itemsets in {mined:.2f}s, {len(index)} rules "
+          f"in {time.perf_counter() - start - mined:.2f}s")
+
+    star_wars = frozenset([260])
+    for rule in index.bought_together(star_wars):
+        print(f"{movies[260]} -> {[movies[m] for m in rule.consequent]} "
+              f"(confidence={rule.confidence:.2f}, lift={rule.lift:.2f})")
@@ -0,0 +1,183 @@
+import re
+import time
+import numpy as np
+import pandas as pd
+
+# Filter-and-rank engine over categorical item attributes.
+# Every attribute value (including each token of multi-valued columns such
+# as "cuisines") gets a posting list: a packed uint64 bitmap when the value
+# is common, a sorted row array when it is rare. A conjunctive query starts
+# from its most selective term and checks the remaining terms only for those
+# rows, and survivors are ranked through a precomputed rank position per sort
+# key instead of re-sorting the table.
+
+RESTAURANT_ATTRIBUTES = ["city", "state", "country", "pickup_enabled", "delivery_enabled"]
+RESTAURANT_SORT_KEYS = ["weighted_rating_value", "aggregated_rating_count"]
+
+
+class AttributeIndex:
+    def __init__(self, items, attributes, multi_valued=None, sort_keys=None):
+        # multi_valued maps a column to its separator, e.g. {"cuisines": ","}
+        self.items = items.reset_index(drop=True)
+        self.num_items = len(self.items)
+        self.num_words = (self.num_items + 63) // 64
+        # A bitmap costs num_words words, a row array one word per row
+        self.bitmap_threshold = self.num_words
+        self.vocabulary = {}
+        self.postings = {}
+        self.counts = {}
+        for attribute in attributes:
+            self._build(attribute, self.items[attribute].to_numpy(), np.arange(self.num_items))
+        for attribute, separator in (multi_valued or {}).items():
+            tokens = self.items[attribute].fillna("").astype(str).str.split(separator).explode().str.strip()
+            tokens = tokens[tokens != ""]
+            self._build(attribute, tokens.to_numpy(), tokens.index.to_numpy())
+
+        # Rank position per sort key: 0 is the best item, ties broken by the next key
+        self.rank_position = {}
+        for key in sort_keys or []:
+            secondary = [k for k in sort_keys if k != key]
+            columns = [-self.items[k].fillna(-np.inf).to_numpy(dtype=np.float64) for k in reversed(secondary)]
+            order = np.lexsort(columns + [-self.items[key].fillna(-np.inf).to_numpy(dtype=np.float64)])
+            position = np.empty(self.num_items, dtype=np.int64)
+            position[order] = np.arange(self.num_items)
+            self.rank_position[key] = position
+
+    def _build(self, attribute, values, rows):
+        codes, uniques = pd.factorize(values, sort=True)
+        keep = codes >= 0
+        codes, rows = codes[keep], rows[keep].astype(np.int64)
+        # Group rows by value; a value listed twice for one row counts once
+        order = np.lexsort((rows, codes))
+        codes, rows = codes[order], rows[order]
+        unique = np.ones(len(rows), dtype=bool)
+        unique[1:] = (codes[1:] != codes[:-1]) | (rows[1:] != rows[:-1])
+        codes, rows = codes[unique], rows[unique]
+        bounds = np.searchsorted(codes, np.arange(len(uniques) + 1))
+
+        self.vocabulary[attribute] = {value: i for i, value in enumerate(uniques)}
+        self.counts[attribute] = np.diff(bounds)
+        postings = []
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            if end - start > self.bitmap_threshold:
+                bits = np.zeros(self.num_words * 64, dtype=bool)
+                bits[rows[start:end]] = True
+                postings.append(np.packbits(bits, bitorder="little").view(np.uint64))
+            else:
+                postings.append(rows[start:end])
+        self.postings[attribute] = postings
+
+    def values(self, attribute):
+        return list(self.vocabulary[attribute])
+
+    def _ids(self, attribute, values):
+        vocabulary = self.vocabulary[attribute]
+        values = values if isinstance(values, (list, tuple, set)) else [values]
+        return [vocabulary[v] for v in values if v in vocabulary]
+
+    def _is_bitmap(self, posting):
+        return posting.dtype == np.uint64
+
+    def _rows(self, attribute, ids):
+        # Union of the postings of several values, as sorted row ids
+        parts = []
+        for i in ids:
+            posting = self.postings[attribute][i]
+            if self._is_bitmap(posting):
+                posting = np.flatnonzero(np.unpackbits(posting.view(np.uint8), bitorder="little")[:self.num_items])
+            parts.append(posting)
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return parts[0] if len(parts) == 1 else np.unique(np.concatenate(parts))
+
+    def _contains(self, attribute, ids, rows):
+        # Which of the given rows have any of the values
+        found = np.zeros(len(rows), dtype=bool)
+        for i in ids:
+            posting = self.postings[attribute][i]
+            if self._is_bitmap(posting):
+                found |= ((posting[rows >> 6] >> (rows & 63).astype(np.uint64)) & np.uint64(1)).astype(bool)
+            elif len(posting):
+                position = np.minimum(np.searchsorted(posting, rows), len(posting) - 1)
+                found |= posting[position] == rows
+        return found
+
+    def filter(self, conditions, require_all=None):
+        # AND across conditions; a list of values is OR-ed within its attribute.
+        # require_all lists values of a multi-valued attribute that must all be present.
+        terms = [(attribute, self._ids(attribute, values)) for attribute, values in conditions.items()]
+        for attribute, values in (require_all or {}).items():
+            terms.extend((attribute, self._ids(attribute, value)) for value in values)
+        if not terms:
+            return np.arange(self.num_items)
+
+        # Most selective term first, then only its rows are checked against the rest
+        sizes = [self.counts[attribute][ids].sum() if ids else 0 for attribute, ids in terms]
+        order = np.argsort(sizes, kind="stable")
+        attribute, ids = terms[order[0]]
+        rows = self._rows(attribute, ids)
+        for t in order[1:]:
+            if not len(rows):
+                break
+            attribute, ids = terms[t]
+            rows = rows[self._contains(attribute, ids, rows)]
+        return rows
+
+    def search(self, conditions=None, require_all=None, sort_by=None, n=10):
+        survivors = self.filter(conditions or {}, require_all)
+        if sort_by is not None and len(survivors):
+            position = self.rank_position[sort_by][survivors]
+            if len(survivors) > n:
+                top = np.argpartition(position, n - 1)[:n]
+                survivors, position = survivors[top], position[top]
+            survivors = survivors[np.argsort(position, kind="stable")]
+        return self.items.iloc[survivors[:n]]
+
+
+def build_restaurant_index(restaurants):
+    return AttributeIndex(restaurants, RESTAURANT_ATTRIBUTES, multi_valued={"cuisines": ","},
+                          sort_keys=RESTAURANT_SORT_KEYS)
+
+
+if __name__ == "__main__":
+    restaurants = pd.read_csv("North America Restaurants.csv")
+    index = build_restaurant_index(restaurants)
+    print(f"{len(restaurants)} restaurants, {len(index.values('cuisines'))} cuisine tokens, "
+          f"{len(index.values('city'))} cities")
+    print(index.search({"cuisines": "Pizza", "delivery_enabled": True, "country": "US"},
+                       sort_by="weighted_rating_value", n=5)[["name", "city", "weighted_rating_value"]])
+
+    # Interactive filtering over a large table: bitmaps vs. pandas scans
+    copies = 140
+    large = pd.concat([restaurants] * copies, ignore_index=True)
+    large["city"] = large["city"] + (np.arange(len(large)) % 50).astype(str)
+    start = time.perf_counter()
+    index = build_restaurant_index(large)
+    print(f"Indexed {len(large)} rows in {time.perf_counter() - start:.2f}s")
+
+    queries = [({"cuisines": "Vegan", "delivery_enabled": True}, {}),
+               ({"cuisines": ["Pizza", "Italian"], "state": "CA"}, {}),
+               ({"delivery_enabled": True, "pickup_enabled": True}, {"cuisines": ["Burgers", "Fast Food"]})]
+    for conditions, require_all in queries:
+        start = time.perf_counter()
+        for _ in range(20):
+            result = index.search(conditions, require_all, sort_by="aggregated_rating_count", n=50)
+        indexed = (time.perf_counter() - start) / 20
+
+        start = time.perf_counter()
+        for _ in range(3):
+            keep = np.ones(len(large), dtype=bool)
+            cuisine_terms = [conditions.get("cuisines")] + [[value] for value in require_all.get("cuisines", [])]
+            for values in cuisine_terms:
+                if values is not None:
+                    values = values if isinstance(values, list) else [values]
+                    pattern = r"(?:^|,\s*)(?:" + "|".join(map(re.escape, values)) + r")\s*(?:,|$)"
+                    keep &= large["cuisines"].fillna("").str.contains(pattern).to_numpy()
+            for attribute, values in conditions.items():
+                if attribute != "cuisines":
+                    keep &= large[attribute].isin(values if isinstance(values, list) else [values]).to_numpy()
+            expected = large[keep].sort_values(RESTAURANT_SORT_KEYS[::-1], ascending=False, kind="stable").head(50)
+        scan = (time.perf_counter() - start) / 3
+        assert list(result.index) == list(expected.index)
+        print(f"{conditions} {require_all}: {len(result)} shown, bitmap {indexed * 1000:.2f} ms, "
+              f"pandas scan {scan * 1000:.0f} ms")
@@ -0,0 +1,129 @@
+import time
+import numpy as np
+
+# Headless multi-armed bandit engine.
+# Arm statistics live in (runs, arms) numpy arrays, so every policy step
+# advances thousands of independent simulations at once.
+
+
+class EpsilonGreedy:
+    name = "Epsilon-Greedy"
+
+    def __init__(self, epsilon=0.1):
+        self.epsilon = epsilon
+
+    def select(self, counts, sums, t, rng):
+        runs, arms = counts.shape
+        # Untried arms are treated as best so every arm gets sampled once
+        means = np.divide(sums, counts, out=np.full(counts.shape, np.inf), where=counts > 0)
+        greedy = means.argmax(axis=1)
+        explore = rng.random(runs) < self.epsilon
+        return np.where(explore, rng.integers(arms, size=runs), greedy)
+
+
+class UCB1:
+    name = "UCB1"
+
+    def __init__(self, c=2.0):
+        self.c = c
+
+    def select(self, counts, sums, t, rng):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = sums / counts + np.sqrt(self.c * np.log(t) / counts)
+        scores[counts == 0] = np.inf
+        return scores.argmax(axis=1)
+
+
+class BetaThompson:
+    # Rewards in [0, 1] are treated as fractional successes
+    name = "Thompson (Beta)"
+
+    def __init__(self, alpha=1.0, beta=1.0):
+        self.alpha = alpha
+        self.beta = beta
+
+    def select(self, counts, sums, t, rng):
+        # Beta(a, b) = X / (X + Y) for X ~ Gamma(a), Y ~ Gamma(b); one float32
+        # gamma call draws both variates for every arm of every run
+        shapes = np.empty((2,) + counts.shape, dtype=np.float32)
+        np.add(sums, self.alpha, out=shapes[0], casting="same_kind")
+        np.subtract(counts, sums, out=shapes[1], casting="same_kind")
+        shapes[1] += self.beta
+        x, y = rng.standard_gamma(shapes, dtype=np.float32)
+        y += x
+        return (x / y).argmax(axis=1)
+
+
+class GaussianThompson:
+    # Known reward noise with a N(prior_mean, prior_std^2) prior per arm
+    name = "Thompson (Gaussian)"
+
+    def __init__(self, noise_std=0.1, prior_mean=0.0, prior_std=1.0):
+        self.noise_std = noise_std
+        self.prior_mean = prior_mean
+        self.prior_std = prior_std
+
+    def select(self, counts, sums, t, rng):
+        precision = 1 / self.prior_std ** 2 + counts / self.noise_std ** 2
+        mean = (self.prior_mean / self.prior_std ** 2 + sums / self.noise_std ** 2) / precision
+        samples = mean + rng.standard_normal(counts.shape) / np.sqrt(precision)
+        return samples.argmax(axis=1)
+
+
+def simulate(policy, true_means, horizon, runs, reward="bernoulli", noise_std=0.1, seed=42, checkpoints=None):
+    # checkpoints: increasing steps (1-based) at which the cumulative regret is
+    # summarised, every step by default; only a (runs,) total is kept in between
+    steps = np.arange(1, horizon + 1) if checkpoints is None else np.asarray(checkpoints, dtype=np.int64)
+    if len(steps) and (steps[0] < 1 or steps[-1] > horizon or np.any(np.diff(steps) <= 0)):
+        raise ValueError("checkpoints must be increasing steps between 1 and the horizon")
+    rng = np.random.default_rng(seed)
+    true_means = np.broadcast_to(np.asarray(true_means, dtype=np.float64), (runs, np.shape(true_means)[-1]))
+    arms = true_means.shape[1]
+    rows = np.arange(runs)
+    counts = np.zeros((runs, arms))
+    sums = np.zeros((runs, arms))
+    best = true_means.max(axis=1)
+    cumulative = np.zeros(runs)
+    regret_mean = np.empty(len(steps))
+    regret_std = np.empty(len(steps))
+    next_checkpoint = 0
+
+    start = time.perf_counter()
+    for t in range(horizon):
+        chosen = policy.select(counts, sums, t + 1, rng)
+        chosen_means = true_means[rows, chosen]
+        if reward == "bernoulli":
+            rewards = (rng.random(runs) < chosen_means).astype(np.float64)
+        else:
+            rewards = chosen_means + noise_std * rng.standard_normal(runs)
+        # Each run pulls exactly one arm, so fancy-index updates never collide
+        counts[rows, chosen] += 1
+        sums[rows, chosen] += rewards
+        cumulative += best
+        cumulative -= chosen_means
+        if next_checkpoint < len(steps) and steps[next_checkpoint] == t + 1:
+            regret_mean[next_checkpoint] = cumulative.mean()
+            regret_std[next_checkpoint] = cumulative.std()
+            next_checkpoint += 1
+    elapsed = time.perf_counter() - start
+
+    return {
+        "policy": policy.name,
+        "steps": steps,
+        "regret_mean": regret_mean,
+        "regret_std": regret_std,
+        "pull_share": counts.sum(axis=0) / counts.sum(),
+        "pulls_per_second": runs * horizon / elapsed,
+    }
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    runs, arms, horizon = 2000, 50, 2000
+    true_means = rng.beta(2, 8, size=(runs, arms))
+
+    policies = [EpsilonGreedy(0.1), UCB1(), BetaThompson(), GaussianThompson(noise_std=0.5)]
+    for policy in policies:
+        result = simulate(policy, true_means, horizon, runs, checkpoints=(100, 1000, horizon))
+        checkpoints = ", ".join(f"t={t}: {mean:.1f}" for t, mean in zip(result["steps"], result["regret_mean"]))
+        print(f"{policy.name:<20} regret {checkpoints}  ({result['pulls_per_second'] / 1e6:.2f}M pulls/s)")
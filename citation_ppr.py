@@ -0,0 +1,152 @@
+import time
+import numpy as np
+import scipy.sparse as sp
+
+# Personalized PageRank over a citation graph.
+# The graph is a CSR matrix of citing -> cited links. Scores come either from
+# sparse power iteration (one SpMV per step, stopped once the L1 change is
+# below tol) or from forward push (Andersen, Chung & Lang 2006), whose work
+# depends only on the neighbourhood it explores, not on the graph size.
+# Dangling papers (no references) return their mass to the seed distribution.
+
+
+class CitationGraph:
+    def __init__(self, num_papers, citing, cited, undirected=False):
+        citing, cited = np.asarray(citing), np.asarray(cited)
+        if undirected:
+            citing, cited = np.concatenate([citing, cited]), np.concatenate([cited, citing])
+        links = sp.csr_matrix((np.ones(len(citing)), (citing, cited)), shape=(num_papers, num_papers))
+        links.data[:] = 1
+        self.num_papers = num_papers
+        self.links = links
+        self.out_degree = np.diff(links.indptr)
+        self.dangling = (self.out_degree == 0).astype(np.float64)
+        # Column-stochastic transpose, so a step is a single SpMV
+        inverse_degree = np.where(self.out_degree == 0, 0.0, 1.0 / np.maximum(self.out_degree, 1))
+        self.transition_t = sp.csr_matrix(links.T @ sp.diags(inverse_degree))
+
+        # Scratch state for forward push, reset only where touched
+        self._estimate = np.zeros(num_papers)
+        self._residual = np.zeros(num_papers)
+
+    def seed_vector(self, seeds, weights=None):
+        seeds = np.atleast_1d(seeds)
+        weights = np.ones(len(seeds)) if weights is None else np.asarray(weights, dtype=np.float64)
+        vector = np.zeros(self.num_papers)
+        np.add.at(vector, seeds, weights)
+        return vector / vector.sum()
+
+    def ppr_power(self, seed_vectors, alpha=0.15, tol=1e-8, max_iter=100):
+        # seed_vectors: (num_papers,) or (num_papers, users) for a batch of users
+        seeds = np.asarray(seed_vectors, dtype=np.float64)
+        teleport = alpha * seeds
+        scores = seeds.copy()
+        for _ in range(max_iter):
+            dangling_mass = (1 - alpha) * (self.dangling @ scores)
+            updated = self.transition_t @ scores
+            updated *= 1 - alpha
+            updated += teleport
+            updated += seeds * dangling_mass
+            scores -= updated
+            change = np.abs(scores).sum(axis=0).max()
+            scores = updated
+            if change < tol:
+                break
+        return scores
+
+    def ppr_push(self, seeds, weights=None, alpha=0.15, epsilon=1e-6):
+        # Sparse result (papers, scores); residual mass below epsilon * degree is
+        # left unpushed. Every paper over the threshold is pushed in the same
+        # round, so each round is a few vectorised gathers over its out-links.
+        seeds = np.atleast_1d(seeds)
+        weights = np.ones(len(seeds)) if weights is None else np.asarray(weights, dtype=np.float64)
+        weights = weights / weights.sum()
+        estimate, residual = self._estimate, self._residual
+        np.add.at(residual, seeds, weights)
+        touched = [seeds]
+        frontier = np.unique(seeds)
+
+        while len(frontier):
+            mass = residual[frontier]
+            residual[frontier] = 0.0
+            estimate[frontier] += alpha * mass
+
+            # Out-links of every frontier paper, flattened
+            starts, ends = self.links.indptr[frontier], self.links.indptr[frontier + 1]
+            lengths = ends - starts
+            offsets = np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+            targets = self.links.indices[offsets + np.arange(lengths.sum())]
+            share = np.repeat((1 - alpha) * mass / np.maximum(lengths, 1), lengths)
+            # Dangling papers send their mass back to the seeds
+            dangling_mass = (1 - alpha) * mass[lengths == 0].sum()
+            if dangling_mass:
+                targets = np.concatenate([targets, seeds])
+                share = np.concatenate([share, dangling_mass * weights])
+            np.add.at(residual, targets, share)
+
+            targets = np.unique(targets)
+            touched.append(targets)
+            frontier = targets[residual[targets] >= epsilon * np.maximum(self.out_degree[targets], 1)]
+
+        touched = np.unique(np.concatenate(touched))
+        scores = estimate[touched]
+        estimate[touched] = 0.0
+        residual[touched] = 0.0
+        return touched[scores > 0], scores[scores > 0]
+
+    def recommend(self, history, n=10, prior=None, prior_weight=0.5, method="push", alpha=0.15, epsilon=1e-6):
+        # Seeds are the reading history plus optional prior papers (e.g. interest matches)
+        seeds = list(history)
+        weights = [1.0] * len(seeds)
+        if prior is not None:
+            seeds += list(prior)
+            weights += [prior_weight] * len(prior)
+        if not seeds:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        if method == "push":
+            papers, scores = self.ppr_push(np.array(seeds), weights, alpha=alpha, epsilon=epsilon)
+        else:
+            scores = self.ppr_power(self.seed_vector(seeds, weights), alpha=alpha)
+            papers = np.flatnonzero(scores > 0)
+            scores = scores[papers]
+
+        unread = ~np.isin(papers, list(history))
+        papers, scores = papers[unread], scores[unread]
+        top = np.argsort(-scores, kind="stable")[:n]
+        return papers[top], scores[top]
+
+
+def synthetic_citation_graph(num_papers, references_per_paper=10, skew=2.0, seed=0):
+    # Papers in publication order cite earlier ones; skew > 1 favours older,
+    # already well-cited papers, giving a heavy-tailed citation count
+    rng = np.random.default_rng(seed)
+    citing = np.repeat(np.arange(1, num_papers), references_per_paper)
+    cited = np.floor(citing * rng.random(len(citing)) ** skew).astype(np.int64)
+    pairs = np.unique(citing * num_papers + cited)
+    return CitationGraph(num_papers, pairs // num_papers, pairs % num_papers)
+
+
+if __name__ == "__main__":
+    num_papers = 100000
+    start = time.perf_counter()
+    graph = synthetic_citation_graph(num_papers)
+    print(f"{num_papers} papers, {graph.links.nnz} citations built in {time.perf_counter() - start:.2f}s")
+
+    rng = np.random.default_rng(1)
+    histories = [rng.integers(num_papers // 2, num_papers, size=5) for _ in range(50)]
+
+    start = time.perf_counter()
+    exact = [graph.recommend(history, n=10, method="power") for history in histories]
+    power_time = (time.perf_counter() - start) / len(histories)
+
+    start = time.perf_counter()
+    batch = graph.ppr_power(np.column_stack([graph.seed_vector(h) for h in histories]))
+    batch_time = (time.perf_counter() - start) / len(histories)
+    print(f"Power iteration: {power_time * 1000:.1f} ms/user, batched {batch_time * 1000:.1f} ms/user")
+
+    for epsilon in (1e-4, 1e-5, 1e-6):
+        start = time.perf_counter()
+        approximate = [graph.recommend(history, n=10, epsilon=epsilon) for history in histories]
+        push_time = (time.perf_counter() - start) / len(histories)
+        overlap = np.mean([len(set(a[0]) & set(e[0])) / 10 for a, e in zip(approximate, exact)])
+        print(f"Forward push eps={epsilon:g}: {push_time * 1000:.1f} ms/user, top-10 agreement {overlap:.2f}")
@@ -4,6 +4,8 @@ import plotly.express as px
 from sklearn.cluster import KMeans
 from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.decomposition import PCA
+from scipy import sparse
+from minibatch_kmeans import MiniBatchKMeansRecommender
 
 # Set page config with custom theme
 st.set_page_config(page_title="Smart Recommendations", layout="wide")
@@ -92,6 +94,7 @@ def main():
         num_items = st.slider("🛍️ Number of Items", 5, 20, 10)
         num_clusters = st.slider("🔍 Number of Clusters", 2, 8, 3)
         dimension = st.radio("📊 Visualization", ["2D", "3D"])
+        algorithm = st.radio("⚙️ Clustering", ["Full-batch K-Means", "Mini-batch K-Means"])
         
         if st.button("🔄 Regenerate Data", use_container_width=True):
             st.session_state.user_item_matrix = generate_data(num_users, num_items)
@@ -105,7 +108,15 @@ def main():
     # Process data
     similarity_matrix = cosine_similarity(user_item_matrix)
     reduced_data = PCA(n_components=3).fit_transform(user_item_matrix)
-    clusters = KMeans(n_clusters=num_clusters, random_state=42).fit_predict(user_item_matrix)
+    if algorithm == "Mini-batch K-Means":
+        # Streams users from a CSR store, as it would for the full catalogue
+        model = MiniBatchKMeansRecommender(n_clusters=num_clusters, batch_size=8, top_n=3)
+        user_item_csr = sparse.csr_matrix(user_item_matrix)
+        clusters = model.fit(user_item_csr).predict(user_item_csr)
+        top_items = model.top_items
+    else:
+        clusters = KMeans(n_clusters=num_clusters, random_state=42).fit_predict(user_item_matrix)
+        top_items = [np.argsort(-user_item_matrix[clusters == c].mean(axis=0))[:3] for c in range(num_clusters)]
     
     # Create tabs with visualizations
     tab1, tab2, tab3 = st.tabs(["📊 Clustering", "📈 Data Matrix", "ℹ️ About"])
@@ -118,6 +129,12 @@ def main():
             st.metric("Users", num_users)
         with col2:
             st.metric("Clusters", num_clusters)
+        
+        st.markdown("#### Top Items per Cluster")
+        st.table({
+            f"Cluster {c}": [f"Item {item}" for item in items]
+            for c, items in enumerate(top_items)
+        })
     
     with tab2:
         col1, col2 = st.columns(2)
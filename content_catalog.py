@@ -0,0 +1,135 @@
+import time
+import numpy as np
+import scipy.sparse as sp
+from array_utils import top_k_rows
+
+# Columnar content catalog for streaming-style recommendations.
+# Titles are numpy columns (genre code, year, popularity) and a user's
+# watched state is a boolean mask, so the blended genre / recency /
+# popularity score of the whole library is one expression. Since the genre
+# term is constant within a genre, the best titles of any user are among the
+# first k + len(watched) titles of each genre ranked by the rest of the score;
+# top-k therefore only looks at those, and a user cohort is scored against
+# them as one (users x genres) @ (genres x candidates) product.
+
+WEIGHTS = (0.5, 0.3, 0.2)
+BLOCK_ELEMENTS = 1 << 22
+
+
+def _top_k_rows(scores, k):
+    # Top-k column ids and scores per row of a 2D array, best first
+    top, negated = top_k_rows(-scores, k)
+    return top, -negated
+
+
+class ContentCatalog:
+    def __init__(self, genres, years, popularity, genre_names, min_year=None, max_year=None, weights=WEIGHTS):
+        genres = np.asarray(genres, dtype=np.int64)
+        self.num_titles = len(genres)
+        self.genre_names = list(genre_names)
+        self.genres = genres
+        self.years = np.asarray(years, dtype=np.int64)
+        self.popularity = np.asarray(popularity, dtype=np.float32)
+        self.genre_weight, recency_weight, popularity_weight = weights
+
+        min_year = self.years.min() if min_year is None else min_year
+        max_year = self.years.max() if max_year is None else max_year
+        recency = (self.years - min_year) / max(max_year - min_year, 1)
+        # The user-independent part of the score, and titles ranked by it per genre
+        self.static_scores = (recency_weight * recency + popularity_weight * self.popularity).astype(np.float32)
+        order = np.lexsort((-self.static_scores, genres))
+        bounds = np.searchsorted(genres[order], np.arange(len(self.genre_names) + 1))
+        self.by_genre = [order[s:e] for s, e in zip(bounds[:-1], bounds[1:])]
+
+    def candidates(self, depth):
+        return np.concatenate([titles[:depth] for titles in self.by_genre])
+
+    def preference_vector(self, preferences):
+        # Accepts a {genre: weight} dict or an array in genre_names order
+        if isinstance(preferences, dict):
+            return np.array([preferences[genre] for genre in self.genre_names], dtype=np.float32)
+        return np.asarray(preferences, dtype=np.float32)
+
+    def scores(self, preferences, watched=None):
+        preferences = self.preference_vector(preferences)
+        scores = self.genre_weight * preferences[self.genres] + self.static_scores
+        if watched is not None:
+            scores[watched] = -np.inf
+        return scores
+
+    def recommend(self, preferences, watched=None, k=10):
+        preferences = self.preference_vector(preferences)
+        depth = k + (0 if watched is None else int(watched.sum()))
+        candidates = self.candidates(depth)
+        scores = self.genre_weight * preferences[self.genres[candidates]] + self.static_scores[candidates]
+        if watched is not None:
+            scores[watched[candidates]] = -np.inf
+        k = min(k, int(np.isfinite(scores).sum()))
+        if k == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        top, top_scores = _top_k_rows(scores[None, :], k)
+        return candidates[top[0]], top_scores[0]
+
+    def recommend_cohort(self, preferences, watched=None, k=10):
+        # preferences: (users x genres); watched: optional sparse (users x titles) matrix
+        preferences = np.asarray(preferences, dtype=np.float32)
+        watched = None if watched is None else sp.csr_matrix(watched)
+        depth = k + (0 if watched is None else int(np.diff(watched.indptr).max(initial=0)))
+        candidates = self.candidates(depth)
+        indicator = np.zeros((len(self.genre_names), len(candidates)), dtype=np.float32)
+        indicator[self.genres[candidates], np.arange(len(candidates))] = self.genre_weight
+        position = np.full(self.num_titles, -1, dtype=np.int64)
+        position[candidates] = np.arange(len(candidates))
+
+        k = min(k, len(candidates))
+        ids = np.empty((len(preferences), k), dtype=np.int64)
+        top_scores = np.empty(ids.shape, dtype=np.float32)
+        block = max(1, BLOCK_ELEMENTS // len(candidates))
+        for start in range(0, len(preferences), block):
+            end = min(start + block, len(preferences))
+            scores = preferences[start:end] @ indicator + self.static_scores[candidates]
+            if watched is not None:
+                rows = watched[start:end].tocoo()
+                columns = position[rows.col]
+                scores[rows.row[columns >= 0], columns[columns >= 0]] = -np.inf
+            top, top_scores[start:end] = _top_k_rows(scores, k)
+            ids[start:end] = candidates[top]
+        return ids, top_scores
+
+
+def generate_catalog(num_titles, num_genres=20, seed=0):
+    rng = np.random.default_rng(seed)
+    return ContentCatalog(genres=rng.integers(num_genres, size=num_titles),
+                          years=rng.integers(1990, 2024, size=num_titles),
+                          popularity=rng.random(num_titles),
+                          genre_names=[f"Genre {g}" for g in range(num_genres)],
+                          min_year=1990, max_year=2023)
+
+
+if __name__ == "__main__":
+    num_titles, num_users = 1000000, 2000
+    catalog = generate_catalog(num_titles)
+    rng = np.random.default_rng(1)
+    preferences = rng.random((num_users, len(catalog.genre_names))).astype(np.float32)
+    history = rng.integers(num_titles, size=(num_users, 50))
+    watched = sp.csr_matrix((np.ones(history.size, dtype=bool), (np.repeat(np.arange(num_users), 50), history.ravel())),
+                            shape=(num_users, num_titles))
+
+    mask = np.zeros(num_titles, dtype=bool)
+    mask[history[0]] = True
+    start = time.perf_counter()
+    for _ in range(20):
+        ids, scores = catalog.recommend(preferences[0], mask, k=10)
+    print(f"Single user over {num_titles} titles: {(time.perf_counter() - start) / 20 * 1000:.1f} ms")
+    start = time.perf_counter()
+    for _ in range(20):
+        full = catalog.scores(preferences[0], mask)
+        expected = np.argpartition(-full, 9)[:10]
+    print(f"Full-catalog scan for comparison: {(time.perf_counter() - start) / 20 * 1000:.1f} ms")
+    assert np.allclose(np.sort(full[expected])[::-1], scores)
+
+    start = time.perf_counter()
+    cohort_ids, cohort_scores = catalog.recommend_cohort(preferences, watched, k=10)
+    elapsed = time.perf_counter() - start
+    print(f"Cohort of {num_users} users: {elapsed:.2f}s ({elapsed / num_users * 1000:.2f} ms/user)")
+    assert np.allclose(cohort_scores[0], scores)
@@ -0,0 +1,169 @@
+import heapq
+import random
+import time
+import numpy as np
+from scipy import sparse
+
+# Incremental item x item co-occurrence counts for streaming baskets.
+# New pairs land in a COO-style buffer that is periodically merged into a
+# CSR matrix, and a bounded heap per item keeps its top-N partners current,
+# so each basket costs O(basket^2) regardless of how much history exists.
+
+
+class CooccurrenceSnapshot:
+    # Read-only view; merges build new matrices, so this never changes under a reader
+    def __init__(self, matrix, item_counts, items, item_ids, num_baskets):
+        self.matrix = matrix
+        self.item_counts = item_counts
+        self.items = items
+        self.item_ids = item_ids
+        self.num_baskets = num_baskets
+
+    def count(self, item_a, item_b):
+        a, b = self.item_ids.get(item_a), self.item_ids.get(item_b)
+        if a is None or b is None:
+            return 0
+        return _csr_lookup(self.matrix, a, b)
+
+    def top_copurchased(self, item, n=5):
+        a = self.item_ids.get(item)
+        if a is None:
+            return []
+        start, end = self.matrix.indptr[a], self.matrix.indptr[a + 1]
+        partners, counts = self.matrix.indices[start:end], self.matrix.data[start:end]
+        if len(counts) > n:
+            top = np.argpartition(-counts, n - 1)[:n]
+            partners, counts = partners[top], counts[top]
+        order = np.argsort(-counts, kind="stable")
+        return [(self.items[partners[i]], int(counts[i])) for i in order]
+
+
+def _csr_lookup(matrix, row, col):
+    if row >= matrix.shape[0] or col >= matrix.shape[1]:
+        return 0
+    start, end = matrix.indptr[row], matrix.indptr[row + 1]
+    pos = start + np.searchsorted(matrix.indices[start:end], col)
+    if pos < end and matrix.indices[pos] == col:
+        return int(matrix.data[pos])
+    return 0
+
+
+class CooccurrenceCounter:
+    def __init__(self, top_n=10, merge_every=50000):
+        self.top_n = top_n
+        self.merge_every = merge_every
+        self.items = []
+        self.item_ids = {}
+        self.item_counts = np.zeros(16, dtype=np.int64)
+        self.num_baskets = 0
+        self.matrix = sparse.csr_matrix((0, 0), dtype=np.int64)
+        # Pending (row, col) -> count increments not yet merged into the CSR matrix
+        self.buffer = {}
+        # Per-item min-heap of (count, partner) plus the partners it currently holds
+        self.top_heaps = []
+        self.top_members = []
+
+    def _item_id(self, item):
+        item_id = self.item_ids.get(item)
+        if item_id is None:
+            item_id = len(self.items)
+            self.item_ids[item] = item_id
+            self.items.append(item)
+            self.top_heaps.append([])
+            self.top_members.append({})
+            if item_id >= len(self.item_counts):
+                self.item_counts = np.concatenate([self.item_counts, np.zeros_like(self.item_counts)])
+        return item_id
+
+    def pair_count(self, a, b):
+        return _csr_lookup(self.matrix, a, b) + self.buffer.get((a, b), 0)
+
+    def _update_top(self, a, b, count):
+        # Counts only grow, so a partner enters as soon as it beats the heap minimum
+        heap, members = self.top_heaps[a], self.top_members[a]
+        if b in members:
+            members[b] = count
+            for i, (_, partner) in enumerate(heap):
+                if partner == b:
+                    heap[i] = (count, b)
+                    break
+            heapq.heapify(heap)
+        elif len(heap) < self.top_n:
+            members[b] = count
+            heapq.heappush(heap, (count, b))
+        elif count > heap[0][0]:
+            _, evicted = heapq.heapreplace(heap, (count, b))
+            del members[evicted]
+            members[b] = count
+
+    def add_basket(self, basket):
+        ids = sorted({self._item_id(item) for item in basket})
+        self.num_baskets += 1
+        self.item_counts[ids] += 1
+        # The matrix is symmetric, so each unordered pair is looked up once
+        for i, a in enumerate(ids):
+            for b in ids[i + 1:]:
+                self.buffer[(a, b)] = self.buffer.get((a, b), 0) + 1
+                self.buffer[(b, a)] = self.buffer.get((b, a), 0) + 1
+                count = self.pair_count(a, b)
+                self._update_top(a, b, count)
+                self._update_top(b, a, count)
+        # Merging once the buffer is a fixed fraction of the matrix keeps the
+        # amortised merge cost per pair constant as history grows
+        if len(self.buffer) >= max(self.merge_every, self.matrix.nnz // 4):
+            self.merge()
+
+    def merge(self):
+        n = len(self.items)
+        # Pad the existing CSR to the current item count without mutating it
+        indptr = np.concatenate([self.matrix.indptr,
+                                 np.full(n - self.matrix.shape[0], self.matrix.indptr[-1])])
+        merged = sparse.csr_matrix((self.matrix.data, self.matrix.indices, indptr), shape=(n, n))
+        if self.buffer:
+            rows, cols = np.array(list(self.buffer.keys())).T
+            delta = sparse.coo_matrix((np.fromiter(self.buffer.values(), dtype=np.int64, count=len(self.buffer)),
+                                       (rows, cols)), shape=(n, n)).tocsr()
+            merged = merged + delta
+        merged.sort_indices()
+        self.matrix = merged
+        self.buffer = {}
+
+    def snapshot(self):
+        self.merge()
+        return CooccurrenceSnapshot(self.matrix, self.item_counts[:len(self.items)].copy(),
+                                    list(self.items), dict(self.item_ids), self.num_baskets)
+
+    def top_copurchased(self, item, n=None):
+        a = self.item_ids.get(item)
+        if a is None:
+            return []
+        top = sorted(self.top_heaps[a], key=lambda entry: (-entry[0], entry[1]))[:n]
+        return [(self.items[b], count) for count, b in top]
+
+    def item_count(self, item):
+        a = self.item_ids.get(item)
+        return 0 if a is None else int(self.item_counts[a])
+
+
+if __name__ == "__main__":
+    random.seed(42)
+    num_items = 50000
+    # Skewed item popularity, like a real catalogue
+    cum_weights = np.cumsum(1 / np.arange(1, num_items + 1)).tolist()
+    baskets = [random.choices(range(num_items), cum_weights=cum_weights, k=random.randint(2, 8))
+               for _ in range(100000)]
+
+    counter = CooccurrenceCounter(top_n=10)
+    start = time.perf_counter()
+    for i, basket in enumerate(baskets):
+        counter.add_basket(basket)
+        if i == len(baskets) // 2:
+            halfway = counter.snapshot()
+    elapsed = time.perf_counter() - start
+    print(f"{len(baskets)} baskets in {elapsed:.2f}s ({elapsed / len(baskets) * 1e6:.1f} us/basket)")
+
+    final = counter.snapshot()
+    print(f"Matrix: {final.matrix.shape[0]} items, {final.matrix.nnz} non-zero pairs")
+    print(f"Top partners of item 0 (live heap): {counter.top_copurchased(0, 5)}")
+    print(f"Top partners of item 0 (snapshot):  {final.top_copurchased(0, 5)}")
+    print(f"Halfway snapshot still sees {halfway.num_baskets} baskets: {halfway.top_copurchased(0, 3)}")
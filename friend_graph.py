@@ -0,0 +1,156 @@
+import time
+import numpy as np
+import scipy.sparse as sp
+from array_utils import top_n_per_row
+
+# "People you may know" over a sparse social graph.
+# Friendships are a symmetric CSR adjacency matrix A and interests a sparse
+# user x interest matrix I. Mutual-friend counts for a block of users are the
+# rows of A[users] @ A, interest overlap is evaluated only on the resulting
+# candidate pattern, and top-N per row is taken with one vectorised sort, so
+# batch recommendations for every user run block by block.
+
+
+POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def adjacency_from_edges(num_users, sources, targets):
+    # Symmetric 0/1 adjacency without self-loops or duplicate edges
+    sources, targets = np.asarray(sources), np.asarray(targets)
+    keep = sources != targets
+    rows = np.concatenate([sources[keep], targets[keep]])
+    cols = np.concatenate([targets[keep], sources[keep]])
+    adjacency = sp.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, cols)), shape=(num_users, num_users))
+    adjacency.data[:] = 1
+    return adjacency
+
+
+def power_law_graph(num_users, num_edges, exponent=2.5, seed=0):
+    # Chung-Lu style graph: endpoints drawn proportionally to power-law weights
+    rng = np.random.default_rng(seed)
+    weights = (np.arange(1, num_users + 1)) ** (-1 / (exponent - 1))
+    cumulative = np.cumsum(weights / weights.sum())
+    sources = np.minimum(np.searchsorted(cumulative, rng.random(num_edges)), num_users - 1)
+    targets = np.minimum(np.searchsorted(cumulative, rng.random(num_edges)), num_users - 1)
+    order = rng.permutation(num_users)
+    return adjacency_from_edges(num_users, order[sources], order[targets])
+
+
+class FriendGraph:
+    def __init__(self, adjacency, interests, interactions=None, mutual_weight=2.0, interest_weight=3.0,
+                 interaction_weight=1.0, interest_candidates=False):
+        self.adjacency = sp.csr_matrix(adjacency, dtype=np.float32)
+        self.adjacency.sort_indices()
+        self.interests = sp.csr_matrix(interests, dtype=np.float32)
+        self.interactions = None if interactions is None else sp.csr_matrix(interactions, dtype=np.float32)
+        self.num_users = self.adjacency.shape[0]
+        self.mutual_weight = mutual_weight
+        self.interest_weight = interest_weight
+        self.interaction_weight = interaction_weight
+        # Also suggest users who share interests but no friends; only sensible
+        # for small graphs or rare interests, since I @ I.T is dense for popular ones
+        self.interest_candidates = interest_candidates
+
+        # Sorted (row * num_users + col) keys answer "already friends?" by bisection
+        row_of = np.repeat(np.arange(self.num_users, dtype=np.int64), np.diff(self.adjacency.indptr))
+        self.edge_keys = row_of * self.num_users + self.adjacency.indices
+        # Interests as packed bitsets, so an overlap is an AND plus a popcount
+        words = (self.interests.shape[1] + 63) // 64
+        self.interest_bits = np.zeros((self.num_users, words), dtype=np.uint64)
+        interest_rows = np.repeat(np.arange(self.num_users), np.diff(self.interests.indptr))
+        np.bitwise_or.at(self.interest_bits, (interest_rows, self.interests.indices >> 6),
+                         np.left_shift(np.uint64(1), (self.interests.indices & 63).astype(np.uint64)))
+
+    def mutual_friends(self, users):
+        return self.adjacency[users] @ self.adjacency
+
+    def are_friends(self, users, others):
+        keys = np.asarray(users, dtype=np.int64) * self.num_users + others
+        position = np.minimum(np.searchsorted(self.edge_keys, keys), len(self.edge_keys) - 1)
+        return self.edge_keys[position] == keys
+
+    def interest_overlap(self, users, others, chunk_size=1 << 20):
+        overlap = np.empty(len(users), dtype=np.float32)
+        for start in range(0, len(users), chunk_size):
+            end = start + chunk_size
+            common = self.interest_bits[users[start:end]] & self.interest_bits[others[start:end]]
+            overlap[start:end] = POPCOUNT[common.view(np.uint8)].sum(axis=1)
+        return overlap
+
+    def scores(self, users):
+        # Sparse (len(users) x num_users) matrix of friend scores for non-friends
+        users = np.atleast_1d(users)
+        score = self.mutual_weight * self.mutual_friends(users)
+        if self.interactions is not None:
+            score = score + self.interaction_weight * self.interactions[users]
+        if self.interest_candidates:
+            # The product's values are exactly the interest overlaps
+            score = sp.csr_matrix(score + self.interest_weight * (self.interests[users] @ self.interests.T))
+            row_of = np.repeat(np.arange(len(users)), np.diff(score.indptr))
+        else:
+            # Interest overlap evaluated only on the candidate pattern
+            row_of = np.repeat(np.arange(len(users)), np.diff(score.indptr))
+            score.data += self.interest_weight * self.interest_overlap(users[row_of], score.indices)
+
+        # Existing friends and the users themselves are never suggested
+        owners = users[row_of]
+        keep = (score.data != 0) & (owners != score.indices) & ~self.are_friends(owners, score.indices)
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(row_of[keep], minlength=len(users)))])
+        return sp.csr_matrix((score.data[keep], score.indices[keep], indptr), shape=score.shape)
+
+    def recommend(self, user, n=5):
+        ids, scores = top_n_per_row(self.scores([user]), n)
+        keep = ids[0] >= 0
+        return ids[0][keep], scores[0][keep]
+
+    def recommend_all(self, n=10, batch_size=2000, users=None):
+        # Yields (users, ids, scores) blocks covering every requested user
+        users = np.arange(self.num_users) if users is None else np.asarray(users)
+        for start in range(0, len(users), batch_size):
+            block = users[start:start + batch_size]
+            ids, scores = top_n_per_row(self.scores(block), n)
+            yield block, ids, scores
+
+
+if __name__ == "__main__":
+    num_users, num_edges, num_interests = 200000, 1000000, 200
+    start = time.perf_counter()
+    adjacency = power_law_graph(num_users, num_edges)
+    rng = np.random.default_rng(1)
+    popularity = 1 / np.arange(1, num_interests + 1)
+    interest_rows = np.repeat(np.arange(num_users), 4)
+    interest_cols = rng.choice(num_interests, size=len(interest_rows), p=popularity / popularity.sum())
+    interests = sp.csr_matrix((np.ones(len(interest_rows), dtype=np.float32), (interest_rows, interest_cols)),
+                              shape=(num_users, num_interests))
+    interests.data[:] = 1
+    graph = FriendGraph(adjacency, interests)
+    degrees = np.diff(adjacency.indptr)
+    print(f"{num_users} users, {adjacency.nnz // 2} friendships (max degree {degrees.max()}) "
+          f"built in {time.perf_counter() - start:.2f}s")
+
+    latencies = []
+    for user in rng.integers(num_users, size=200):
+        start = time.perf_counter()
+        graph.recommend(user)
+        latencies.append(time.perf_counter() - start)
+    latencies = np.array(latencies) * 1000
+    print(f"Single user: p50 {np.percentile(latencies, 50):.2f} ms, p99 {np.percentile(latencies, 99):.2f} ms")
+
+    # Check one user against pairwise set intersections
+    user = int(np.argmax(degrees > 5))
+    friends = [set(adjacency.indices[adjacency.indptr[u]:adjacency.indptr[u + 1]]) for u in range(num_users)]
+    user_interests = [set(interests.indices[interests.indptr[u]:interests.indptr[u + 1]]) for u in range(num_users)]
+    expected = {}
+    for other in set().union(*(friends[f] for f in friends[user])) - friends[user] - {user}:
+        expected[other] = 2 * len(friends[user] & friends[other]) + 3 * len(user_interests[user] & user_interests[other])
+    scores = graph.scores([user])
+    assert dict(zip(scores.indices, scores.data)) == expected
+
+    start = time.perf_counter()
+    batch_users = rng.permutation(num_users)[:20000]
+    num_suggestions = 0
+    for block, ids, _ in graph.recommend_all(n=10, users=batch_users):
+        num_suggestions += int((ids >= 0).sum())
+    elapsed = time.perf_counter() - start
+    print(f"Batch top-10 for {len(batch_users)} users in {elapsed:.1f}s "
+          f"({len(batch_users) / elapsed:.0f} users/s, {num_suggestions} suggestions)")
@@ -0,0 +1,245 @@
+import time
+import zlib
+import numpy as np
+import pandas as pd
+
+# Geo retrieval for location-based recommendations.
+# Points are bucketed into a uniform grid (cells stored as contiguous slices
+# of one sorted array). A k-nearest query visits rings of cells around the
+# query cell and stops as soon as no unvisited cell can hold a closer point,
+# so only a small candidate set is scored instead of the whole table.
+
+EARTH_RADIUS_KM = 6371.0
+REFERENCE_LATITUDE = 45.0
+TARGET_POINTS_PER_CELL = 4
+
+# Approximate population-weighted centroids; zipcodes are placed around these
+STATE_CENTROIDS = {
+    "AB": (52.3, -114.3), "AK": (61.4, -150.0), "AL": (32.8, -86.8), "AR": (34.9, -92.4),
+    "AZ": (33.5, -111.9), "BC": (49.5, -122.8), "CA": (36.2, -119.4), "CO": (39.5, -105.0),
+    "CT": (41.6, -72.7), "DC": (38.9, -77.0), "DE": (39.2, -75.5), "FL": (27.9, -81.8),
+    "GA": (33.3, -83.9), "HI": (21.3, -157.8), "IA": (41.9, -93.1), "ID": (43.9, -115.6),
+    "IL": (41.3, -88.4), "IN": (39.9, -86.3), "KS": (38.5, -97.0), "KY": (37.8, -85.5),
+    "LA": (30.7, -91.3), "MA": (42.3, -71.5), "MB": (50.2, -97.4), "MD": (39.1, -76.8),
+    "ME": (44.3, -69.8), "MI": (42.9, -84.2), "MN": (45.3, -93.6), "MO": (38.5, -92.3),
+    "MS": (32.5, -89.6), "NC": (35.6, -79.4), "ND": (47.3, -99.0), "NE": (41.2, -97.0),
+    "NJ": (40.4, -74.4), "NM": (34.8, -106.5), "NS": (44.9, -63.6), "NV": (37.2, -115.5),
+    "NY": (41.9, -74.6), "OH": (40.5, -82.7), "OK": (35.6, -97.0), "ON": (44.0, -79.6),
+    "OR": (44.7, -122.6), "PA": (40.5, -77.2), "QC": (46.0, -72.9), "RI": (41.8, -71.4),
+    "SC": (34.0, -80.9), "SD": (44.0, -98.6), "SK": (51.4, -105.7), "TN": (35.8, -86.4),
+    "TX": (30.9, -97.4), "UT": (40.4, -111.9), "VA": (37.8, -77.8), "WA": (47.3, -121.6),
+    "WI": (43.7, -88.9), "WY": (42.7, -106.8),
+}
+
+
+def _hash_offset(key, scale):
+    # Deterministic pseudo-random offset in [-scale, scale) per key
+    code = zlib.crc32(key.encode("utf-8"))
+    return ((code & 0xFFFF) / 0x8000 - 1) * scale, ((code >> 16) / 0x8000 - 1) * scale
+
+
+def geocode_zipcodes(states, zipcodes, spread_degrees=1.0):
+    # Synthetic zipcode centroids: the state centroid plus a stable offset per zipcode
+    coordinates = np.empty((len(states), 2))
+    for i, (state, zipcode) in enumerate(zip(states, zipcodes)):
+        lat, lon = STATE_CENTROIDS[state]
+        dlat, dlon = _hash_offset(f"{state}:{zipcode}", spread_degrees)
+        coordinates[i] = lat + dlat, lon + dlon
+    return coordinates[:, 0], coordinates[:, 1]
+
+
+def project(lat, lon):
+    # Equirectangular projection to km, accurate enough for ranking nearby places
+    scale = np.pi / 180 * EARTH_RADIUS_KM
+    return (np.asarray(lon) * scale * np.cos(np.radians(REFERENCE_LATITUDE)),
+            np.asarray(lat) * scale)
+
+
+def load_north_america_restaurants(path="North America Restaurants.csv"):
+    restaurants = pd.read_csv(path, dtype={"zipcode": str})
+    lat, lon = geocode_zipcodes(restaurants["state"], restaurants["zipcode"])
+    # Small per-restaurant jitter so places sharing a zipcode do not coincide
+    jitter = np.array([_hash_offset(f"{name}:{zipcode}", 0.05)
+                       for name, zipcode in zip(restaurants["name"], restaurants["zipcode"])])
+    restaurants["lat"], restaurants["lon"] = lat + jitter[:, 0], lon + jitter[:, 1]
+    restaurants["x"], restaurants["y"] = project(restaurants["lat"], restaurants["lon"])
+    return restaurants
+
+
+class GridIndex:
+    def __init__(self, x, y, cell_size=None):
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        self.origin_x, self.origin_y = self.x.min(), self.y.min()
+        if cell_size is None:
+            # Aim for a few points per cell on average
+            area = max(np.ptp(self.x) * np.ptp(self.y), 1e-9)
+            cell_size = np.sqrt(area * TARGET_POINTS_PER_CELL / len(self.x))
+        self.cell_size = float(cell_size)
+
+        columns, rows = self._cells(self.x, self.y)
+        self.num_columns = int(columns.max()) + 1
+        self.num_rows = int(rows.max()) + 1
+        keys = rows * self.num_columns + columns
+        self.order = np.argsort(keys, kind="stable")
+        # Cell c holds order[cell_start[c]:cell_start[c + 1]]
+        self.cell_start = np.searchsorted(keys[self.order], np.arange(self.num_rows * self.num_columns + 1))
+
+    def __len__(self):
+        return len(self.x)
+
+    def _cells(self, x, y):
+        return (np.floor((x - self.origin_x) / self.cell_size).astype(np.int64),
+                np.floor((y - self.origin_y) / self.cell_size).astype(np.int64))
+
+    def _cell(self, x, y):
+        return (int(np.floor((x - self.origin_x) / self.cell_size)),
+                int(np.floor((y - self.origin_y) / self.cell_size)))
+
+    def _points_in_cells(self, columns, rows):
+        valid = (columns >= 0) & (columns < self.num_columns) & (rows >= 0) & (rows < self.num_rows)
+        keys = rows[valid] * self.num_columns + columns[valid]
+        starts, ends = self.cell_start[keys], self.cell_start[keys + 1]
+        if not len(keys) or not (ends > starts).any():
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([self.order[s:e] for s, e in zip(starts, ends) if e > s])
+
+    def _ring(self, column, row, radius):
+        if radius == 0:
+            return self._points_in_cells(np.array([column]), np.array([row]))
+        span = np.arange(-radius, radius + 1)
+        inner = span[1:-1]
+        columns = np.concatenate([column + span, column + span,
+                                  np.full(len(inner), column - radius), np.full(len(inner), column + radius)])
+        rows = np.concatenate([np.full(len(span), row - radius), np.full(len(span), row + radius),
+                               row + inner, row + inner])
+        return self._points_in_cells(columns, rows)
+
+    def query(self, x, y, k=10):
+        # Expanding-ring k-nearest search: (indices, distances), closest first
+        k = min(k, len(self))
+        column, row = self._cell(x, y)
+        max_radius = max(column, self.num_columns - 1 - column, row, self.num_rows - 1 - row)
+        # Rings closer than the grid's edge are empty when the query lies outside it
+        min_radius = max(-column, column - self.num_columns + 1, -row, row - self.num_rows + 1, 0)
+        # Distance from the query to the edges of its own cell
+        margin = min(x - (self.origin_x + column * self.cell_size),
+                     self.origin_x + (column + 1) * self.cell_size - x,
+                     y - (self.origin_y + row * self.cell_size),
+                     self.origin_y + (row + 1) * self.cell_size - y)
+
+        found, distances = [], []
+        kth = np.inf
+        for radius in range(min_radius, max(max_radius, 0) + 1):
+            points = self._ring(column, row, radius)
+            if len(points):
+                found.append(points)
+                distances.append(np.hypot(self.x[points] - x, self.y[points] - y))
+                if sum(len(p) for p in found) >= k:
+                    all_distances = np.concatenate(distances)
+                    kth = np.partition(all_distances, k - 1)[k - 1]
+            # Anything beyond this ring is at least this far away; points at
+            # exactly that distance may still tie with the k-th
+            if kth < radius * self.cell_size + max(margin, 0):
+                break
+        if not found:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        found, distances = np.concatenate(found), np.concatenate(distances)
+        # Equidistant points are taken in index order
+        top = np.lexsort((found, distances))[:k]
+        return found[top], distances[top]
+
+    def in_box(self, x_min, y_min, x_max, y_max):
+        # Points inside a viewport, e.g. after a map pan
+        first_column, first_row = self._cell(x_min, y_min)
+        last_column, last_row = self._cell(x_max, y_max)
+        first_column, first_row = max(first_column, 0), max(first_row, 0)
+        last_column, last_row = min(last_column, self.num_columns - 1), min(last_row, self.num_rows - 1)
+        columns, rows = np.meshgrid(np.arange(first_column, last_column + 1), np.arange(first_row, last_row + 1))
+        points = self._points_in_cells(columns.ravel(), rows.ravel())
+        inside = ((self.x[points] >= x_min) & (self.x[points] <= x_max) &
+                  (self.y[points] >= y_min) & (self.y[points] <= y_max))
+        return np.sort(points[inside])
+
+
+class RestaurantRecommender:
+    def __init__(self, names, cuisines, x, y, cell_size=None, max_candidates=50):
+        self.names = list(names)
+        # A restaurant may list several cuisines ("American, Burger, ...")
+        self.cuisines = [frozenset(c.strip() for c in str(value).split(",")) for value in cuisines]
+        self.index = GridIndex(x, y, cell_size)
+        self.max_candidates = max_candidates
+        self._cuisine_indexes = {}
+
+    def _cuisine_index(self, cuisine):
+        # Restaurant ids serving a cuisine and a grid over them, built on first use
+        if cuisine not in self._cuisine_indexes:
+            ids = np.flatnonzero([cuisine in cuisines for cuisines in self.cuisines])
+            index = GridIndex(self.index.x[ids], self.index.y[ids], self.index.cell_size) if len(ids) else None
+            self._cuisine_indexes[cuisine] = ids, index
+        return self._cuisine_indexes[cuisine]
+
+    def recommend(self, x, y, cuisine, history=(), n=3):
+        # Scores only the nearest candidates: distance, cuisine match and novelty.
+        # Candidates are the nearest restaurants and the nearest ones serving the
+        # cuisine. Only visited places lose the novelty bonus, so n + len(history)
+        # of each already hold the exact top n.
+        history = set(history)
+        k = max(self.max_candidates, n + len(history))
+        candidates, distances = self.index.query(x, y, k)
+        ids, cuisine_index = self._cuisine_index(cuisine)
+        if cuisine_index is not None:
+            matching, matching_distances = cuisine_index.query(x, y, k)
+            candidates = np.concatenate([candidates, ids[matching]])
+            distances = np.concatenate([distances, matching_distances])
+        # Candidates in catalogue order, so equal scores keep the restaurant order
+        candidates, first = np.unique(candidates, return_index=True)
+        distances = distances[first]
+        matches = np.fromiter((cuisine in self.cuisines[i] for i in candidates), dtype=bool, count=len(candidates))
+        unseen = np.fromiter((self.names[i] not in history for i in candidates), dtype=bool, count=len(candidates))
+        scores = 1000 / (distances + 1) + 500 * matches + 250 * unseen
+        top = np.argsort(-scores, kind="stable")[:n]
+        return candidates[top], scores[top]
+
+
+if __name__ == "__main__":
+    restaurants = load_north_america_restaurants()
+    recommender = RestaurantRecommender(restaurants["name"], restaurants["cuisines"],
+                                        restaurants["x"], restaurants["y"])
+    index = recommender.index
+    print(f"{len(restaurants)} restaurants in a {index.num_columns}x{index.num_rows} grid "
+          f"of {index.cell_size:.0f} km cells")
+
+    rng = np.random.default_rng(0)
+    sample = rng.integers(len(restaurants), size=2000)
+    queries = np.column_stack([restaurants["x"].to_numpy()[sample], restaurants["y"].to_numpy()[sample]])
+    queries += rng.normal(0, 20, size=queries.shape)
+
+    start = time.perf_counter()
+    for qx, qy in queries:
+        recommender.recommend(qx, qy, "Pizza", history=["Burger King"])
+    print(f"Recommendations: {(time.perf_counter() - start) / len(queries) * 1e6:.0f} us/query")
+
+    top, scores = recommender.recommend(queries[0, 0], queries[0, 1], "Pizza", history=["Burger King"])
+    for i, score in zip(top, scores):
+        row = restaurants.iloc[i]
+        print(f"  {row['name']} ({row['city']}, {row['state']}) score={score:.0f}")
+
+    # Scaling: nearest neighbours over a national-size table vs. a linear scan
+    num_points = 1000000
+    x = rng.uniform(0, 5000, size=num_points)
+    y = rng.uniform(0, 3000, size=num_points)
+    start = time.perf_counter()
+    index = GridIndex(x, y)
+    print(f"Indexed {num_points} points in {time.perf_counter() - start:.2f}s")
+    grid_time = scan_time = 0.0
+    for qx, qy in rng.uniform(0, [5000, 3000], size=(200, 2)):
+        start = time.perf_counter()
+        found, _ = index.query(qx, qy, 50)
+        grid_time += time.perf_counter() - start
+        start = time.perf_counter()
+        expected = np.argsort(np.hypot(x - qx, y - qy), kind="stable")[:50]
+        scan_time += time.perf_counter() - start
+        assert set(found) == set(expected)
+    print(f"k=50 nearest: grid {grid_time / 200 * 1000:.2f} ms/query, linear scan {scan_time / 200 * 1000:.2f} ms/query")
@@ -1,7 +1,7 @@
 import streamlit as st
 import numpy as np
 import plotly.graph_objs as go
-from scipy.spatial import distance
+from neighbor_search import NeighborIndex
 
 # Page configuration
 st.set_page_config(page_title="Nearest Neighbors Algorithm", layout="wide")
@@ -58,11 +58,10 @@ with col1:
     # Select a random test point
     test_point = np.random.uniform(-10, 10, 3 if dimension == "3D" else 2)
 
-    # Calculate distances
-    distances = distance.cdist([test_point], points, metric=distance_metric)[0]
-
-    # Get the indices of the k nearest neighbors
-    nearest_indices = distances.argsort()[:k_value]
+    # Query the neighbor index for the k nearest points and their distances
+    index = NeighborIndex(points, metric=distance_metric)
+    nearest_distances, nearest_indices = index.query([test_point], k_value)
+    nearest_distances, nearest_indices = nearest_distances[0], nearest_indices[0]
 
     # Plotting with improved styling
     if dimension == "2D":
@@ -160,7 +159,7 @@ with col1:
     neighbor_data = []
     for i, idx in enumerate(nearest_indices):
         neighbor = points[idx]
-        dist = distances[idx]
+        dist = nearest_distances[i]
         neighbor_data.append({
             "Neighbor": i+1,
             "Coordinates": f"[{', '.join([f'{x:.2f}' for x in neighbor])}]",
@@ -2,6 +2,7 @@ import pygame
 import sys
 import random
 import math
+from neighbor_search import NeighborIndex
 
 # Initialize Pygame
 pygame.init()
@@ -38,6 +39,9 @@ users = []
 active_user = None
 k = 3
 
+# Neighbor index over user preferences; set to None whenever the user list changes
+user_index = None
+
 # Movie genres
 GENRES = ["Action", "Comedy", "Drama", "Sci-Fi"]
 
@@ -54,8 +58,11 @@ def calculate_distance(user1, user2):
     return math.sqrt(sum((a - b) ** 2 for a, b in zip(user1.preferences, user2.preferences)))
 
 def find_k_nearest_neighbors(active_user, k):
-    distances = [(user, calculate_distance(active_user, user)) for user in users]
-    return sorted(distances, key=lambda x: x[1])[:k]
+    global user_index
+    if user_index is None:
+        user_index = NeighborIndex([user.preferences for user in users])
+    distances, indices = user_index.query([active_user.preferences], k)
+    return [(users[i], float(d)) for i, d in zip(indices[0], distances[0])]
 
 def get_recommendations(neighbors):
     total_preferences = [sum(neighbor.preferences[i] for neighbor, _ in neighbors) for i in range(len(GENRES))]
@@ -173,7 +180,7 @@ def draw_ui():
     screen.blit(k_text, (WIDTH - 100, 120))
 
 def main():
-    global users, active_user, k
+    global users, active_user, k, user_index
     
     clock = pygame.time.Clock()
     
@@ -193,6 +200,7 @@ def main():
                         active_user = User([x, y] + [random.uniform(0, 5) for _ in range(len(GENRES)-2)])
                     elif event.button == 3:  # Right-click
                         users.append(generate_random_user())
+                        user_index = None
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_UP:
                     k = min(10, k + 1)
@@ -200,6 +208,7 @@ def main():
                     k = max(1, k - 1)
                 elif event.key == pygame.K_r:
                     users = [generate_random_user() for _ in range(20)]
+                    user_index = None
                     active_user = None
                     k = 3
         
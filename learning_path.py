@@ -0,0 +1,182 @@
+import time
+import numpy as np
+import scipy.sparse as sp
+
+# Adaptive learning paths over a prerequisite DAG.
+# Courses and prerequisite -> course links are CSR arrays. The topological
+# order is computed once (Kahn's algorithm, one vectorised step per level),
+# and for every goal the courses that lead to it (its courses plus all their
+# prerequisites) are kept as a packed bitset. A learner holds a count of
+# unmet prerequisites per course and the unlocked frontier bucketed by
+# difficulty, each bucket a sorted array of topological ranks, so completing
+# a course touches only its dependents and a recommendation reads the front
+# of the easiest buckets until it has found enough courses for the goal.
+
+
+def _neighbours(indptr, indices, nodes):
+    # Concatenated CSR rows of the given nodes
+    starts, lengths = indptr[nodes], indptr[nodes + 1] - indptr[nodes]
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return indices[offsets + np.arange(lengths.sum())]
+
+
+class CurriculumGraph:
+    def __init__(self, difficulty, categories, prerequisites=()):
+        # prerequisites: (prerequisite, course) pairs
+        self.difficulty = np.asarray(difficulty, dtype=np.int64)
+        self.num_courses = len(self.difficulty)
+        self.category_names = sorted(set(categories))
+        self.category_ids = {name: i for i, name in enumerate(self.category_names)}
+        self.categories = np.array([self.category_ids[c] for c in categories], dtype=np.int64)
+
+        pairs = np.asarray(prerequisites, dtype=np.int64).reshape(-1, 2)
+        shape = (self.num_courses, self.num_courses)
+        links = sp.csr_matrix((np.ones(len(pairs), dtype=np.int8), (pairs[:, 0], pairs[:, 1])), shape=shape)
+        links.data[:] = 1
+        self.dependents = links
+        self.required = links.T.tocsr()
+        self.indegree = np.diff(self.required.indptr)
+
+        # Topological order by levels; depth is the longest prerequisite chain
+        remaining = self.indegree.copy()
+        frontier = np.flatnonzero(remaining == 0)
+        levels = []
+        while len(frontier):
+            levels.append(frontier)
+            targets = _neighbours(self.dependents.indptr, self.dependents.indices, frontier)
+            np.subtract.at(remaining, targets, 1)
+            frontier = np.unique(targets[remaining[targets] == 0])
+        self.topological_order = np.concatenate(levels) if levels else np.empty(0, dtype=np.int64)
+        if len(self.topological_order) < self.num_courses:
+            raise ValueError("Prerequisite graph has a cycle")
+        self.rank = np.empty(self.num_courses, dtype=np.int64)
+        self.rank[self.topological_order] = np.arange(self.num_courses)
+        self.depth = np.repeat(np.arange(len(levels)), [len(level) for level in levels])[self.rank]
+
+        self.goal_bits = {name: self._goal_bitset(self.categories == i) for i, name in enumerate(self.category_names)}
+
+    def _goal_bitset(self, targets):
+        # A goal's courses and everything they transitively require
+        reachable = targets.copy()
+        frontier = np.flatnonzero(targets)
+        while len(frontier):
+            needed = _neighbours(self.required.indptr, self.required.indices, frontier)
+            frontier = np.unique(needed[~reachable[needed]])
+            reachable[frontier] = True
+        return np.packbits(reachable, bitorder="little")
+
+    def leads_to(self, goal, courses):
+        bits = self.goal_bits[goal]
+        courses = np.asarray(courses, dtype=np.int64)
+        return ((bits[courses >> 3] >> (courses & 7).astype(np.uint8)) & 1).astype(bool)
+
+
+class LearnerPath:
+    def __init__(self, graph, goal, performance=50, completed=()):
+        self.graph = graph
+        self.goal = goal
+        self.performance = performance
+        self.completed = np.zeros(graph.num_courses, dtype=bool)
+        self.unmet = graph.indegree.copy()
+        # Unlocked, not yet completed courses per difficulty, as sorted topological ranks
+        self.frontier = {}
+        unlocked = np.flatnonzero(self.unmet == 0)
+        for difficulty in np.unique(graph.difficulty[unlocked]):
+            self.frontier[int(difficulty)] = np.sort(graph.rank[unlocked[graph.difficulty[unlocked] == difficulty]])
+        for course in completed:
+            self.complete(course)
+
+    def _unlock(self, course):
+        difficulty, rank = int(self.graph.difficulty[course]), self.graph.rank[course]
+        bucket = self.frontier.get(difficulty, np.empty(0, dtype=np.int64))
+        self.frontier[difficulty] = np.insert(bucket, np.searchsorted(bucket, rank), rank)
+
+    def max_difficulty(self):
+        return self.performance // 10 + 1
+
+    def complete(self, course):
+        if self.completed[course]:
+            return
+        self.completed[course] = True
+        graph = self.graph
+        if self.unmet[course] == 0:
+            difficulty = int(graph.difficulty[course])
+            bucket = self.frontier[difficulty]
+            self.frontier[difficulty] = np.delete(bucket, np.searchsorted(bucket, graph.rank[course]))
+        dependents = graph.dependents.indices[graph.dependents.indptr[course]:graph.dependents.indptr[course + 1]]
+        self.unmet[dependents] -= 1
+        for dependent in dependents[(self.unmet[dependents] == 0) & ~self.completed[dependents]]:
+            self._unlock(dependent)
+
+    def set_performance(self, performance):
+        # Only the difficulty cap changes; the frontier stays as it is
+        self.performance = performance
+
+    def set_goal(self, goal):
+        self.goal = goal
+
+    def recommend(self, k=3):
+        # Easiest unlocked courses leading to the goal, in topological order within a difficulty
+        picks = []
+        for difficulty in sorted(self.frontier):
+            if difficulty > self.max_difficulty():
+                break
+            bucket, start, chunk = self.frontier[difficulty], 0, 4 * k
+            while len(picks) < k and start < len(bucket):
+                courses = self.graph.topological_order[bucket[start:start + chunk]]
+                picks.extend(courses[self.graph.leads_to(self.goal, courses)][:k - len(picks)])
+                start, chunk = start + chunk, 2 * chunk
+            if len(picks) >= k:
+                break
+        return np.array(picks, dtype=np.int64)
+
+
+def synthetic_curriculum(num_courses, num_goals=50, max_prerequisites=3, window=2000, seed=0):
+    # Apart from the first 1% (entry-level courses), each course requires 1 to
+    # max_prerequisites of the `window` courses before it
+    rng = np.random.default_rng(seed)
+    counts = rng.integers(1, max_prerequisites + 1, size=num_courses)
+    counts[:max(1, num_courses // 100)] = 0
+    courses = np.repeat(np.arange(num_courses), counts)
+    prerequisites = courses - 1 - (rng.random(len(courses)) * np.minimum(courses, window)).astype(np.int64)
+    pairs = np.unique(np.column_stack([prerequisites, courses]), axis=0)
+    categories = [f"Goal {g}" for g in rng.integers(num_goals, size=num_courses)]
+    graph = CurriculumGraph(np.ones(num_courses, dtype=np.int64), categories, pairs)
+    # Difficulty follows depth in the graph, from 1 to 10
+    graph.difficulty = 1 + np.minimum(9, graph.depth * 10 // (graph.depth.max() + 1))
+    return graph
+
+
+if __name__ == "__main__":
+    num_courses = 100000
+    start = time.perf_counter()
+    graph = synthetic_curriculum(num_courses)
+    print(f"{num_courses} courses, {graph.dependents.nnz} prerequisite links, depth {graph.depth.max() + 1}: "
+          f"order and {len(graph.goal_bits)} goal bitsets in {time.perf_counter() - start:.1f}s")
+
+    learner = LearnerPath(graph, "Goal 0", performance=100)
+    steps = 2000
+    start = time.perf_counter()
+    for step in range(steps):
+        picks = learner.recommend(k=3)
+        if len(picks):
+            learner.complete(picks[0])
+        else:
+            learner.complete(graph.topological_order[~learner.completed[graph.topological_order]][0])
+        learner.set_performance(100 - step % 30)
+    incremental = (time.perf_counter() - start) / steps
+    frontier_size = sum(map(len, learner.frontier.values()))
+
+    # Recomputing the unlocked set from scratch on every answer, for comparison
+    start = time.perf_counter()
+    for _ in range(20):
+        met = graph.required @ learner.completed.astype(np.int64)
+        unlocked = (met == graph.indegree) & ~learner.completed
+        eligible = unlocked & graph.leads_to(learner.goal, np.arange(num_courses))
+        eligible &= graph.difficulty <= learner.max_difficulty()
+        candidates = np.flatnonzero(eligible)
+        expected = candidates[np.lexsort((graph.rank[candidates], graph.difficulty[candidates]))][:3]
+    full = (time.perf_counter() - start) / 20
+    assert np.array_equal(expected, learner.recommend(k=3))
+    print(f"Frontier of {frontier_size} courses: {incremental * 1e6:.0f} us per complete + recommend, "
+          f"full recompute {full * 1e3:.1f} ms")
@@ -1,6 +1,9 @@
 import pygame
 import random
 import sys
+import time
+import numpy as np
+from user_profiles import ProfileService
 
 # Initialize Pygame
 pygame.init()
@@ -34,6 +37,19 @@ short_term_interests = []
 # Recommendation items
 items = ["Science Book", "Tech Gadget", "History Documentary", "Art Exhibition",
          "Sports Event", "Cooking Show", "Travel Guide", "Fashion Magazine"]
+topics = ["Science", "Technology", "History", "Art", "Sports", "Cooking", "Travel", "Fashion"]
+
+# Hour of day at which each long-term interest is usually followed
+interest_hours = {"Science": 9, "Technology": 13, "History": 19, "Art": 21}
+
+# One topic per item; long-term history decays over weeks, short-term clicks over
+# an hour, and topics followed around the current hour get the time-of-day share
+profiles = ProfileService(np.eye(len(topics)), num_users=1, weights=(0.6, 0.3, 0.1))
+now = time.time()
+# Oldest day first: record expects events in time order
+for days_ago in range(64, 9, -6):
+    for interest in long_term_interests:
+        profiles.record(0, topics.index(interest), now - days_ago * 86400, hour=interest_hours[interest])
 
 # Button class
 class Button:
@@ -77,6 +93,7 @@ def main():
                     if len(short_term_interests) < 3:
                         new_interest = random.choice([item for item in items if item not in short_term_interests])
                         short_term_interests.append(new_interest)
+                        profiles.record(0, items.index(new_interest), time.time(), hour=time.localtime().tm_hour)
                 elif recommend_button.is_clicked(event.pos):
                     recommendations = generate_recommendations()
             elif event.type == pygame.MOUSEMOTION:
@@ -105,9 +122,10 @@ def main():
 
         # Draw explanation
         draw_text("How it works:", 800, 600, BLACK, subtitle_font)
-        draw_text("- Long-term interests have 70% weight", 820, 650, BLACK, text_font)
+        draw_text("- Long-term interests have 60% weight", 820, 650, BLACK, text_font)
         draw_text("- Short-term interests have 30% weight", 820, 690, BLACK, text_font)
-        draw_text("- Recommendations are based on weighted random selection", 820, 730, BLACK, text_font)
+        draw_text("- Interests usually followed at this hour have 10% weight", 820, 730, BLACK, text_font)
+        draw_text("- Items are ranked by similarity to the time-decayed profile", 820, 770, BLACK, text_font)
 
         # Update the display
         pygame.display.flip()
@@ -125,9 +143,8 @@ def draw_section(title, items, x, y, color):
         draw_text(f"- {item}", x + 20, y + 40 + i * 35, BLACK, text_font)
 
 def generate_recommendations():
-    all_interests = long_term_interests + short_term_interests
-    weights = [0.7] * len(long_term_interests) + [0.3] * len(short_term_interests)
-    recommendations = random.choices(all_interests, weights=weights, k=5)
+    top, _ = profiles.recommend(0, np.arange(len(items)), time.time(), n=5, hour=time.localtime().tm_hour)
+    recommendations = [items[i] for i in top]
     return recommendations
 
 if __name__ == "__main__":
@@ -0,0 +1,218 @@
+import time
+import numpy as np
+import scipy.sparse as sp
+from array_utils import top_n_per_row
+
+# Jaccard similarity search over interest sets with MinHash and LSH banding.
+# Every interest gets num_perm hash values, so a profile's signature is the
+# column-wise minimum over its interests, and two signatures agree in a
+# position with probability equal to the Jaccard similarity of the sets.
+# Signatures are cut into bands of rows; profiles whose band matches land in
+# the same bucket, which happens with probability 1 - (1 - s^rows)^bands.
+# Only bucket mates are re-scored with exact Jaccard, so more bands raise
+# recall and longer bands cut candidates.
+
+PRIME = (1 << 31) - 1
+EMPTY = np.iinfo(np.uint32).max
+
+
+def collision_probability(similarity, bands, rows):
+    # Chance that two profiles with this Jaccard similarity become candidates
+    return 1 - (1 - np.asarray(similarity, dtype=np.float64) ** rows) ** bands
+
+
+class InterestIndex:
+    def __init__(self, interests, num_perm=64, bands=16, max_bucket=200, seed=0):
+        # interests: sparse 0/1 (profiles x interests) matrix
+        self.interests = sp.csr_matrix(interests, dtype=np.float32)
+        self.interests.sum_duplicates()
+        self.interests.data[:] = 1
+        self.num_profiles, num_interests = self.interests.shape
+        self.sizes = np.diff(self.interests.indptr)
+        self.bands, self.rows = bands, num_perm // bands
+        # Buckets larger than this only pair each profile with the next
+        # max_bucket members, which bounds the cost of very common sets
+        self.max_bucket = max_bucket
+
+        # One universal hash (a * x + b) mod PRIME per permutation, applied to
+        # the interest vocabulary once
+        rng = np.random.default_rng(seed)
+        a = rng.integers(1, PRIME, size=num_perm, dtype=np.uint64)
+        b = rng.integers(0, PRIME, size=num_perm, dtype=np.uint64)
+        interest_ids = np.arange(num_interests, dtype=np.uint64)[:, None]
+        self.hash_table = ((a * interest_ids + b) % np.uint64(PRIME)).astype(np.uint32)
+        self.signatures = self.signature_matrix(self.interests)
+
+        # Per band: bucket keys sorted, with the profiles in that order. Empty
+        # profiles would all share one bucket, so they are left out.
+        self.band_keys, self.band_profiles = [], []
+        nonempty = np.flatnonzero(self.sizes > 0)
+        for band in range(bands):
+            keys = self._band_keys(self.signatures[nonempty], band)
+            order = np.argsort(keys, kind="stable")
+            self.band_keys.append(keys[order])
+            self.band_profiles.append(nonempty[order])
+
+    def signature_matrix(self, interests, block=8):
+        # (profiles x num_perm) minimum hash over each profile's interests
+        interests = sp.csr_matrix(interests)
+        num_perm = self.hash_table.shape[1]
+        signatures = np.full((interests.shape[0], num_perm), EMPTY, dtype=np.uint32)
+        nonempty = np.flatnonzero(np.diff(interests.indptr) > 0)
+        if not len(nonempty):
+            return signatures
+        for start in range(0, num_perm, block):
+            hashes = self.hash_table[interests.indices, start:start + block]
+            minima = np.minimum.reduceat(hashes, interests.indptr[nonempty], axis=0)
+            signatures[nonempty, start:start + block] = minima
+        return signatures
+
+    def _band_keys(self, signatures, band):
+        columns = signatures[:, band * self.rows:(band + 1) * self.rows].astype(np.uint64)
+        keys = np.zeros(len(signatures), dtype=np.uint64)
+        for column in columns.T:
+            keys = keys * np.uint64(1000003) + column
+        return keys
+
+    def jaccard(self, profiles, others):
+        # Exact Jaccard for aligned pairs of profiles
+        profiles, others = np.asarray(profiles), np.asarray(others)
+        common = np.asarray(self.interests[profiles].multiply(self.interests[others]).sum(axis=1)).ravel()
+        union = self.sizes[profiles] + self.sizes[others] - common
+        return np.where(union > 0, common / np.maximum(union, 1), 0.0)
+
+    def set_jaccard(self, interest_ids, profiles=None):
+        # Exact Jaccard of an arbitrary interest set against profiles (default all)
+        interest_ids = np.unique(np.asarray(interest_ids, dtype=np.int64))
+        matrix = self.interests if profiles is None else self.interests[profiles]
+        sizes = np.diff(matrix.indptr)
+        common = np.asarray(matrix[:, interest_ids].sum(axis=1)).ravel()
+        union = sizes + len(interest_ids) - common
+        return np.where(union > 0, common / np.maximum(union, 1), 0.0)
+
+    def _bucket_members(self, signature):
+        members = []
+        for band in range(self.bands):
+            key = self._band_keys(signature[None, :], band)[0]
+            keys = self.band_keys[band]
+            start = np.searchsorted(keys, key, side="left")
+            end = min(np.searchsorted(keys, key, side="right"), start + self.max_bucket)
+            members.append(self.band_profiles[band][start:end])
+        return np.unique(np.concatenate(members))
+
+    def candidates(self, profile):
+        candidates = self._bucket_members(self.signatures[profile])
+        return candidates[candidates != profile]
+
+    def query(self, profile, n=10, threshold=0.0):
+        # Top-n profiles by exact Jaccard among the LSH candidates
+        candidates = self.candidates(profile)
+        scores = self.jaccard(np.full(len(candidates), profile), candidates)
+        return self._top(candidates, scores, n, threshold)
+
+    def query_set(self, interest_ids, n=10, threshold=0.0):
+        # Same as query, for an interest set that is not in the index
+        interest_ids = np.unique(np.asarray(interest_ids, dtype=np.int64))
+        if not len(interest_ids):
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        row = sp.csr_matrix((np.ones(len(interest_ids)), interest_ids, [0, len(interest_ids)]),
+                            shape=(1, self.interests.shape[1]))
+        candidates = self._bucket_members(self.signature_matrix(row)[0])
+        return self._top(candidates, self.set_jaccard(interest_ids, candidates), n, threshold)
+
+    @staticmethod
+    def _top(candidates, scores, n, threshold):
+        keep = scores >= threshold
+        candidates, scores = candidates[keep], scores[keep]
+        top = np.argsort(-scores, kind="stable")[:n]
+        return candidates[top], scores[top]
+
+    def candidate_pairs(self):
+        # Every (profile, other) pair with profile < other that shares a bucket
+        pairs = []
+        for keys, profiles in zip(self.band_keys, self.band_profiles):
+            for offset in range(1, min(self.max_bucket, len(keys))):
+                same = np.flatnonzero(keys[offset:] == keys[:-offset])
+                if not len(same):
+                    break
+                first, second = profiles[same], profiles[same + offset]
+                pairs.append(np.minimum(first, second) * self.num_profiles + np.maximum(first, second))
+        if not pairs:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        pairs = np.unique(np.concatenate(pairs))
+        return pairs // self.num_profiles, pairs % self.num_profiles
+
+    def all_pairs(self, threshold=0.5, chunk_size=1 << 20):
+        # Candidate pairs re-scored with exact Jaccard, keeping those >= threshold
+        first, second = self.candidate_pairs()
+        scores = np.concatenate([self.jaccard(first[s:s + chunk_size], second[s:s + chunk_size])
+                                 for s in range(0, len(first), chunk_size)] or [np.empty(0)])
+        keep = scores >= threshold
+        return first[keep], second[keep], scores[keep]
+
+    def mutual_matches(self, n=5, threshold=0.0):
+        # Pairs where each profile is among the other's top-n matches
+        first, second, scores = self.all_pairs(threshold)
+        shape = (self.num_profiles, self.num_profiles)
+        # A tiny offset keeps zero-similarity pairs as explicit entries
+        matrix = sp.csr_matrix((np.concatenate([scores, scores]) + 1e-9,
+                                (np.concatenate([first, second]), np.concatenate([second, first]))), shape=shape)
+        ids, _ = top_n_per_row(matrix, n)
+        rows = np.repeat(np.arange(self.num_profiles), n)
+        chosen = ids.ravel()
+        valid = chosen >= 0
+        rows, chosen = rows[valid], chosen[valid]
+        keys = rows * self.num_profiles + chosen
+        reciprocal = np.isin(keys, chosen * self.num_profiles + rows) & (rows < chosen)
+        first, second = rows[reciprocal], chosen[reciprocal]
+        return first, second, self.jaccard(first, second)
+
+
+def clustered_profiles(num_profiles, num_clusters=50000, pool_size=12, picks=8, num_interests=20000, seed=0):
+    # Profiles drawn from overlapping interest pools, so that profiles in the
+    # same cluster have Jaccard similarity around 0.5
+    rng = np.random.default_rng(seed)
+    pools = rng.integers(num_interests, size=(num_clusters, pool_size))
+    clusters = rng.integers(num_clusters, size=num_profiles)
+    choice = np.argsort(rng.random((num_profiles, pool_size)), axis=1)[:, :picks]
+    interests = np.take_along_axis(pools[clusters], choice, axis=1)
+    rows = np.repeat(np.arange(num_profiles), picks)
+    matrix = sp.csr_matrix((np.ones(rows.size, dtype=np.float32), (rows, interests.ravel())),
+                           shape=(num_profiles, num_interests))
+    matrix.data[:] = 1
+    return matrix
+
+
+if __name__ == "__main__":
+    num_profiles = 1000000
+    interests = clustered_profiles(num_profiles)
+    rng = np.random.default_rng(1)
+    sample = rng.integers(num_profiles, size=200)
+    # Exact top-10 per sampled profile, scored against the whole catalog
+    overlap = (interests[sample] @ interests.T).tocsr()
+    sizes = np.diff(interests.indptr)
+    exact = []
+    for i, profile in enumerate(sample):
+        row = overlap[i]
+        scores = row.data / (sizes[profile] + sizes[row.indices] - row.data)
+        scores = np.sort(scores[(row.indices != profile) & (scores >= 0.3)])[::-1][:10]
+        exact.append(scores)
+
+    print(f"{num_profiles} profiles; all-pairs Jaccard would be {num_profiles * (num_profiles - 1) // 2:.2e} pairs")
+    for bands, rows in ((16, 4), (32, 2), (8, 8)):
+        start = time.perf_counter()
+        index = InterestIndex(interests, num_perm=bands * rows, bands=bands)
+        build_time = time.perf_counter() - start
+        start = time.perf_counter()
+        found = [index.query(profile, n=10, threshold=0.3)[1] for profile in sample]
+        query_time = (time.perf_counter() - start) / len(sample)
+        # Ties make the exact top-10 ambiguous, so recall counts matches scoring
+        # at least as high as the exact 10th best
+        hits = sum(min(len(e), int((f >= e[-1] - 1e-9).sum())) for f, e in zip(found, exact) if len(e))
+        recall = hits / max(sum(len(e) for e in exact), 1)
+        print(f"{bands} bands x {rows} rows: built in {build_time:.1f}s, {query_time * 1000:.2f} ms/query, "
+              f"recall@10 {recall:.3f}, P(candidate | J=0.3) {collision_probability(0.3, bands, rows):.2f}")
+
+    start = time.perf_counter()
+    first, second, scores = index.mutual_matches(n=5, threshold=0.3)
+    print(f"Batch reciprocal top-5 matching: {len(first)} mutual pairs in {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,178 @@
+import time
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Streaming user clustering for large, sparse user-item matrices.
+# Users are consumed from a CSR store in mini-batches, so the full dense
+# matrix never has to be materialised. Centroids stay dense (k x items),
+# which is small compared to the user matrix.
+
+
+def load_movielens_csr(path="movielens/ratings.csv"):
+    ratings = pd.read_csv(path)
+    user_codes, user_ids = pd.factorize(ratings["userId"])
+    item_codes, item_ids = pd.factorize(ratings["movieId"])
+    matrix = sparse.csr_matrix(
+        (ratings["rating"].to_numpy(dtype=np.float32), (user_codes, item_codes)),
+        shape=(len(user_ids), len(item_ids))
+    )
+    return matrix, np.asarray(user_ids), np.asarray(item_ids)
+
+
+def generate_sparse_data(num_users, num_items, density=0.01, seed=42):
+    rng = np.random.default_rng(seed)
+    matrix = sparse.random(num_users, num_items, density=density, format="csr",
+                           dtype=np.float32, random_state=rng)
+    # Map uniform values onto a 1-5 star scale
+    matrix.data = np.ceil(matrix.data * 5).astype(np.float32)
+    return matrix
+
+
+def iter_batches(matrix, batch_size, rng=None):
+    # Yield row slices of a CSR matrix; shuffled when an rng is given
+    num_rows = matrix.shape[0]
+    order = rng.permutation(num_rows) if rng is not None else np.arange(num_rows)
+    for start in range(0, num_rows, batch_size):
+        rows = order[start:start + batch_size]
+        yield rows, matrix[rows]
+
+
+class MiniBatchKMeansRecommender:
+    def __init__(self, n_clusters=8, batch_size=1024, seed_sample_size=10000,
+                 max_epochs=5, tol=1e-4, top_n=20, random_state=42):
+        self.n_clusters = n_clusters
+        self.batch_size = batch_size
+        self.seed_sample_size = seed_sample_size
+        self.max_epochs = max_epochs
+        self.tol = tol
+        self.top_n = top_n
+        self.rng = np.random.default_rng(random_state)
+        self.centroids = None
+        self.counts = None
+        self.top_items = None
+
+    def _squared_distances(self, rows):
+        # ||x||^2 - 2 x.c + ||c||^2 with a sparse-dense product for x.c
+        row_norms = np.asarray(rows.multiply(rows).sum(axis=1)).ravel()
+        centroid_norms = np.einsum("ij,ij->i", self.centroids, self.centroids)
+        cross = np.asarray(rows @ self.centroids.T)
+        distances = row_norms[:, None] - 2 * cross + centroid_norms[None, :]
+        return np.maximum(distances, 0)
+
+    def _kmeans_plus_plus(self, sample):
+        num_rows = sample.shape[0]
+        centroids = np.empty((self.n_clusters, sample.shape[1]), dtype=np.float64)
+        centroids[0] = sample[self.rng.integers(num_rows)].toarray().ravel()
+        self.centroids = centroids[:1]
+        closest = self._squared_distances(sample).ravel()
+        for c in range(1, self.n_clusters):
+            total = closest.sum()
+            if total > 0:
+                pick = self.rng.choice(num_rows, p=closest / total)
+            else:
+                pick = self.rng.integers(num_rows)
+            centroids[c] = sample[pick].toarray().ravel()
+            self.centroids = centroids[c:c + 1]
+            closest = np.minimum(closest, self._squared_distances(sample).ravel())
+        self.centroids = centroids
+
+    def _assign(self, rows):
+        return self._squared_distances(rows).argmin(axis=1)
+
+    def _update(self, rows, labels):
+        # Per-centre learning rate 1/count makes each centroid the running
+        # mean of every row ever assigned to it
+        batch_counts = np.bincount(labels, minlength=self.n_clusters)
+        indicator = sparse.csr_matrix(
+            (np.ones(len(labels)), (labels, np.arange(len(labels)))),
+            shape=(self.n_clusters, len(labels))
+        )
+        batch_sums = np.asarray((indicator @ rows).todense())
+        new_counts = self.counts + batch_counts
+        active = batch_counts > 0
+        previous = self.centroids[active].copy()
+        self.centroids[active] = (
+            self.centroids[active] * (self.counts[active] / new_counts[active])[:, None]
+            + batch_sums[active] / new_counts[active][:, None]
+        )
+        self.counts = new_counts
+        if not active.any():
+            return 0.0
+        return float(np.abs(self.centroids[active] - previous).max())
+
+    def fit(self, matrix):
+        matrix = sparse.csr_matrix(matrix, dtype=np.float64)
+        sample_size = min(self.seed_sample_size, matrix.shape[0])
+        sample_rows = self.rng.choice(matrix.shape[0], sample_size, replace=False)
+        self.n_clusters = min(self.n_clusters, sample_size)
+        self._kmeans_plus_plus(matrix[sample_rows])
+        self.counts = np.zeros(self.n_clusters, dtype=np.int64)
+
+        for _ in range(self.max_epochs):
+            largest_shift = 0.0
+            for _, rows in iter_batches(matrix, self.batch_size, self.rng):
+                labels = self._assign(rows)
+                largest_shift = max(largest_shift, self._update(rows, labels))
+            if largest_shift < self.tol:
+                break
+
+        self.refresh_top_items()
+        return self
+
+    def partial_fit(self, rows):
+        # Fold newly arrived user rows into the existing centroids
+        rows = sparse.csr_matrix(rows, dtype=np.float64)
+        if self.centroids is None:
+            self.n_clusters = min(self.n_clusters, rows.shape[0])
+            self._kmeans_plus_plus(rows)
+            self.counts = np.zeros(self.n_clusters, dtype=np.int64)
+        labels = self._assign(rows)
+        self._update(rows, labels)
+        self.refresh_top_items()
+        return labels
+
+    def predict(self, matrix):
+        matrix = sparse.csr_matrix(matrix, dtype=np.float64)
+        labels = np.empty(matrix.shape[0], dtype=np.int64)
+        for rows_idx, rows in iter_batches(matrix, self.batch_size):
+            labels[rows_idx] = self._assign(rows)
+        return labels
+
+    def refresh_top_items(self):
+        # The centroid is the mean rating per item within the cluster, so
+        # its largest entries are the cluster's most liked items
+        top_n = min(self.top_n, self.centroids.shape[1])
+        top = np.argpartition(-self.centroids, top_n - 1, axis=1)[:, :top_n]
+        scores = np.take_along_axis(self.centroids, top, axis=1)
+        order = np.argsort(-scores, axis=1)
+        self.top_items = np.take_along_axis(top, order, axis=1)
+
+    def recommend(self, user_row, n=10):
+        user_row = sparse.csr_matrix(user_row, dtype=np.float64)
+        cluster = self._assign(user_row)[0]
+        seen = set(user_row.indices)
+        return cluster, [item for item in self.top_items[cluster] if item not in seen][:n]
+
+
+if __name__ == "__main__":
+    matrix, user_ids, item_ids = load_movielens_csr()
+    print(f"MovieLens: {matrix.shape[0]} users x {matrix.shape[1]} items, {matrix.nnz} ratings")
+
+    model = MiniBatchKMeansRecommender(n_clusters=20, batch_size=256)
+    start = time.perf_counter()
+    model.fit(matrix)
+    print(f"Fit in {time.perf_counter() - start:.2f}s, cluster sizes: {np.bincount(model.predict(matrix))}")
+    cluster, items = model.recommend(matrix[0])
+    print(f"User {user_ids[0]} -> cluster {cluster}, recommended movieIds: {item_ids[items].tolist()}")
+
+    # Larger synthetic workload to check throughput
+    big = generate_sparse_data(160000, 60000, density=0.0005)
+    model = MiniBatchKMeansRecommender(n_clusters=50, batch_size=4096, max_epochs=2)
+    start = time.perf_counter()
+    model.fit(big)
+    print(f"Synthetic {big.shape[0]} x {big.shape[1]} ({big.nnz} ratings) fit in {time.perf_counter() - start:.2f}s")
+
+    # New ratings arrive for a handful of users
+    labels = model.partial_fit(generate_sparse_data(100, 60000, density=0.001, seed=7))
+    print(f"Incremental update assigned new users to clusters: {np.bincount(labels, minlength=50)}")
@@ -1,6 +1,8 @@
 import pygame
 import random
 import math
+import numpy as np
+from bandit_simulator import EpsilonGreedy, UCB1, GaussianThompson
 
 # Initialize Pygame
 pygame.init()
@@ -54,6 +56,11 @@ auto_play = False
 auto_play_speed = 1  # rounds per second
 show_help = False
 
+# Selection policies from the headless engine, cycled with P
+policies = [EpsilonGreedy(epsilon), UCB1(), GaussianThompson(noise_std=0.1)]
+policy_index = 0
+rng = np.random.default_rng()
+
 # Helper functions
 def draw_text(text, font, color, x, y, align="left"):
     text_surface = font.render(text, True, color)
@@ -81,10 +88,11 @@ def draw_bandits():
         draw_text("RECOMMEND", text_font, BLACK, x, y+70, align="center")
 
 def select_bandit():
-    if random.random() < epsilon:
-        return random.choice(bandits)
-    else:
-        return max(bandits, key=lambda b: b.estimated_mean)
+    # A single simulation run: arm statistics as a (1, arms) array
+    counts = np.array([[bandit.pulls for bandit in bandits]], dtype=np.float64)
+    sums = np.array([[bandit.estimated_mean * bandit.pulls for bandit in bandits]])
+    chosen = policies[policy_index].select(counts, sums, rounds + 1, rng)[0]
+    return bandits[chosen]
 
 def update_bandit(bandit, reward):
     bandit.pulls += 1
@@ -180,6 +188,8 @@ while running:
                 auto_play_speed = min(10, auto_play_speed + 1)
             elif event.key == pygame.K_DOWN:
                 auto_play_speed = max(1, auto_play_speed - 1)
+            elif event.key == pygame.K_p:
+                policy_index = (policy_index + 1) % len(policies)
 
     # Auto-play
     if auto_play and not show_help:
@@ -203,7 +213,7 @@ while running:
         draw_text("Developed by: Venugopal Adep", subtitle_font, GRAY, WIDTH//2, 100, align="center")
 
         # Instructions and Stats
-        info_rect = pygame.Rect(800, 150, 750, 300)
+        info_rect = pygame.Rect(800, 150, 750, 340)
         pygame.draw.rect(screen, WHITE, info_rect, border_radius=10)
         pygame.draw.rect(screen, GRAY, info_rect, border_radius=10, width=2)
 
@@ -211,7 +221,8 @@ while running:
             "Instructions:",
             "- Click on a product to recommend it.",
             "- Space: Toggle auto-play",
-            "- Up/Down arrows: Change auto-play speed"
+            "- Up/Down arrows: Change auto-play speed",
+            "- P: Switch selection policy"
         ]
         for i, instruction in enumerate(instructions):
             draw_text(instruction, text_font, BLACK, info_rect.left + 20, info_rect.top + 20 + i * 30)
@@ -219,6 +230,7 @@ while running:
         stats = [
             f"Total Reward: {total_reward:.2f}",
             f"Rounds: {rounds}",
+            f"Policy: {policies[policy_index].name}",
             f"Epsilon: {epsilon:.2f}",
             f"Auto-play: {'ON' if auto_play else 'OFF'}",
             f"Auto-play Speed: {auto_play_speed}"
@@ -0,0 +1,134 @@
+import time
+import numpy as np
+from scipy.spatial import cKDTree
+from scipy.spatial import distance
+from array_utils import top_k_rows
+
+# Nearest-neighbour search over preference vectors.
+# Low-dimensional data goes into a KD-tree (sublinear queries when the
+# geometry allows); high-dimensional data uses blocked brute force, where
+# the dot-product metrics run through BLAS as ||a||^2 + ||b||^2 - 2ab.
+
+# Minkowski p used by the KD-tree for each metric
+TREE_METRICS = {
+    "euclidean": 2,
+    "sqeuclidean": 2,
+    "cosine": 2,
+    "manhattan": 1,
+    "cityblock": 1,
+    "chebyshev": np.inf,
+}
+BLAS_METRICS = {"euclidean", "sqeuclidean", "cosine"}
+SUPPORTED_METRICS = set(TREE_METRICS) | {"minkowski"}
+
+# KD-trees stop paying off once the dimension gets much past this
+TREE_MAX_DIM = 16
+
+# Cap on the size of one (queries x points) distance block
+BLOCK_ELEMENTS = 1 << 22
+
+
+def _normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return matrix / norms
+
+
+class NeighborIndex:
+    def __init__(self, points, metric="euclidean", p=2, method="auto", leaf_size=32):
+        if metric not in SUPPORTED_METRICS:
+            raise ValueError(f"Unsupported metric '{metric}', choose from {sorted(SUPPORTED_METRICS)}")
+        self.metric = metric
+        self.p = p if metric == "minkowski" else TREE_METRICS[metric]
+        self.points = np.asarray(points, dtype=np.float64)
+        if self.points.ndim != 2:
+            raise ValueError("points must be a 2D array of shape (n_points, n_dims)")
+
+        # Cosine distance on unit vectors is a monotone function of euclidean distance
+        if metric == "cosine":
+            self.points = _normalize_rows(self.points)
+
+        if method == "auto":
+            method = "tree" if self.points.shape[1] <= TREE_MAX_DIM else "brute"
+        self.method = method
+
+        if method == "tree":
+            self.tree = cKDTree(self.points, leafsize=leaf_size)
+        else:
+            self.tree = None
+            self.point_norms = np.einsum("ij,ij->i", self.points, self.points)
+        self.block_size = max(1, BLOCK_ELEMENTS // max(1, len(self.points)))
+
+    def __len__(self):
+        return self.points.shape[0]
+
+    def _prepare_queries(self, queries):
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float64))
+        if self.metric == "cosine":
+            queries = _normalize_rows(queries)
+        return queries
+
+    def _finalize(self, distances):
+        # Convert the search metric back into the requested one
+        if self.metric == "sqeuclidean":
+            return distances ** 2
+        if self.metric == "cosine":
+            return distances ** 2 / 2
+        return distances
+
+    def _tree_query(self, queries, k):
+        distances, indices = self.tree.query(queries, k=np.arange(1, k + 1), p=self.p)
+        return self._finalize(distances), indices
+
+    def _block_distances(self, block):
+        if self.metric in BLAS_METRICS:
+            block_norms = np.einsum("ij,ij->i", block, block)
+            squared = block_norms[:, None] + self.point_norms[None, :] - 2 * (block @ self.points.T)
+            return np.sqrt(np.maximum(squared, 0))
+        if self.metric == "minkowski":
+            return distance.cdist(block, self.points, metric="minkowski", p=self.p)
+        scipy_metric = "cityblock" if self.metric == "manhattan" else self.metric
+        return distance.cdist(block, self.points, metric=scipy_metric)
+
+    def _brute_query(self, queries, k):
+        num_queries = queries.shape[0]
+        all_distances = np.empty((num_queries, k))
+        all_indices = np.empty((num_queries, k), dtype=np.int64)
+        for start in range(0, num_queries, self.block_size):
+            block = queries[start:start + self.block_size]
+            # Partial selection first, then sort only the k survivors
+            top, top_distances = top_k_rows(self._block_distances(block), k)
+            all_indices[start:start + len(block)] = top
+            all_distances[start:start + len(block)] = top_distances
+        return self._finalize(all_distances), all_indices
+
+    def query(self, queries, k):
+        queries = self._prepare_queries(queries)
+        k = min(k, len(self))
+        if k == 0:
+            empty = np.empty((queries.shape[0], 0))
+            return empty, empty.astype(np.int64)
+        if self.method == "tree":
+            return self._tree_query(queries, k)
+        return self._brute_query(queries, k)
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(42)
+
+    for dims in (4, 64):
+        points = rng.uniform(0, 5, size=(50000, dims))
+        queries = rng.uniform(0, 5, size=(2000, dims))
+        for metric in ("euclidean", "manhattan", "cosine"):
+            index = NeighborIndex(points, metric=metric)
+            start = time.perf_counter()
+            distances, indices = index.query(queries, 10)
+            elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            scipy_metric = "cityblock" if metric == "manhattan" else metric
+            reference = distance.cdist(queries[:200], points, metric=scipy_metric)
+            reference_elapsed = (time.perf_counter() - start) * len(queries) / 200
+            match = np.allclose(np.sort(reference, axis=1)[:, :10], distances[:200])
+            print(f"{dims:>3}D {metric:<10} {index.method:<5} {elapsed * 1000:8.1f} ms "
+                  f"(full cdist ~{reference_elapsed * 1000:8.1f} ms) match={match}")
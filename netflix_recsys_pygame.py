@@ -1,5 +1,7 @@
 import pygame
 import random
+import numpy as np
+from content_catalog import ContentCatalog
 import math
 
 # Initialize Pygame
@@ -39,22 +41,21 @@ content_library = [
     for i in range(1, 51)
 ]
 
+# Columnar copy of the library; scores are 0.5 genre + 0.3 recency + 0.2 popularity
+catalog = ContentCatalog([genres.index(c.genre) for c in content_library],
+                         [c.year for c in content_library],
+                         [c.popularity for c in content_library],
+                         genres, min_year=1990, max_year=2023)
+
 # User profile
 user_preferences = {genre: random.uniform(0, 1) for genre in genres}
 watched_content = []
-
-# Function to calculate content score
-def calculate_score(content):
-    genre_score = user_preferences[content.genre]
-    recency_score = (content.year - 1990) / (2023 - 1990)
-    popularity_score = content.popularity
-    return 0.5 * genre_score + 0.3 * recency_score + 0.2 * popularity_score
+watched_mask = np.zeros(len(content_library), dtype=bool)
 
 # Function to get recommendations
 def get_recommendations():
-    unwatched = [c for c in content_library if c not in watched_content]
-    scored_content = [(c, calculate_score(c)) for c in unwatched]
-    return sorted(scored_content, key=lambda x: x[1], reverse=True)[:10]
+    ids, scores = catalog.recommend(user_preferences, watched_mask, k=10)
+    return [(content_library[i], float(score)) for i, score in zip(ids, scores)]
 
 # Button class
 class Button:
@@ -95,6 +96,7 @@ while running:
                             selected_content = random.choice(unwatched)
                             selected_content.watched = True
                             watched_content.append(selected_content)
+                            watched_mask[content_library.index(selected_content)] = True
                             user_preferences[selected_content.genre] += 0.1
                             recommendations = get_recommendations()
                     elif button.action == "refresh":
@@ -0,0 +1,154 @@
+import heapq
+import time
+from itertools import islice
+import numpy as np
+
+# Category-partitioned, time-ordered article index for a news feed.
+# An article's score is a per-category affinity (interests, recent reading)
+# plus a recency term that only decreases with age, so inside a category the
+# freshest articles are always the best. A request therefore reads the
+# freshest n articles of each category, scores them with recency boundaries
+# computed once for the request, and heap-merges the per-category lists;
+# older articles are never touched.
+
+SECONDS_PER_DAY = 86400
+
+
+class NewsIndex:
+    def __init__(self, categories, timestamps, category_names, recency_points=3):
+        self.category_names = list(category_names)
+        self.category_ids = {name: i for i, name in enumerate(self.category_names)}
+        self.recency_points = recency_points
+        self.num_articles = 0
+        # Per category: article ids and timestamps, oldest first, in growable buffers
+        num_categories = len(self.category_names)
+        self._ids = [np.empty(16, dtype=np.int64) for _ in range(num_categories)]
+        self._times = [np.empty(16, dtype=np.float64) for _ in range(num_categories)]
+        self._sizes = np.zeros(num_categories, dtype=np.int64)
+        self.categories = np.empty(0, dtype=np.int64)
+        self.add_many(categories, timestamps)
+
+    def add_many(self, categories, timestamps):
+        codes = np.array([self.category_ids[c] for c in categories], dtype=np.int64)
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        ids = np.arange(self.num_articles, self.num_articles + len(codes))
+        self.num_articles += len(codes)
+        self.categories = np.concatenate([self.categories, codes])
+        order = np.lexsort((ids, timestamps, codes))
+        bounds = np.searchsorted(codes[order], np.arange(len(self.category_names) + 1))
+        for c, (start, end) in enumerate(zip(bounds[:-1], bounds[1:])):
+            if end > start:
+                self._insert(c, ids[order[start:end]], timestamps[order[start:end]])
+        return ids
+
+    def add(self, category, timestamp):
+        return int(self.add_many([category], [timestamp])[0])
+
+    def _insert(self, c, ids, timestamps):
+        size = self._sizes[c]
+        if size + len(ids) > len(self._ids[c]):
+            capacity = max(2 * len(self._ids[c]), size + len(ids))
+            self._ids[c] = np.resize(self._ids[c], capacity)
+            self._times[c] = np.resize(self._times[c], capacity)
+        if size == 0 or timestamps[0] >= self._times[c][size - 1]:
+            # Fresh articles go at the end, the common case for a news stream
+            self._ids[c][size:size + len(ids)] = ids
+            self._times[c][size:size + len(ids)] = timestamps
+        else:
+            merged_times = np.concatenate([self._times[c][:size], timestamps])
+            merged_ids = np.concatenate([self._ids[c][:size], ids])
+            order = np.argsort(merged_times, kind="stable")
+            self._times[c][:len(order)] = merged_times[order]
+            self._ids[c][:len(order)] = merged_ids[order]
+        self._sizes[c] = size + len(ids)
+
+    def freshest(self, category, n):
+        # The n newest (ids, timestamps) of a category, newest first
+        size = self._sizes[category]
+        start = max(size - n, 0)
+        return self._ids[category][start:size][::-1], self._times[category][start:size][::-1]
+
+    def recency_boundaries(self, now):
+        # Timestamps at which an article loses a recency point, newest first:
+        # an article newer than boundaries[k] is less than k + 1 days old
+        return now - SECONDS_PER_DAY * np.arange(1, self.recency_points + 1)
+
+    def recency(self, timestamps, boundaries):
+        # recency_points minus whole days of age, floored at 0
+        return self.recency_points - np.searchsorted(-boundaries, -np.asarray(timestamps), side="right")
+
+    def recommend(self, affinity, now, n=10):
+        # Top-n (article ids, scores); ties go to the fresher article
+        boundaries = self.recency_boundaries(now)
+        streams = []
+        for c in np.flatnonzero(self._sizes):
+            ids, timestamps = self.freshest(c, n)
+            scores = affinity[c] + self.recency(timestamps, boundaries)
+            # Keyed so that heapq.merge pops the highest score, then the newest
+            streams.append(zip(-scores, -timestamps, ids))
+        top = list(islice(heapq.merge(*streams), n))
+        return np.array([i for _, _, i in top], dtype=np.int64), np.array([-s for s, _, _ in top])
+
+
+class ReaderProfile:
+    def __init__(self, index, interests, history_size=10, interest_weight=3, history_weight=2):
+        # Category affinity kept up to date as articles are read, instead of
+        # being rebuilt from the reading history on every request
+        self.index = index
+        self.history_size = history_size
+        self.history_weight = history_weight
+        self.interest_affinity = np.zeros(len(index.category_names))
+        self.interest_affinity[[index.category_ids[c] for c in interests]] = interest_weight
+        self.history = []
+        self.history_counts = np.zeros(len(index.category_names), dtype=np.int64)
+        self.affinity = self.interest_affinity.copy()
+
+    def read(self, article):
+        category = self.index.categories[article]
+        self.history.append(article)
+        self._count(category, 1)
+        if len(self.history) > self.history_size:
+            self._count(self.index.categories[self.history.pop(0)], -1)
+
+    def _count(self, category, change):
+        self.history_counts[category] += change
+        self.affinity[category] = (self.interest_affinity[category] +
+                                   self.history_weight * (self.history_counts[category] > 0))
+
+    def recommend(self, now, n=10):
+        return self.index.recommend(self.affinity, now, n)
+
+
+if __name__ == "__main__":
+    num_articles, num_categories = 5000000, 50
+    rng = np.random.default_rng(0)
+    now = time.time()
+    names = [f"Category {c}" for c in range(num_categories)]
+    categories = rng.integers(num_categories, size=num_articles)
+    timestamps = now - rng.random(num_articles) * 365 * SECONDS_PER_DAY
+    start = time.perf_counter()
+    index = NewsIndex([names[c] for c in categories], timestamps, names)
+    print(f"Indexed {num_articles} articles in {time.perf_counter() - start:.1f}s")
+
+    profile = ReaderProfile(index, names[:3])
+    for article in rng.integers(num_articles, size=10):
+        profile.read(article)
+
+    start = time.perf_counter()
+    for _ in range(200):
+        ids, scores = profile.recommend(now, n=10)
+    print(f"Indexed feed: {(time.perf_counter() - start) / 200 * 1000:.3f} ms per request")
+
+    # Full-corpus vectorised scoring for comparison
+    start = time.perf_counter()
+    for _ in range(5):
+        days_old = np.floor((now - timestamps) / SECONDS_PER_DAY)
+        full = profile.affinity[categories] + np.maximum(0, 3 - days_old)
+        best = np.lexsort((-timestamps, -full))[:10]
+    print(f"Full corpus scan: {(time.perf_counter() - start) / 5 * 1000:.0f} ms per request")
+    assert np.array_equal(full[best], scores) and np.array_equal(best, ids)
+
+    start = time.perf_counter()
+    for _ in range(10000):
+        profile.read(rng.integers(num_articles))
+    print(f"Affinity update: {(time.perf_counter() - start) / 10000 * 1e6:.1f} us per read")
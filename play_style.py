@@ -0,0 +1,124 @@
+import time
+import numpy as np
+from neighbor_search import BLOCK_ELEMENTS, TREE_MAX_DIM, NeighborIndex
+
+# Nearest-profile matching between player play styles and game profiles.
+# Profiles are rows of a dense matrix with a fixed attribute order, searched
+# through NeighborIndex: a blocked exact scan for small batches, a KD-tree
+# when there are few attributes and the batch is large (cosine on unit
+# vectors ranks like L2). Player styles are a sliding-window mean of telemetry
+# vectors kept in a per-player ring buffer, so an event costs
+# O(window * attributes).
+
+# NeighborIndex metric for each metric name used here
+METRICS = {"l1": "manhattan", "l2": "euclidean", "cosine": "cosine"}
+
+
+class ProfileMatrix:
+    def __init__(self, names, profiles, attributes):
+        self.names = list(names)
+        self.attributes = list(attributes)
+        self.profiles = np.ascontiguousarray(profiles, dtype=np.float64)
+        self._indexes = {}
+
+    @classmethod
+    def from_dicts(cls, profiles, attributes=None):
+        # {name: {attribute: value}}; attribute order is fixed by the first profile
+        attributes = list(attributes or next(iter(profiles.values())))
+        matrix = [[values[attribute] for attribute in attributes] for values in profiles.values()]
+        return cls(list(profiles), matrix, attributes)
+
+    def vector(self, values):
+        return np.array([values[attribute] for attribute in self.attributes], dtype=np.float64)
+
+    def _index(self, metric, method):
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric {metric!r}, expected one of {tuple(METRICS)}")
+        if (metric, method) not in self._indexes:
+            self._indexes[metric, method] = NeighborIndex(self.profiles, metric=METRICS[metric], method=method)
+        return self._indexes[metric, method]
+
+    def nearest(self, queries, k=1, metric="l1", use_tree=None):
+        # Top-k (ids, distances) per query, ties to the lower id on the exact
+        # scan; use_tree=None picks the KD-tree for low-dimensional profiles
+        # and large batches. Cosine distances are 1 - similarity.
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float64))
+        if use_tree is None:
+            use_tree = len(self.attributes) <= TREE_MAX_DIM and len(queries) * len(self.names) > BLOCK_ELEMENTS
+        distances, ids = self._index(metric, "tree" if use_tree else "brute").query(queries, k)
+        return ids, distances
+
+
+class PlayerStyles:
+    def __init__(self, num_players, num_attributes, window=3, default=0.5):
+        # Sliding-window mean of each player's last `window` telemetry vectors;
+        # players without events keep the default style
+        self.window = window
+        self.default = default
+        self.buffer = np.zeros((num_players, window, num_attributes), dtype=np.float32)
+        self.counts = np.zeros(num_players, dtype=np.int64)
+        self.styles = np.full((num_players, num_attributes), default, dtype=np.float32)
+
+    def observe(self, players, vectors):
+        # Apply a batch of events in order. A player may appear several times,
+        # so the batch is split into rounds with each player at most once.
+        players = np.atleast_1d(np.asarray(players, dtype=np.int64))
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        order = np.argsort(players, kind="stable")
+        sorted_players = players[order]
+        first = np.r_[0, np.flatnonzero(sorted_players[1:] != sorted_players[:-1]) + 1]
+        occurrence = np.arange(len(players)) - np.repeat(first, np.diff(np.r_[first, len(players)]))
+        for round_ in range(occurrence.max(initial=-1) + 1):
+            events = order[occurrence == round_]
+            self._observe_unique(players[events], vectors[events])
+
+    def _observe_unique(self, players, vectors):
+        # Unfilled slots are zero, so the window sum needs no masking
+        self.buffer[players, self.counts[players] % self.window] = vectors
+        self.counts[players] += 1
+        self.styles[players] = self.buffer[players].sum(axis=1) / np.minimum(self.counts[players], self.window)[:, None]
+
+    def reset(self, players=None):
+        players = slice(None) if players is None else players
+        self.buffer[players] = 0
+        self.counts[players] = 0
+        self.styles[players] = self.default
+
+
+if __name__ == "__main__":
+    num_games, num_players, num_attributes = 20000, 1000000, 6
+    rng = np.random.default_rng(0)
+    attributes = [f"attribute {a}" for a in range(num_attributes)]
+    games = ProfileMatrix([f"Game {g}" for g in range(num_games)], rng.random((num_games, num_attributes)), attributes)
+    styles = PlayerStyles(num_players, num_attributes)
+
+    # A session's telemetry: one event per player, each the profile of a game played
+    start = time.perf_counter()
+    for _ in range(3):
+        styles.observe(rng.permutation(num_players), games.profiles[rng.integers(num_games, size=num_players)])
+    print(f"Streamed {3 * num_players} telemetry events in {time.perf_counter() - start:.2f}s")
+
+    sample = styles.styles[:2000]
+    for metric in METRICS:
+        start = time.perf_counter()
+        brute_ids, brute_distances = games.nearest(sample, k=5, metric=metric, use_tree=False)
+        brute_time = time.perf_counter() - start
+        start = time.perf_counter()
+        tree_ids, tree_distances = games.nearest(sample, k=5, metric=metric, use_tree=True)
+        tree_time = time.perf_counter() - start
+        assert np.allclose(brute_distances, tree_distances, atol=1e-4)
+        print(f"{metric}: blocked scan {brute_time / len(sample) * 1e6:.0f} us/player, "
+              f"KD-tree {tree_time / len(sample) * 1e6:.1f} us/player")
+
+    start = time.perf_counter()
+    ids, _ = games.nearest(styles.styles, k=5, metric="l1")
+    print(f"Top-5 L1 matches for all {num_players} players in {time.perf_counter() - start:.1f}s")
+
+    # Dict-per-pair path of the demo, on a few players
+    catalog = {name: dict(zip(attributes, map(float, row))) for name, row in zip(games.names, games.profiles)}
+    start = time.perf_counter()
+    for player in range(5):
+        profile = dict(zip(attributes, map(float, styles.styles[player])))
+        scores = {name: sum(abs(values[a] - profile[a]) for a in values) for name, values in catalog.items()}
+        best = min(scores, key=scores.get)
+    print(f"Dict-based L1: {(time.perf_counter() - start) / 5 * 1e3:.0f} ms/player")
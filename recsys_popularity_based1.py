@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+from attribute_index import build_restaurant_index
 
 # Set page config
 st.set_page_config(page_title="Popularity-Based Recommender System", layout="wide")
@@ -43,6 +44,10 @@ def load_data(dataset_name):
         data = pd.read_csv('North America Restaurants.csv')
     return data
 
+@st.cache_resource
+def load_restaurant_index():
+    return build_restaurant_index(load_data('Restaurants'))
+
 # Main content
 st.title('Popularity-Based Recommender System')
 st.write('**Developed by : Venugopal Adep**')
@@ -95,7 +100,27 @@ with tab2:
     number_of_items = st.slider('Number of Items to Display', min_value=10, max_value=100, value=50, step=10)
 
     # Sorting data
-    sorted_df = df.sort_values(by=metric_to_sort_by, ascending=False).head(number_of_items)
+    if dataset_name == 'Restaurants':
+        # Filters are answered from the attribute index instead of scanning the table
+        index = load_restaurant_index()
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            cuisines = st.multiselect("Cuisines (all required)", index.values('cuisines'))
+        with col2:
+            cities = st.multiselect("City", index.values('city'))
+        with col3:
+            delivery = st.checkbox("Delivery available")
+            pickup = st.checkbox("Pickup available")
+        conditions = {}
+        if cities:
+            conditions['city'] = cities
+        if delivery:
+            conditions['delivery_enabled'] = True
+        if pickup:
+            conditions['pickup_enabled'] = True
+        sorted_df = index.search(conditions, {'cuisines': cuisines}, sort_by=metric_to_sort_by, n=number_of_items)
+    else:
+        sorted_df = df.sort_values(by=metric_to_sort_by, ascending=False).head(number_of_items)
     columns_to_display = sorted_df.columns
 
     # Displaying data in a table
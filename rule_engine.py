@@ -0,0 +1,307 @@
+import time
+import numpy as np
+from array_utils import popcount64
+
+# Declarative attribute-match rules compiled into lookup tables.
+# A rule is a set of conditions on attributes: a value, a list of accepted
+# values, or an (operator, threshold) pair for numeric attributes. Each
+# attribute's values are mapped to bins (category codes, or the intervals and
+# points between the thresholds of all rules), and every bin holds a packed
+# uint64 bitset of the rules it satisfies. A batch of records is then matched
+# with one table lookup and bitwise AND per attribute; condition counts come
+# from bit-sliced counters over the same bitsets. Rules are laid out group by
+# group in priority order, so "first matching rule of each group" is a
+# minimum over contiguous bit ranges. A RuleSession keeps the match state of
+# many records and only re-evaluates a record when one of its attributes moves
+# to another bin, and then only on the words holding rules that read it.
+
+OPERATORS = {"<": np.less, "<=": np.less_equal, ">": np.greater, ">=": np.greater_equal, "==": np.equal}
+
+
+def _pack(bits, num_words):
+    # Bool (..., rules) array -> (..., num_words) uint64 bitsets, rule r at bit r % 64 of word r // 64
+    packed = np.zeros(bits.shape[:-1] + (num_words * 8,), dtype=np.uint8)
+    packed[..., :(bits.shape[-1] + 7) // 8] = np.packbits(bits, axis=-1, bitorder="little")
+    return packed.view(np.uint64)
+
+
+def _unpack(words, num_rules):
+    return np.unpackbits(words.view(np.uint8), axis=-1, bitorder="little")[..., :num_rules]
+
+
+def _lowest_bit(words):
+    # Index of the lowest set bit of every uint64, 64 for empty words. x & -x
+    # isolates the bit, and a power of two converts to float64 exactly.
+    isolated = (words & (~words + np.uint64(1))).astype(np.float64)
+    exponent = np.frexp(isolated)[1] - 1
+    return np.where(isolated > 0, exponent, 64)
+
+
+def _is_threshold(condition):
+    return isinstance(condition, tuple) and len(condition) == 2 and condition[0] in OPERATORS
+
+
+class RuleSet:
+    def __init__(self, rules, groups=None):
+        # rules: list of {attribute: condition}; groups: optional group key per
+        # rule, where the first matching rule of a group (in list order) wins
+        self.num_rules = len(rules)
+        groups = list(range(self.num_rules)) if groups is None else list(groups)
+        if len(groups) != self.num_rules:
+            raise ValueError("Expected one group per rule")
+        self.group_names = list(dict.fromkeys(groups))
+        group_ids = {name: i for i, name in enumerate(self.group_names)}
+        # Rules in group order; rule_order maps a bit position to the rule id
+        self.rule_order = np.argsort([group_ids[g] for g in groups], kind="stable")
+        self.position = np.empty(self.num_rules, dtype=np.int64)
+        self.position[self.rule_order] = np.arange(self.num_rules)
+        self.group_starts = np.r_[0, np.flatnonzero(np.diff(np.sort([group_ids[g] for g in groups]))) + 1]
+        self.group_ends = np.r_[self.group_starts[1:], self.num_rules]
+        self.num_words = (self.num_rules + 63) // 64
+        # Each group's first word, with the bits before the group masked off
+        self.group_words = self.group_starts >> 6
+        self.group_masks = np.left_shift(np.uint64(0xFFFFFFFFFFFFFFFF), (self.group_starts & 63).astype(np.uint64))
+        self.group_spans = (self.group_ends - 1 >> 6) - self.group_words
+        self.all_rules = _pack(np.ones(self.num_rules, dtype=bool), self.num_words)
+
+        self.attributes = list(dict.fromkeys(a for rule in rules for a in rule))
+        self.attribute_ids = {name: i for i, name in enumerate(self.attributes)}
+        self.thresholds, self.vocabulary = {}, {}
+        self.tables, self.free, self.attribute_words = [], [], []
+        ordered = [rules[r] for r in self.rule_order]
+        for attribute in self.attributes:
+            conditions = [rule.get(attribute) for rule in ordered]
+            constrained = np.array([attribute in rule for rule in ordered])
+            accepts = self._compile(attribute, [c for c, on in zip(conditions, constrained) if on])
+            # (bins x rules) acceptance, with unconstrained rules left out
+            bits = np.zeros((accepts.shape[0], self.num_rules), dtype=bool)
+            bits[:, constrained] = accepts
+            self.tables.append(_pack(bits, self.num_words))
+            self.free.append(_pack(~constrained, self.num_words) & self.all_rules)
+            self.attribute_words.append(np.flatnonzero(_pack(constrained, self.num_words)))
+
+    def _compile(self, attribute, conditions):
+        numeric = [_is_threshold(c) for c in conditions]
+        if any(numeric) and not all(numeric):
+            raise ValueError(f"Attribute {attribute!r} mixes thresholds and categorical values")
+        if all(numeric):
+            # Bins alternate between the open intervals around the thresholds and
+            # the thresholds themselves; each condition is constant on a bin
+            thresholds = np.unique([float(t) for _, t in conditions])
+            self.thresholds[attribute] = thresholds
+            representatives = np.empty(2 * len(thresholds) + 1)
+            representatives[1::2] = thresholds
+            representatives[2:-1:2] = (thresholds[:-1] + thresholds[1:]) / 2
+            representatives[[0, -1]] = thresholds[[0, -1]] + [-1, 1]
+            return np.array([OPERATORS[op](representatives, t) for op, t in conditions]).T
+        # One bin per value mentioned by a rule, plus a last bin for anything else
+        accepted = [set(c) if isinstance(c, (list, set, frozenset)) else {c} for c in conditions]
+        values = list(dict.fromkeys(v for values in accepted for v in values))
+        self.vocabulary[attribute] = {value: i for i, value in enumerate(values)}
+        accepts = np.zeros((len(values) + 1, len(conditions)), dtype=bool)
+        for rule, values in enumerate(accepted):
+            accepts[[self.vocabulary[attribute][v] for v in values], rule] = True
+        return accepts
+
+    def bins(self, attribute, values):
+        if attribute in self.thresholds:
+            thresholds = self.thresholds[attribute]
+            values = np.asarray(values, dtype=np.float64)
+            i = np.searchsorted(thresholds, values)
+            exact = (i < len(thresholds)) & (thresholds[np.minimum(i, len(thresholds) - 1)] == values)
+            return 2 * i + exact
+        vocabulary = self.vocabulary[attribute]
+        return np.array([vocabulary.get(v, len(vocabulary)) for v in values], dtype=np.int64)
+
+    def encode(self, records):
+        # records: {attribute: values}, one column per attribute the rules read
+        missing = [a for a in self.attributes if a not in records]
+        if missing:
+            raise ValueError(f"Records are missing attributes {missing}")
+        columns = [self.bins(a, records[a]) for a in self.attributes]
+        num_records = len(columns[0]) if columns else len(next(iter(records.values()), []))
+        return np.array(columns, dtype=np.int64).reshape(len(columns), num_records).T
+
+    def _match(self, bins, words=None):
+        # (records x words) bitsets of the rules whose conditions all hold
+        words = np.arange(self.num_words) if words is None else words
+        matched = np.repeat(self.all_rules[None, words], len(bins), axis=0)
+        for a, (table, free) in enumerate(zip(self.tables, self.free)):
+            matched &= table[bins[:, a, None], words] | free[words]
+        return matched
+
+    def _first_matches(self, matched):
+        # First set bit of each group's range, as a rule id or -1; a group only
+        # looks at its later words while the earlier ones are empty
+        first = self.group_words * 64 + _lowest_bit(matched[:, self.group_words] & self.group_masks)
+        for offset in range(1, self.group_spans.max(initial=0) + 1):
+            pending = np.flatnonzero(self.group_spans >= offset)
+            words = self.group_words[pending] + offset
+            later = words * 64 + _lowest_bit(matched[:, words])
+            empty = first[:, pending] >= words * 64
+            first[:, pending] = np.where(empty, later, first[:, pending])
+        found = first < self.group_ends
+        return np.where(found, self.rule_order[np.where(found, first, 0)], -1)
+
+    def first_matches(self, records):
+        # (records x groups) id of the first matching rule per group, or -1
+        return self._first_matches(self._match(self.encode(records)))
+
+    def num_matches(self, records):
+        # Number of rules whose conditions all hold, per record
+        return popcount64(self._match(self.encode(records))).sum(axis=1)
+
+    def _count_planes(self, bins):
+        # Per-attribute bitsets added with bit-sliced counters: plane k holds
+        # bit k of every rule's number of satisfied conditions
+        planes = []
+        for a, table in enumerate(self.tables):
+            carry = table[bins[:, a]]
+            for k, plane in enumerate(planes):
+                planes[k], carry = plane ^ carry, plane & carry
+            if carry.any():
+                planes.append(carry)
+        return planes
+
+    def match_counts(self, records):
+        # (records x rules) number of conditions each rule has satisfied
+        bins = self.encode(records)
+        counts = np.zeros((len(bins), self.num_rules), dtype=np.int64)
+        for k, plane in enumerate(self._count_planes(bins)):
+            counts += _unpack(plane, self.num_rules).astype(np.int64) << k
+        return counts[:, self.position]
+
+    def best_rules(self, records, n=3, min_count=1):
+        # Per record, up to n rule ids by satisfied conditions, ties to the
+        # earlier rule. Rules are read off the counters level by level, highest
+        # count first, taking the lowest set bit of the level's bitset each time.
+        bins = self.encode(records)
+        planes = self._count_planes(bins)
+        picks = np.full((len(bins), n), -1, dtype=np.int64)
+        taken = np.zeros(len(bins), dtype=np.int64)
+        for count in range((1 << len(planes)) - 1, min_count - 1, -1):
+            level = np.repeat(self.all_rules[None], len(bins), axis=0)
+            for k, plane in enumerate(planes):
+                level &= plane if count >> k & 1 else ~plane
+            rows = np.flatnonzero((taken < n) & level.any(axis=1))
+            while len(rows):
+                words = np.argmax(level[rows] != 0, axis=1)
+                lowest = level[rows, words]
+                picks[rows, taken[rows]] = words * 64 + _lowest_bit(lowest)
+                taken[rows] += 1
+                level[rows, words] = lowest & (lowest - np.uint64(1))
+                rows = rows[(taken[rows] < n) & level[rows].any(axis=1)]
+        return [self.rule_order[row[:size]] for row, size in zip(picks, taken)]
+
+
+class RuleSession:
+    def __init__(self, rule_set, records):
+        # Match state of every record; outcomes are the first matches per group
+        self.rule_set = rule_set
+        self.bin_state = rule_set.encode(records)
+        self.matched = rule_set._match(self.bin_state)
+        self.outcomes = rule_set._first_matches(self.matched)
+
+    def update(self, values, records=None):
+        # values: {attribute: new values} for all records, or for the given
+        # record ids. Returns (records, groups, rule ids) of changed outcomes.
+        rule_set = self.rule_set
+        records = np.arange(len(self.bin_state)) if records is None else np.asarray(records, dtype=np.int64)
+        changes = []
+        for attribute, column in values.items():
+            a = rule_set.attribute_ids[attribute]
+            bins = rule_set.bins(attribute, column)
+            moved = bins != self.bin_state[records, a]
+            if moved.any():
+                self.bin_state[records[moved], a] = bins[moved]
+                changes.append((records[moved], a))
+        if not changes:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        # Re-match only the moved records, on the words of rules reading the attribute
+        for moved, a in changes:
+            words = rule_set.attribute_words[a]
+            self.matched[np.ix_(moved, words)] = rule_set._match(self.bin_state[moved], words)
+        dirty = np.unique(np.concatenate([moved for moved, _ in changes]))
+        outcomes = rule_set._first_matches(self.matched[dirty])
+        rows, groups = np.nonzero(outcomes != self.outcomes[dirty])
+        self.outcomes[dirty] = outcomes
+        return dirty[rows], groups, outcomes[rows, groups]
+
+
+def random_device_rules(num_devices, rules_per_device=4, num_sensors=8, seed=0):
+    # Per device an if/elif chain of sensor threshold rules ending in a default
+    rng = np.random.default_rng(seed)
+    operators = list(OPERATORS)
+    rules, groups = [], []
+    for device in range(num_devices):
+        for _ in range(rules_per_device - 1):
+            sensors = rng.choice(num_sensors, size=rng.integers(1, 3), replace=False)
+            rules.append({f"sensor {s}": (operators[rng.integers(4)], float(rng.integers(0, 100))) for s in sensors})
+            groups.append(device)
+        rules.append({})
+        groups.append(device)
+    return rules, groups
+
+
+if __name__ == "__main__":
+    num_devices, num_homes, num_sensors = 1000, 10000, 8
+    rules, groups = random_device_rules(num_devices, num_sensors=num_sensors)
+    start = time.perf_counter()
+    rule_set = RuleSet(rules, groups)
+    print(f"Compiled {len(rules)} rules for {num_devices} devices in {time.perf_counter() - start:.2f}s")
+
+    rng = np.random.default_rng(1)
+    readings = {f"sensor {s}": rng.random(num_homes) * 100 for s in range(num_sensors)}
+    start = time.perf_counter()
+    session = RuleSession(rule_set, readings)
+    full = time.perf_counter() - start
+    print(f"Full evaluation of {num_homes} homes: {full * 1000:.0f} ms")
+
+    # if/elif chain per device, as the demo runs it, on a few homes
+    start = time.perf_counter()
+    for home in range(20):
+        for device in range(num_devices):
+            first = -1
+            for rule in range(device * 4, device * 4 + 4):
+                if all(OPERATORS[op](readings[s][home], t) for s, (op, t) in rules[rule].items()):
+                    first = rule
+                    break
+            assert session.outcomes[home, device] == first
+    print(f"Python if/elif chains: {(time.perf_counter() - start) / 20 * num_homes:.1f}s for all homes")
+
+    # Each tick 5% of the homes report; readings drift a little, so most stay in their bins
+    steps, changed = 50, 0
+    start = time.perf_counter()
+    for _ in range(steps):
+        homes = rng.choice(num_homes, size=num_homes // 20, replace=False)
+        update = {}
+        for name in readings:
+            readings[name][homes] += rng.normal(0, 0.05, len(homes))
+            update[name] = readings[name][homes]
+        changed += len(session.update(update, homes)[0])
+    incremental = (time.perf_counter() - start) / steps
+    assert np.array_equal(session.outcomes, rule_set.first_matches(readings))
+    print(f"Dirty-tracked update: {incremental * 1000:.1f} ms per tick, {changed / steps:.0f} outcome changes per tick")
+
+    # Products as scoring rules against a batch of users
+    num_products, num_users = 5000, 10000
+    levels = ["Low", "Medium", "High"]
+    products = [{"income": levels if rng.random() < 0.3 else levels[rng.integers(3)],
+                 "risk": levels[rng.integers(3)], "goal": f"Goal {rng.integers(20)}"} for _ in range(num_products)]
+    product_rules = RuleSet(products)
+    users = {"income": rng.choice(levels, num_users), "risk": rng.choice(levels, num_users),
+             "goal": np.array([f"Goal {g}" for g in rng.integers(20, size=num_users)])}
+    start = time.perf_counter()
+    best = product_rules.best_rules(users, n=3)
+    print(f"Top-3 products for {num_users} users: {(time.perf_counter() - start) * 1000:.0f} ms")
+    start = time.perf_counter()
+    for user in range(20):
+        scored = []
+        for product, conditions in enumerate(products):
+            score = sum(users[a][user] in (c if isinstance(c, list) else [c]) for a, c in conditions.items())
+            if score > 0:
+                scored.append((product, score))
+        scored.sort(key=lambda x: x[1], reverse=True)
+        assert [p for p, _ in scored[:3]] == list(best[user])
+    print(f"Python scoring loop: {(time.perf_counter() - start) / 20 * num_users:.1f}s for all users")
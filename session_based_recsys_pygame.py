@@ -1,6 +1,7 @@
 import pygame
 import random
 import sys
+from session_recommender import SessionRecommender
 
 # Initialize Pygame
 pygame.init()
@@ -40,6 +41,26 @@ products = {
 current_session = []
 recommendations = []
 
+# Simulated past sessions: shoppers mostly browse within a category
+def generate_history_sessions(num_sessions=2000):
+    sessions = []
+    for _ in range(num_sessions):
+        category = random.choice(categories)
+        session = []
+        for _ in range(random.randint(2, 6)):
+            if random.random() < 0.3:
+                category = random.choice(categories)
+            session.append((category, random.choice(products[category])))
+        sessions.append(session)
+    return sessions
+
+# Session-kNN + Markov model over the simulated history. The demo browses a
+# shop catalogue that has no interaction log, so its past sessions are
+# simulated; sessions split from movielens/ratings.csv by inactivity gap are
+# what session_recommender.py runs on. Each request samples the 100 most
+# recent of up to 200 indexed sessions per clicked product.
+session_recommender = SessionRecommender(max_sessions_per_item=200, sample_size=100, k=50).fit(generate_history_sessions())
+
 # Button class
 class Button:
     def __init__(self, x, y, width, height, text, color, text_color):
@@ -79,26 +100,8 @@ def generate_recommendations():
         recommendations = []
         return
 
-    last_category = current_session[-1][0]
-    last_product = current_session[-1][1]
-    
-    # Enhanced recommendation logic
-    if len(current_session) == 1:
-        # If only one item in session, suggest from the same category
-        recommendations = random.sample([p for p in products[last_category] if p != last_product], min(3, len(products[last_category]) - 1))
-    else:
-        # Consider the last two items for more context
-        second_last_category = current_session[-2][0]
-        if second_last_category == last_category:
-            # If same category, suggest from a different category
-            other_categories = [c for c in categories if c != last_category]
-            rec_category = random.choice(other_categories)
-            recommendations = random.sample(products[rec_category], 3)
-        else:
-            # If different categories, suggest a mix
-            rec_from_last = random.sample([p for p in products[last_category] if p != last_product], 2)
-            rec_from_second_last = random.sample(products[second_last_category], 1)
-            recommendations = rec_from_last + rec_from_second_last
+    # Neighbour sessions sharing recent clicks, blended with next-click transitions
+    recommendations = [product for _, product in session_recommender.recommend(current_session[-10:], n=3)]
 
 # Function to draw a panel
 def draw_panel(x, y, width, height, title, items):
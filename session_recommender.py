@@ -0,0 +1,131 @@
+import time
+from collections import defaultdict, deque
+import numpy as np
+import pandas as pd
+
+# Session-based recommendations: session-kNN plus a first-order Markov chain.
+# Interaction logs are split into sessions by inactivity gap. An item ->
+# session inverted index (capped to the most recent sessions per item) and
+# item transition counts make each request touch a bounded number of
+# neighbour sessions, however long the history grows.
+
+
+def split_sessions(ratings, gap_seconds=1800):
+    # Returns a list of item sequences, one per session, in chronological order
+    ratings = ratings.sort_values(["userId", "timestamp"], kind="stable")
+    users = ratings["userId"].to_numpy()
+    timestamps = ratings["timestamp"].to_numpy()
+    new_session = np.ones(len(ratings), dtype=bool)
+    new_session[1:] = (users[1:] != users[:-1]) | (timestamps[1:] - timestamps[:-1] > gap_seconds)
+
+    starts = np.flatnonzero(new_session)
+    items = ratings["movieId"].to_numpy()
+    sessions = np.split(items, starts[1:])
+    session_times = timestamps[starts]
+    # Chronological session order keeps "most recent" meaningful in the index
+    order = np.argsort(session_times, kind="stable")
+    return [sessions[i] for i in order]
+
+
+class SessionRecommender:
+    def __init__(self, max_sessions_per_item=500, sample_size=250, k=100, markov_weight=0.3):
+        self.max_sessions_per_item = max_sessions_per_item
+        self.sample_size = sample_size
+        self.k = k
+        self.markov_weight = markov_weight
+        self.sessions = []
+        self.session_sets = []
+        # Bounded postings: only the most recent sessions per item are kept
+        self.item_sessions = defaultdict(lambda: deque(maxlen=self.max_sessions_per_item))
+        self.transitions = defaultdict(lambda: defaultdict(int))
+
+    def add_session(self, items):
+        items = list(items)
+        session_id = len(self.sessions)
+        self.sessions.append(items)
+        self.session_sets.append(set(items))
+        for item in set(items):
+            self.item_sessions[item].append(session_id)
+        for previous, following in zip(items, items[1:]):
+            if previous != following:
+                self.transitions[previous][following] += 1
+
+    def fit(self, sessions):
+        for items in sessions:
+            if len(items) > 1:
+                self.add_session(items)
+        return self
+
+    def _neighbor_scores(self, session):
+        # Later clicks in the current session weigh more (linear recency decay)
+        weights = {}
+        for position, item in enumerate(session, start=1):
+            weights[item] = position / len(session)
+
+        candidates = set()
+        for item in reversed(session):
+            candidates.update(self.item_sessions.get(item, ()))
+            if len(candidates) >= self.sample_size:
+                break
+        # Keep the most recent sampled sessions only
+        candidates = sorted(candidates, reverse=True)[:self.sample_size]
+
+        similarities = []
+        for neighbor in candidates:
+            neighbor_set = self.session_sets[neighbor]
+            overlap = sum(weights[item] for item in weights if item in neighbor_set)
+            if overlap:
+                similarities.append((overlap / np.sqrt(len(weights) * len(neighbor_set)), neighbor))
+        similarities.sort(reverse=True)
+
+        scores = defaultdict(float)
+        for similarity, neighbor in similarities[:self.k]:
+            for item in self.session_sets[neighbor]:
+                scores[item] += similarity
+        return scores
+
+    def _markov_scores(self, last_item):
+        following = self.transitions.get(last_item, {})
+        total = sum(following.values())
+        return {item: count / total for item, count in following.items()} if total else {}
+
+    def recommend(self, session, n=10):
+        session = list(session)
+        if not session:
+            return []
+        knn = self._neighbor_scores(session)
+        markov = self._markov_scores(session[-1])
+        knn_max = max(knn.values(), default=1.0) or 1.0
+
+        scores = defaultdict(float)
+        for item, score in knn.items():
+            scores[item] += (1 - self.markov_weight) * score / knn_max
+        for item, score in markov.items():
+            scores[item] += self.markov_weight * score
+        seen = set(session)
+        ranked = sorted((item for item in scores if item not in seen), key=scores.get, reverse=True)
+        return ranked[:n]
+
+
+if __name__ == "__main__":
+    ratings = pd.read_csv("movielens/ratings.csv")
+    sessions = split_sessions(ratings)
+    sessions = [s for s in sessions if len(s) > 1]
+    split = int(len(sessions) * 0.9)
+    train, test = sessions[:split], sessions[split:]
+    print(f"{len(sessions)} sessions with 2+ events, {len(train)} for training")
+
+    start = time.perf_counter()
+    recommender = SessionRecommender().fit(train)
+    print(f"Index built in {time.perf_counter() - start:.2f}s")
+
+    hits, latencies = 0, []
+    for session in test:
+        prefix, target = session[:-1], session[-1]
+        start = time.perf_counter()
+        recommendations = recommender.recommend(prefix[-10:], n=20)
+        latencies.append(time.perf_counter() - start)
+        hits += target in recommendations
+    latencies = np.array(latencies) * 1000
+    print(f"HitRate@20 on next item: {hits / len(test):.3f}, latency p50 {np.percentile(latencies, 50):.2f} ms, "
+          f"p99 {np.percentile(latencies, 99):.2f} ms")
@@ -0,0 +1,199 @@
+import random
+import time
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from array_utils import popcount64
+
+# Skill-based job matching over packed bitsets.
+# Skills are integer ids and the required skills of all jobs are packed into
+# uint64 words stored word-major, so a user's match counts are a popcount of
+# the AND over only the (contiguous) words the user has bits in. A
+# skill -> jobs inverted index gives the jobs sharing skills with the user,
+# and those sharing a single skill are only scored when the top-n could
+# still include one. Jobs sharing no skill score only through category and
+# experience, so the few that can make the top-n are taken from
+# (category, experience) groups in descending score order. The top-n stays
+# exact without scanning the catalog.
+
+
+class JobIndex:
+    def __init__(self, required_skills, categories, experience_levels, skill_weight=2, category_bonus=3,
+                 experience_points=3):
+        self.skill_weight = skill_weight
+        self.category_bonus = category_bonus
+        self.experience_points = experience_points
+        self.num_jobs = len(required_skills)
+
+        # Skill vocabulary and the (jobs x skills) matrix, one entry per distinct skill
+        self.skill_ids = {}
+        rows, cols = [], []
+        for job, job_skills in enumerate(required_skills):
+            for skill in job_skills:
+                rows.append(job)
+                cols.append(self.skill_ids.setdefault(skill, len(self.skill_ids)))
+        matrix = sp.csr_matrix((np.ones(len(rows), dtype=np.int32), (rows, cols)),
+                               shape=(self.num_jobs, len(self.skill_ids)))
+        matrix.sum_duplicates()
+        self._build(matrix)
+
+        self.categories, self.category_names = pd.factorize(np.asarray(categories))
+        self.experience = np.asarray(experience_levels, dtype=np.int64)
+        # Jobs grouped by (category, experience), each group sorted by job id
+        group_keys = self.categories.astype(np.int64) * (self.experience.max() + 1) + self.experience
+        self.group_order = np.argsort(group_keys, kind="stable")
+        sorted_keys = group_keys[self.group_order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        self.group_bounds = np.r_[starts, self.num_jobs]
+        first = self.group_order[starts]
+        self.group_categories = self.categories[first]
+        self.group_experience = self.experience[first]
+
+    def _build(self, matrix):
+        # (words x jobs) packed bitsets and the skill -> jobs inverted index
+        self.num_words = (matrix.shape[1] + 63) // 64
+        self.bits = np.zeros((self.num_words, self.num_jobs), dtype=np.uint64)
+        job_of = np.repeat(np.arange(self.num_jobs), np.diff(matrix.indptr))
+        np.bitwise_or.at(self.bits, (matrix.indices >> 6, job_of),
+                         np.left_shift(np.uint64(1), (matrix.indices & 63).astype(np.uint64)))
+        postings = matrix.tocsc()
+        self.posting_indptr, self.posting_jobs = postings.indptr, postings.indices
+
+    def encode(self, skills):
+        # Ids of the known skills; skills no job asks for can never match
+        return np.unique([self.skill_ids[skill] for skill in skills if skill in self.skill_ids]).astype(np.int64)
+
+    def match_counts(self, skill_ids, jobs=None):
+        # Popcount of job AND user bits, over only the words the user has bits in
+        words = np.unique(skill_ids >> 6)
+        user_bits = np.zeros(len(words), dtype=np.uint64)
+        np.bitwise_or.at(user_bits, np.searchsorted(words, skill_ids >> 6),
+                         np.left_shift(np.uint64(1), (skill_ids & 63).astype(np.uint64)))
+        counts = np.zeros(self.num_jobs if jobs is None else len(jobs), dtype=np.int64)
+        for word, mask in zip(words, user_bits):
+            counts += popcount64((self.bits[word] if jobs is None else self.bits[word, jobs]) & mask)
+        return counts
+
+    def _static_scores(self, categories, experience, preferred_categories, user_experience):
+        # Category and experience terms; preferred categories become a lookup table
+        preferred = np.array([name in preferred_categories for name in self.category_names])
+        return (self.category_bonus * preferred[categories] +
+                np.maximum(0, self.experience_points - np.abs(experience - user_experience)))
+
+    def scores(self, skills, preferred_categories, experience):
+        # Score of every job, vectorised over the whole catalog
+        skill_ids = self.encode(skills)
+        matches = self.match_counts(skill_ids) if len(skill_ids) else np.zeros(self.num_jobs, dtype=np.int64)
+        return self.skill_weight * matches + self._static_scores(self.categories, self.experience,
+                                                                 preferred_categories, experience)
+
+    def _overlap_masks(self, skill_ids):
+        # Jobs sharing at least one, and at least two, skills from the inverted index
+        once = np.zeros(self.num_jobs, dtype=bool)
+        twice = np.zeros(self.num_jobs, dtype=bool)
+        for s in skill_ids:
+            jobs = self.posting_jobs[self.posting_indptr[s]:self.posting_indptr[s + 1]]
+            twice[jobs] |= once[jobs]
+            once[jobs] = True
+        return once, twice
+
+    def matching_jobs(self, skill_ids):
+        return np.flatnonzero(self._overlap_masks(skill_ids)[0])
+
+    def _job_scores(self, jobs, skill_ids, preferred_categories, experience):
+        return (self.skill_weight * self.match_counts(skill_ids, jobs) +
+                self._static_scores(self.categories[jobs], self.experience[jobs], preferred_categories, experience))
+
+    def _group_jobs(self, preferred_categories, experience, n):
+        # A job sharing no skill scores only its group's static score, so if it
+        # makes the top-n it is among the first n jobs of its group, and groups
+        # below the n-th best collected score cannot contribute
+        group_scores = self._static_scores(self.group_categories, self.group_experience,
+                                           preferred_categories, experience)
+        jobs, cutoff = [], None
+        for group in np.argsort(-group_scores, kind="stable"):
+            if cutoff is not None and group_scores[group] < cutoff:
+                break
+            start, end = self.group_bounds[group], self.group_bounds[group + 1]
+            jobs.append(self.group_order[start:min(end, start + n)])
+            if cutoff is None and sum(map(len, jobs)) >= n:
+                cutoff = group_scores[group]
+        return np.concatenate(jobs)
+
+    def recommend(self, skills, preferred_categories, experience, n=5):
+        # Top-n (job ids, scores), ties broken by job order as a stable sort would
+        skill_ids = self.encode(skills)
+        once, twice = self._overlap_masks(skill_ids)
+        group_jobs = self._group_jobs(preferred_categories, experience, n)
+        once[group_jobs] = twice[group_jobs] = True
+
+        # Jobs sharing a single skill are usually the bulk of the overlap but
+        # score at most one skill plus the static terms; if the n-th best of
+        # the other candidates is already above that, they never need scoring
+        candidates = np.flatnonzero(twice)
+        scores = self._job_scores(candidates, skill_ids, preferred_categories, experience)
+        single_best = self.skill_weight + self.category_bonus + self.experience_points
+        if len(candidates) < n or np.partition(scores, len(scores) - n)[len(scores) - n] <= single_best:
+            candidates = np.flatnonzero(once)
+            scores = self._job_scores(candidates, skill_ids, preferred_categories, experience)
+
+        # Higher score first, then lower job id, as one integer key
+        keys = -scores * self.num_jobs + candidates
+        if len(keys) > n:
+            top = np.argpartition(keys, n - 1)[:n]
+            candidates, scores, keys = candidates[top], scores[top], keys[top]
+        top = np.argsort(keys)
+        return candidates[top], scores[top]
+
+
+def generate_jobs(num_jobs, num_skills=1000, num_categories=50, max_experience=15, seed=0):
+    rng = np.random.default_rng(seed)
+    popularity = 1 / np.arange(1, num_skills + 1) ** 0.8
+    sizes = rng.integers(3, 9, size=num_jobs)
+    skill_draws = rng.choice(num_skills, size=sizes.sum(), p=popularity / popularity.sum())
+    required = np.split(skill_draws, np.cumsum(sizes)[:-1])
+    return ([[f"Skill {s}" for s in job] for job in required],
+            [f"Category {c}" for c in rng.integers(num_categories, size=num_jobs)],
+            rng.integers(0, max_experience + 1, size=num_jobs))
+
+
+if __name__ == "__main__":
+    num_jobs = 1000000
+    required_skills, categories, experience_levels = generate_jobs(num_jobs)
+    start = time.perf_counter()
+    index = JobIndex(required_skills, categories, experience_levels)
+    print(f"Indexed {num_jobs} jobs over {len(index.skill_ids)} skills in {time.perf_counter() - start:.1f}s")
+
+    rng = random.Random(1)
+    profiles = [([f"Skill {rng.randrange(300)}" for _ in range(8)],
+                 [f"Category {rng.randrange(50)}" for _ in range(3)], rng.randrange(16)) for _ in range(20)]
+
+    # Current path: a set intersection per job, then a full sort
+    skills, preferred, experience = profiles[0]
+    start = time.perf_counter()
+    scored = []
+    for job in range(num_jobs):
+        score = len(set(required_skills[job]) & set(skills)) * 2
+        if categories[job] in preferred:
+            score += 3
+        score += max(0, 3 - abs(experience_levels[job] - experience))
+        scored.append((job, score))
+    scored.sort(key=lambda x: x[1], reverse=True)
+    print(f"Python sets: {(time.perf_counter() - start) * 1000:.0f} ms per request")
+
+    start = time.perf_counter()
+    for skills, preferred, experience in profiles:
+        full = index.scores(skills, preferred, experience)
+    print(f"Bitset scan of all jobs: {(time.perf_counter() - start) / len(profiles) * 1000:.1f} ms per request")
+
+    latencies = []
+    for skills, preferred, experience in profiles:
+        start = time.perf_counter()
+        ids, scores = index.recommend(skills, preferred, experience, n=5)
+        latencies.append(time.perf_counter() - start)
+        full = index.scores(skills, preferred, experience)
+        expected = np.lexsort((np.arange(num_jobs), -full))[:5]
+        assert (ids == expected).all()
+    print(f"Inverted index + bitsets: p50 {np.median(latencies) * 1000:.2f} ms, "
+          f"max {max(latencies) * 1000:.2f} ms per request")
+    assert [job for job, _ in scored[:5]] == list(index.recommend(*profiles[0], n=5)[0])
@@ -1,6 +1,8 @@
 import pygame
 import random
 import datetime
+import numpy as np
+from user_profiles import ProfileService
 
 # Initialize Pygame
 pygame.init()
@@ -30,6 +32,10 @@ user_preferences = {
     "evening": ["Dinner", "Movies", "Music", "Reading", "Gaming"]
 }
 
+# Every activity is its own feature; the profile learns when each one happens
+activities = [activity for period in user_preferences.values() for activity in period]
+profiles = ProfileService(np.eye(len(activities)), num_users=1, weights=(0.2, 0.2, 0.6))
+
 # Recommendations
 recommendations = []
 
@@ -70,9 +76,19 @@ def get_time_of_day(time):
     else:
         return "evening"
 
-def generate_recommendations(time_of_day):
+def record_activity(time):
+    # Simulated user: does something typical for the time of day
+    activity = random.choice(user_preferences[get_time_of_day(time)])
+    profiles.record(0, activities.index(activity), time.timestamp(), hour=time.hour)
+
+def seed_history(now, days=14):
+    for hours_ago in range(days * 24, 0, -1):
+        record_activity(now - datetime.timedelta(hours=hours_ago))
+
+def generate_recommendations(time):
     global recommendations
-    recommendations = random.sample(user_preferences[time_of_day], 3)
+    top, _ = profiles.recommend(0, np.arange(len(activities)), time.timestamp(), n=3, hour=time.hour)
+    recommendations = [activities[i] for i in top]
 
 def draw_clock(time):
     clock_center = (WIDTH // 4, HEIGHT // 2)
@@ -124,6 +140,7 @@ def draw_explanation():
 def main():
     global current_time, time_speed
 
+    seed_history(current_time)
     running = True
     while running:
         mouse_pos = pygame.mouse.get_pos()
@@ -138,13 +155,16 @@ def main():
                     speed_button.text = f"Toggle Speed ({time_speed}x)"
 
         # Update time
+        previous_hour = current_time.hour
         current_time += datetime.timedelta(minutes=time_speed)
         if current_time.hour >= 24:
             current_time = current_time.replace(hour=0)
+        if current_time.hour != previous_hour:
+            record_activity(current_time)
 
-        # Generate recommendations based on time of day
+        # Generate recommendations from the time-aware profile
         time_of_day = get_time_of_day(current_time)
-        generate_recommendations(time_of_day)
+        generate_recommendations(current_time)
 
         # Clear the screen
         screen.fill(BACKGROUND)
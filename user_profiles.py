@@ -0,0 +1,128 @@
+import time
+import numpy as np
+import pandas as pd
+
+# Incrementally maintained user profiles for time-aware personalisation.
+# Each user has an exponentially decayed long-term feature vector, a ring
+# buffer of recent events (short-term interest) and a decayed feature vector
+# per hour of day. Decay is lazy: vectors are stored as of their last update
+# and decayed on read, so recording an event costs O(features).
+
+HOURS = 24
+
+
+def _decay(elapsed, half_life):
+    return np.exp2(-np.maximum(elapsed, 0) / half_life)
+
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1)
+
+
+class ProfileService:
+    def __init__(self, item_features, num_users, long_half_life=30 * 86400, short_half_life=3600,
+                 short_term_size=10, weights=(0.6, 0.3, 0.1)):
+        self.item_features = np.asarray(item_features, dtype=np.float32)
+        num_features = self.item_features.shape[1]
+        self.long_half_life = long_half_life
+        self.short_half_life = short_half_life
+        self.weights = weights
+
+        self.long_term = np.zeros((num_users, num_features), dtype=np.float32)
+        self.last_update = np.zeros(num_users)
+        self.hourly = np.zeros((num_users, HOURS, num_features), dtype=np.float32)
+        self.hourly_last_update = np.zeros((num_users, HOURS))
+        self.recent_items = np.full((num_users, short_term_size), -1, dtype=np.int64)
+        self.recent_times = np.zeros((num_users, short_term_size))
+        self.recent_count = np.zeros(num_users, dtype=np.int64)
+
+    def record(self, user, item, timestamp, hour=None):
+        if hour is None:
+            hour = int(timestamp // 3600) % HOURS
+        features = self.item_features[item]
+
+        # Bring only the touched vectors up to date, then add the event
+        self.long_term[user] *= _decay(timestamp - self.last_update[user], self.long_half_life)
+        self.long_term[user] += features
+        self.last_update[user] = timestamp
+        self.hourly[user, hour] *= _decay(timestamp - self.hourly_last_update[user, hour], self.long_half_life)
+        self.hourly[user, hour] += features
+        self.hourly_last_update[user, hour] = timestamp
+
+        slot = self.recent_count[user] % self.recent_items.shape[1]
+        self.recent_items[user, slot] = item
+        self.recent_times[user, slot] = timestamp
+        self.recent_count[user] += 1
+
+    def record_events(self, users, items, timestamps, hours=None):
+        for i in np.argsort(timestamps, kind="stable"):
+            self.record(users[i], items[i], timestamps[i], None if hours is None else hours[i])
+
+    def long_term_vectors(self, users, now):
+        decay = _decay(now - self.last_update[users], self.long_half_life)
+        return self.long_term[users] * decay[:, None]
+
+    def short_term_vectors(self, users, now):
+        items = self.recent_items[users]
+        weights = np.where(items >= 0, _decay(now - self.recent_times[users], self.short_half_life), 0)
+        return np.einsum("nr,nrf->nf", weights, self.item_features[np.maximum(items, 0)])
+
+    def time_of_day_vectors(self, users, now, hour):
+        # The current hour and its neighbours, each decayed from its own last update
+        hours = np.array([hour - 1, hour, hour + 1]) % HOURS
+        decay = _decay(now - self.hourly_last_update[users][:, hours], self.long_half_life)
+        return np.einsum("nh,nhf->nf", decay, self.hourly[users][:, hours])
+
+    def score(self, users, candidates, now, hour=None):
+        # Blended long-term / short-term / time-of-day affinity, (users x candidates)
+        users = np.atleast_1d(users)
+        if hour is None:
+            hour = int(now // 3600) % HOURS
+        candidate_features = _normalize(self.item_features[candidates])
+        profiles = np.stack([
+            _normalize(self.long_term_vectors(users, now)),
+            _normalize(self.short_term_vectors(users, now)),
+            _normalize(self.time_of_day_vectors(users, now, hour)),
+        ])
+        blended = np.tensordot(np.asarray(self.weights, dtype=np.float32), profiles, axes=1)
+        return blended @ candidate_features.T
+
+    def recommend(self, user, candidates, now, n=10, hour=None):
+        candidates = np.asarray(candidates)
+        scores = self.score(user, candidates, now, hour)[0]
+        top = np.argsort(-scores, kind="stable")[:n]
+        return candidates[top], scores[top]
+
+
+def load_movielens_profiles(ratings_path="movielens/ratings.csv", movies_path="movielens/movies.csv"):
+    movies = pd.read_csv(movies_path)
+    genres = movies["genres"].str.get_dummies(sep="|")
+    ratings = pd.read_csv(ratings_path)
+    item_index = pd.Index(movies["movieId"])
+    user_index = pd.Index(ratings["userId"].unique())
+    service = ProfileService(genres.to_numpy(), len(user_index))
+    return service, ratings, user_index, item_index, list(genres.columns)
+
+
+if __name__ == "__main__":
+    service, ratings, user_index, item_index, genre_names = load_movielens_profiles()
+    users = user_index.get_indexer(ratings["userId"])
+    items = item_index.get_indexer(ratings["movieId"])
+    timestamps = ratings["timestamp"].to_numpy(dtype=np.float64)
+
+    start = time.perf_counter()
+    service.record_events(users, items, timestamps)
+    elapsed = time.perf_counter() - start
+    print(f"{len(ratings)} events in {elapsed:.2f}s ({elapsed / len(ratings) * 1e6:.1f} us/event)")
+
+    now = timestamps.max()
+    cohort = np.arange(len(user_index))
+    candidates = np.arange(len(item_index))
+    start = time.perf_counter()
+    scores = service.score(cohort, candidates, now)
+    print(f"Scored {len(cohort)} users x {len(candidates)} candidates in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    top, top_scores = service.recommend(0, candidates, now, n=5)
+    titles = pd.read_csv("movielens/movies.csv")["title"].to_numpy()
+    print(f"User {user_index[0]}: " + ", ".join(f"{titles[i]} ({s:.2f})" for i, s in zip(top, top_scores)))
@@ -0,0 +1,175 @@
+import time
+import numpy as np
+import scipy.sparse as sp
+from array_utils import top_n_per_row
+
+# Retrieve-then-rank pipeline for a video feed.
+# Static per-video features live in numpy columns computed once. Candidate
+# generation unions a few cheap sources (per-category pools, global
+# popularity, co-watch neighbours of recent videos, a little exploration),
+# and the ranker scores the whole slate as one feature matrix against the
+# user's category histogram, keeping per-feature contributions for
+# explanations.
+
+FEATURES = ["Engagement", "Popularity", "Freshness", "Diversity", "Creator Popularity", "Duration"]
+WEIGHTS = np.array([0.25, 0.25, 0.15, 0.15, 0.1, 0.1])
+IDEAL_DURATION = 600
+
+
+class VideoCatalog:
+    def __init__(self, categories, views, likes, days_old, durations, creator_popularity,
+                 category_names=None, pool_size=200):
+        self.categories = np.asarray(categories, dtype=np.int64)
+        self.num_videos = len(self.categories)
+        self.num_categories = int(self.categories.max()) + 1
+        self.category_names = category_names
+
+        # Static feature columns
+        views, likes = np.asarray(views, dtype=np.float64), np.asarray(likes, dtype=np.float64)
+        self.popularity = (views / 1000000) * 0.4 + (likes / 100000) * 0.6
+        self.freshness = np.maximum(0, 1 - np.asarray(days_old, dtype=np.float64) / 365)
+        self.creator = np.asarray(creator_popularity, dtype=np.float64)
+        self.duration = 1 - np.abs(IDEAL_DURATION - np.asarray(durations, dtype=np.float64)) / IDEAL_DURATION
+
+        # Candidate pools: best videos per category and overall by the
+        # user-independent part of the score
+        static = WEIGHTS[1] * self.popularity + WEIGHTS[2] * self.freshness + \
+            WEIGHTS[4] * self.creator + WEIGHTS[5] * self.duration
+        order = np.lexsort((-static, self.categories))
+        bounds = np.searchsorted(self.categories[order], np.arange(self.num_categories + 1))
+        self.category_pools = [order[s:min(e, s + pool_size)] for s, e in zip(bounds[:-1], bounds[1:])]
+        self.popular_pool = np.argsort(-static, kind="stable")[:pool_size]
+        self.co_watch = None
+
+    def set_co_watch(self, histories, neighbours=20):
+        # Sparse video x video co-watch counts, pruned to the strongest neighbours
+        rows, cols = [], []
+        for history in histories:
+            history = np.unique(history)
+            rows.append(np.repeat(history, len(history)))
+            cols.append(np.tile(history, len(history)))
+        rows, cols = np.concatenate(rows), np.concatenate(cols)
+        keep = rows != cols
+        counts = sp.csr_matrix((np.ones(keep.sum()), (rows[keep], cols[keep])), shape=(self.num_videos, self.num_videos))
+        ids, _ = top_n_per_row(counts, neighbours)
+        rows, cols = np.nonzero(ids >= 0)
+        self.co_watch = sp.csr_matrix((np.ones(len(rows)), (rows, ids[rows, cols])), shape=counts.shape)
+
+
+class UserState:
+    def __init__(self, num_categories, history=(), catalog=None):
+        self.category_counts = np.zeros(num_categories)
+        self.history = []
+        for video in history:
+            self.watch(video, catalog)
+
+    def watch(self, video, catalog):
+        self.category_counts[catalog.categories[video]] += 1
+        self.history.append(video)
+
+
+class VideoRecommender:
+    def __init__(self, catalog, per_category=100, popular=100, co_watch_recent=5, explore_per_category=5):
+        self.catalog = catalog
+        self.per_category = per_category
+        self.popular = popular
+        self.co_watch_recent = co_watch_recent
+        self.explore_per_category = explore_per_category
+
+    def candidates(self, user):
+        catalog = self.catalog
+        sources = [catalog.popular_pool[:self.popular]]
+        for category in range(catalog.num_categories):
+            # Deep pools for watched categories, a few videos from the rest for exploration
+            depth = self.per_category if user.category_counts[category] else self.explore_per_category
+            sources.append(catalog.category_pools[category][:depth])
+        if catalog.co_watch is not None and user.history:
+            recent = user.history[-self.co_watch_recent:]
+            sources.append(catalog.co_watch[recent].indices)
+        candidates = np.unique(np.concatenate(sources))
+        return candidates[~np.isin(candidates, user.history)]
+
+    def features(self, user, candidates):
+        # (candidates x features) matrix, columns in FEATURES order
+        catalog = self.catalog
+        categories = catalog.categories[candidates]
+        counts = user.category_counts[categories]
+        return np.column_stack([
+            counts / max(user.category_counts.sum(), 1),
+            catalog.popularity[candidates],
+            catalog.freshness[candidates],
+            (counts == 0).astype(np.float64),
+            catalog.creator[candidates],
+            catalog.duration[candidates],
+        ])
+
+    def rank(self, user, candidates, n=None):
+        features = self.features(user, candidates)
+        scores = features @ WEIGHTS
+        if n is not None and n < len(candidates):
+            top = np.argpartition(-scores, n - 1)[:n]
+            top = top[np.argsort(-scores[top], kind="stable")]
+        else:
+            top = np.argsort(-scores, kind="stable")
+        return candidates[top], scores[top], features[top]
+
+    def recommend(self, user, n=10):
+        return self.rank(user, self.candidates(user), n)
+
+    @staticmethod
+    def explain(features):
+        return [f"{name}: {value:.2f} * {weight} = {value * weight:.2f}"
+                for name, value, weight in zip(FEATURES, features, WEIGHTS)]
+
+
+def generate_catalog(num_videos, num_categories=8, seed=0):
+    rng = np.random.default_rng(seed)
+    views = rng.integers(100000, 1000000, size=num_videos)
+    return VideoCatalog(
+        categories=rng.integers(num_categories, size=num_videos),
+        views=views,
+        likes=(views * rng.uniform(0.01, 0.1, size=num_videos)).astype(np.int64),
+        days_old=rng.integers(1, 366, size=num_videos),
+        durations=rng.integers(180, 1201, size=num_videos),
+        creator_popularity=rng.uniform(0.1, 1.0, size=num_videos),
+    )
+
+
+if __name__ == "__main__":
+    num_videos = 1000000
+    start = time.perf_counter()
+    catalog = generate_catalog(num_videos, num_categories=50)
+    rng = np.random.default_rng(1)
+    # Co-watch from synthetic sessions that each stay within one category
+    by_category = [np.flatnonzero(catalog.categories == c) for c in range(catalog.num_categories)]
+    histories = [rng.choice(by_category[rng.integers(catalog.num_categories)], size=8) for _ in range(20000)]
+    catalog.set_co_watch(histories)
+    print(f"Catalog of {num_videos} videos with co-watch index built in {time.perf_counter() - start:.2f}s")
+
+    recommender = VideoRecommender(catalog)
+    user = UserState(catalog.num_categories, histories[0], catalog)
+
+    start = time.perf_counter()
+    for _ in range(100):
+        candidates = recommender.candidates(user)
+    retrieval_time = (time.perf_counter() - start) / 100
+    start = time.perf_counter()
+    for _ in range(100):
+        recommender.rank(user, candidates, n=10)
+    rank_time = (time.perf_counter() - start) / 100
+    print(f"Retrieval: {len(candidates)} candidates in {retrieval_time * 1000:.2f} ms, "
+          f"ranking in {rank_time * 1000:.3f} ms")
+
+    slate = rng.choice(num_videos, size=10000, replace=False)
+    start = time.perf_counter()
+    for _ in range(100):
+        recommender.rank(user, slate, n=10)
+    print(f"10k-candidate slate ranked in {(time.perf_counter() - start) / 100 * 1000:.3f} ms")
+
+    # Two-stage top-10 vs scoring the whole catalog
+    start = time.perf_counter()
+    exhaustive, _, _ = recommender.rank(user, np.setdiff1d(np.arange(num_videos), user.history), n=10)
+    print(f"Exhaustive ranking {(time.perf_counter() - start) * 1000:.1f} ms, "
+          f"top-10 recall of retrieval {len(set(exhaustive) & set(recommender.recommend(user)[0])) / 10:.2f}")
+    top, scores, features = recommender.recommend(user, n=1)
+    print(f"Top video {top[0]} score {scores[0]:.2f}: " + "; ".join(VideoRecommender.explain(features[0])))
@@ -1,6 +1,7 @@
 import pygame
 import random
 from datetime import datetime, timedelta
+from video_ranker import VideoCatalog, VideoRecommender, UserState
 
 # Initialize Pygame
 pygame.init()
@@ -93,48 +94,25 @@ for i in range(5):
     for j in range(3):
         videos.append(Video(i * 220 + 20, j * 200 + 160, 200, 180, random.choice(categories)))
 
-viewed_videos = []
-
-def calculate_scores(videos, viewed_videos):
-    scores = {}
-    for video in videos:
-        if video not in viewed_videos:
-            score = 0
-            explanations = []
-
-            engagement_score = sum(1 for v in viewed_videos if v.category == video.category) / max(len(viewed_videos), 1)
-            engagement_weight = 0.25
-            score += engagement_score * engagement_weight
-            explanations.append(f"Engagement: {engagement_score:.2f} * {engagement_weight} = {engagement_score * engagement_weight:.2f}")
-
-            popularity_score = (video.views / 1000000) * 0.4 + (video.likes / 100000) * 0.6
-            popularity_weight = 0.25
-            score += popularity_score * popularity_weight
-            explanations.append(f"Popularity: {popularity_score:.2f} * {popularity_weight} = {popularity_score * popularity_weight:.2f}")
-
-            days_old = (datetime.now() - video.upload_date).days
-            freshness_score = max(0, 1 - (days_old / 365))
-            freshness_weight = 0.15
-            score += freshness_score * freshness_weight
-            explanations.append(f"Freshness: {freshness_score:.2f} * {freshness_weight} = {freshness_score * freshness_weight:.2f}")
-
-            watched_categories = set(v.category for v in viewed_videos)
-            diversity_score = 1 if video.category not in watched_categories else 0
-            diversity_weight = 0.15
-            score += diversity_score * diversity_weight
-            explanations.append(f"Diversity: {diversity_score:.2f} * {diversity_weight} = {diversity_score * diversity_weight:.2f}")
-
-            creator_weight = 0.1
-            score += video.creator_popularity * creator_weight
-            explanations.append(f"Creator Popularity: {video.creator_popularity:.2f} * {creator_weight} = {video.creator_popularity * creator_weight:.2f}")
-
-            duration_score = 1 - abs(600 - video.duration) / 600  # Prefer videos around 10 minutes
-            duration_weight = 0.1
-            score += duration_score * duration_weight
-            explanations.append(f"Duration: {duration_score:.2f} * {duration_weight} = {duration_score * duration_weight:.2f}")
-
-            scores[video] = (score, explanations)
-    return scores
+# Columnar view of the videos for the retrieve-then-rank pipeline
+category_ids = {category: i for i, category in enumerate(categories)}
+catalog = VideoCatalog([category_ids[video.category] for video in videos],
+                       [video.views for video in videos],
+                       [video.likes for video in videos],
+                       [(datetime.now() - video.upload_date).days for video in videos],
+                       [video.duration for video in videos],
+                       [video.creator_popularity for video in videos],
+                       category_names=categories)
+# The demo catalog is tiny, so every video stays a candidate
+recommender = VideoRecommender(catalog, explore_per_category=len(videos))
+video_ids = {video: i for i, video in enumerate(videos)}
+# Watch history and category histogram of the viewer, updated one click at a time
+user = UserState(catalog.num_categories)
+
+def calculate_scores(videos, user):
+    ranked, ranked_scores, features = recommender.recommend(user, n=len(videos))
+    return {videos[i]: (score, VideoRecommender.explain(feature_row))
+            for i, score, feature_row in zip(ranked, ranked_scores, features)}
 
 reset_button = Button(1200, 80, 180, 50, "Reset", BUTTON_COLOR, BUTTON_HOVER)
 help_button = Button(1300, 20, 80, 40, "Help", HELP_COLOR, HELP_HOVER)
@@ -184,7 +162,7 @@ while running:
                 show_help = not show_help
             elif reset_button.is_clicked(mouse_pos):
                 turn = 0
-                viewed_videos = []
+                user = UserState(catalog.num_categories)
                 explanation_text = "System reset. Click on a video to start again."
                 scores = {}
                 for video in videos:
@@ -193,10 +171,10 @@ while running:
                 for video in videos:
                     if video.rect.collidepoint(mouse_pos) and not video.watched:
                         video.watched = True
-                        viewed_videos.append(video)
+                        user.watch(video_ids[video], catalog)
                         turn += 1
                         explanation_text = f"Turn {turn}: You watched a {video.category} video.\nRecommendation scores:"
-                        scores = calculate_scores(videos, viewed_videos)
+                        scores = calculate_scores(videos, user)
                         break
 
     screen.fill(BACKGROUND)